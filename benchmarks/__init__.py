@@ -0,0 +1 @@
+"""StdSync 性能基准（python -m benchmarks.run）"""
@@ -0,0 +1,91 @@
+"""
+bench_normalize.py – normalize_code 微基准
+---------------------------------------------------------------
+用法：
+  python -m benchmarks.bench_normalize
+  python -m benchmarks.bench_normalize --size 200000 --repeat 5
+
+对比未加缓存的原实现（NFKC + re.sub）、缓存 + ASCII 快路径的 normalize_code、
+整列版本 normalize_codes 以及清洗阶段的 pyarrow 内核 clean.code_norm，
+输入为合成清单中的编号与拆分后的旧号。
+冷缓存与热缓存（同一批编号再次规范化，如 GUI 重复运行）分别计时。
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import time
+import unicodedata
+
+import pandas as pd
+
+from stdsync.core import clean, codes
+
+from . import synth
+
+
+def reference_normalize_code(code: str) -> str:
+    """原实现（无缓存），作为对照基准"""
+    if code is None:
+        return ""
+    code = unicodedata.normalize("NFKC", str(code))
+    code = re.sub(r"[-–]", "—", code)
+    return code.strip()
+
+
+def _best_of(repeat: int, fn, setup=None) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def sample_codes(n: int, seed: int = 0) -> list[str]:
+    """公司编号 + 公告旧号混合样本，重复率与真实清单相近"""
+    gb_df = synth.make_gb(max(1, n // 4), seed=seed)
+    company_df = synth.make_company(n, gb_df, seed=seed + 1)
+    olds = [old for rep in gb_df["replaced"].dropna()
+            for old in codes.SPLIT_PATTERN.split(rep)]
+    return company_df["code"].tolist() + olds
+
+
+def run(size: int = 100_000, repeat: int = 3) -> dict[str, float]:
+    """返回各实现处理同一批样本的耗时（秒）；*_warm 为缓存已命中时的再次调用"""
+    values = sample_codes(size)
+    series = pd.Series(values, dtype=object)
+
+    clear = codes._normalize_str.cache_clear
+    per_value = lambda: [codes.normalize_code(v) for v in values]     # noqa: E731
+    per_column = lambda: codes.normalize_codes(series)                # noqa: E731
+
+    timings = {
+        "reference": _best_of(repeat, lambda: [reference_normalize_code(v) for v in values]),
+        "normalize_code": _best_of(repeat, per_value, setup=clear),
+        "normalize_codes": _best_of(repeat, per_column, setup=clear),
+        "clean.code_norm": _best_of(repeat, lambda: clean.code_norm(series)),
+    }
+    clear()
+    per_value()
+    timings["normalize_code_warm"] = _best_of(repeat, per_value)
+    timings["normalize_codes_warm"] = _best_of(repeat, per_column)
+    return timings
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="normalize_code 微基准")
+    ap.add_argument("--size", type=int, default=100_000, help="公司编号条数")
+    ap.add_argument("--repeat", type=int, default=3, help="每项重复次数，取最短")
+    args = ap.parse_args(argv)
+
+    timings = run(args.size, args.repeat)
+    base = timings["reference"]
+    for name, seconds in timings.items():
+        print(f"{name:<22}{seconds:>10.4f}s{base / seconds:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
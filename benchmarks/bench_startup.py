@@ -0,0 +1,90 @@
+"""
+bench_startup.py – 冷启动导入耗时（python -X importtime）
+---------------------------------------------------------------
+用法：
+  python -m benchmarks.bench_startup
+  python -m benchmarks.bench_startup --repeat 5 --top 10
+
+在全新子进程中以 -X importtime 运行各启动路径，汇总顶层模块的累计导入耗时，
+并列出实际加载的重型依赖（HEAVY_MODULES）。CLI 启动与 --help 不应加载其中任何一个。
+"""
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 只应在读取 / 比对 / 输出阶段才导入的依赖
+HEAVY_MODULES = ("numpy", "pandas", "pyarrow", "rapidfuzz", "openpyxl", "xlsxwriter", "docx")
+
+# 启动路径：名称 → 解释器参数
+TARGETS = {
+    "import stdsync.cli": ["-c", "import stdsync.cli"],
+    "main.py --cli --help": [str(ROOT / "main.py"), "--cli", "--help"],
+}
+
+
+@dataclass
+class ImportProfile:
+    """一次 -X importtime 运行的结果"""
+    total_us: int                                   # 顶层模块累计耗时之和（微秒）
+    modules: dict[str, int] = field(default_factory=dict)   # 模块 → 累计耗时（微秒）
+    returncode: int = 0
+
+    @property
+    def heavy(self) -> list[str]:
+        """已加载的重型依赖（顶层包名）"""
+        roots = {name.partition(".")[0] for name in self.modules}
+        return [m for m in HEAVY_MODULES if m in roots]
+
+
+def parse_importtime(stderr: str) -> ImportProfile:
+    """解析 -X importtime 输出：'import time: self | cumulative | 模块名'，顶层模块无缩进"""
+    modules, total = {}, 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():        # 表头行
+            continue
+        modules[name.strip()] = int(cumulative)
+        if not name[1:].startswith(" "):            # 顶层导入（'| ' 之后无额外缩进）
+            total += int(cumulative)
+    return ImportProfile(total, modules)
+
+
+def profile_startup(args: list[str]) -> ImportProfile:
+    """在新解释器中运行并解析导入耗时"""
+    proc = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=ROOT,
+                          capture_output=True, text=True, encoding="utf-8", errors="replace")
+    profile = parse_importtime(proc.stderr)
+    profile.returncode = proc.returncode
+    return profile
+
+
+def run(repeat: int = 3) -> dict[str, ImportProfile]:
+    """各启动路径取 repeat 次中总耗时最短的一次"""
+    return {name: min((profile_startup(args) for _ in range(repeat)), key=lambda p: p.total_us)
+            for name, args in TARGETS.items()}
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="冷启动导入耗时")
+    ap.add_argument("--repeat", type=int, default=3, help="每个启动路径的运行次数，取最短")
+    ap.add_argument("--top", type=int, default=5, help="列出累计耗时最高的 N 个模块")
+    args = ap.parse_args(argv)
+
+    for name, profile in run(args.repeat).items():
+        print(f"{name:<24}{profile.total_us / 1000:>8.1f} ms"
+              f"  重型依赖：{', '.join(profile.heavy) or '无'}")
+        slowest = sorted(profile.modules.items(), key=lambda kv: kv[1], reverse=True)
+        for module, us in slowest[:args.top]:
+            print(f"    {module:<40}{us / 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
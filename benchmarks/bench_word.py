@@ -0,0 +1,102 @@
+"""
+bench_word.py – Word 导出伸缩性基准
+---------------------------------------------------------------
+用法：
+  python -m benchmarks.bench_word
+  python -m benchmarks.bench_word --sizes 1000 10000 50000 --reference-max 5000
+
+对 n 条 OBSOLETE 结果计时 word_exporter.render_word（整批拼接 w:tr），
+并与逐行 table.add_row() / cell.text 的原实现对照（原实现超线性，
+默认只跑到 --reference-max 行）。每行微秒数在各规模间大致不变即为线性。
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from docx import Document
+
+from stdsync.core import word_exporter
+from stdsync.core.models import CompanyStandard, MatchResult
+from stdsync.core.results import ResultTable
+
+DEFAULT_SIZES = (1_000, 5_000, 10_000, 50_000)
+
+
+def reference_render_word(results, out_path: Path) -> Path:
+    """原实现：逐行 add_row 并逐格赋值 cell.text，作为计时对照（单元测试的正确性对照见 tests/conftest.py）"""
+    doc = Document()
+    table = doc.add_table(rows=1, cols=len(word_exporter.HEADERS))
+    for idx, h in enumerate(word_exporter.HEADERS):
+        table.rows[0].cells[idx].text = h
+    for m in results:
+        if m.status != "OBSOLETE":
+            continue
+        cells = table.add_row().cells
+        cells[0].text = m.company.name or ""
+        cells[1].text = m.company.code or ""
+        cells[2].text = m.company.name or ""
+        cells[3].text = m.gb_new_code or ""
+        cells[4].text = ""
+        cells[5].text = m.company.dept or ""
+    doc.save(out_path)
+    return out_path
+
+
+def make_results(n: int) -> ResultTable:
+    """n 条 OBSOLETE 结果"""
+    return ResultTable.from_results(
+        MatchResult(
+            company=CompanyStandard(code=f"GB/T {1000 + i}—2008", name=f"水泥试验方法 第{i}部分",
+                                    impl_date=None, dept=("质量部", "技术部", "生产部")[i % 3]),
+            gb_old_code=f"GB/T {1000 + i}—2008",
+            gb_new_code=f"GB/T {1000 + i}—2024",
+            status="OBSOLETE",
+        )
+        for i in range(n)
+    )
+
+
+def _timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def run(sizes=DEFAULT_SIZES, reference_max: int = 5_000) -> list[dict]:
+    """返回 [{size, render_word, reference?}]，单位秒"""
+    records = []
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for n in sizes:
+            results = make_results(n)
+            rec = {"size": n,
+                   "render_word": _timed(lambda: word_exporter.render_word(results,
+                                                                           tmp / "fast.docx"))}
+            if n <= reference_max:
+                rec["reference"] = _timed(lambda: reference_render_word(results, tmp / "ref.docx"))
+            records.append(rec)
+    return records
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="Word 导出伸缩性基准")
+    ap.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                    help="OBSOLETE 行数")
+    ap.add_argument("--reference-max", type=int, default=5_000,
+                    help="原实现只跑不超过该行数的规模")
+    args = ap.parse_args(argv)
+
+    print(f"{'rows':>8}{'render_word':>14}{'us/row':>9}{'reference':>12}{'us/row':>9}")
+    for rec in run(args.sizes, args.reference_max):
+        n = rec["size"]
+        line = f"{n:>8}{rec['render_word']:>13.3f}s{rec['render_word'] / n * 1e6:>9.1f}"
+        if "reference" in rec:
+            line += f"{rec['reference']:>11.3f}s{rec['reference'] / n * 1e6:>9.1f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
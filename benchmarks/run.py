@@ -0,0 +1,124 @@
+"""
+run.py – 分阶段基准计时
+---------------------------------------------------------------
+用法：
+  python -m benchmarks.run                         # 1k / 10k / 100k
+  python -m benchmarks.run --sizes 1000 10000 --repeat 3 --out bench.json
+
+每个规模分别计时 load（读公司清单 + 公告）、compare、lifecycle（剩余天数 + 到期筛选排序）、
+render、render_word，以及 outputs（xlsx / docx / csv / parquet 并行写出，应接近最慢的单项），
+结果写为 JSON，便于跨版本对比。
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from stdsync import __version__
+from stdsync.core import comparer, excel_io, lifecycle, outputs, reporter, word_exporter
+from stdsync.core.index import AnnouncementIndex
+
+from . import synth
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def _best_of(repeat: int, fn):
+    """重复 repeat 次取最短耗时，返回 (秒, 最后一次结果)"""
+    best, value = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        value = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, value
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True, cwd=Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_size(n: int, workdir: Path, repeat: int = 1) -> list[dict]:
+    """对 n 行公司清单（公告行数取 n 的一半）逐阶段计时"""
+    gb_df = synth.make_gb(max(1, n // 2), seed=n)
+    company_df = synth.make_company(n, gb_df, seed=n + 1)
+    gb_path = synth.write_gb_xlsx(gb_df, workdir / f"gb_{n}.xlsx")
+    company_path = synth.write_company_xlsx(company_df, workdir / f"company_{n}.xlsx")
+
+    records = []
+
+    def record(stage: str, seconds: float, **extra):
+        records.append({"size": n, "stage": stage, "seconds": round(seconds, 6), **extra})
+
+    t, (c_df, g_df) = _best_of(repeat, lambda: (excel_io.load_company(company_path),
+                                                excel_io.load_gb(gb_path)))
+    record("load", t, company_rows=len(c_df), gb_rows=len(g_df))
+
+    t, results = _best_of(repeat, lambda: comparer.compare_table(c_df, g_df))
+    record("compare", t, **{k.lower(): v for k, v in results.counts().items()})
+
+    index = AnnouncementIndex.from_frame(g_df)
+    t, due = _best_of(repeat, lambda: lifecycle.due_within(lifecycle.annotate(results, index), 365))
+    record("lifecycle", t, due_within_365=len(due))
+
+    t, _ = _best_of(repeat, lambda: reporter.render(results, workdir / f"diff_{n}.xlsx"))
+    record("render", t)
+
+    t, _ = _best_of(repeat, lambda: word_exporter.render_word(results, workdir / f"diff_{n}.docx"))
+    record("render_word", t)
+
+    kinds = ("xlsx", "docx", "csv", "parquet")
+    t, _ = _best_of(repeat, lambda: outputs.write_outputs(results, workdir / "outputs", kinds))
+    record("outputs", t, outputs=",".join(kinds))
+    return records
+
+
+def run(sizes=DEFAULT_SIZES, repeat: int = 1, out: Path | str | None = None) -> Path:
+    """执行基准并写出 JSON，返回结果文件路径"""
+    started = datetime.now()
+    records = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            for rec in bench_size(n, Path(tmp), repeat):
+                print(f"{rec['size']:>8} {rec['stage']:<12} {rec['seconds']:>10.3f}s")
+                records.append(rec)
+
+    payload = {
+        "meta": {
+            "started": started.isoformat(timespec="seconds"),
+            "stdsync": __version__,
+            "git": _git_revision(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "repeat": repeat,
+        },
+        "results": records,
+    }
+    out = Path(out) if out else RESULTS_DIR / f"bench_{started:%Y%m%d_%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(payload, ensure_ascii=False, indent=2), "utf-8")
+    print(f"结果已写入 {out}")
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser("StdSync benchmarks")
+    ap.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    ap.add_argument("--repeat", type=int, default=1, help="每阶段重复次数，取最短耗时")
+    ap.add_argument("--out", help="JSON 输出路径（默认 benchmarks/results/ 下按时间命名）")
+    args = ap.parse_args()
+    run(args.sizes, args.repeat, args.out)
+
+
+if __name__ == "__main__":
+    main()
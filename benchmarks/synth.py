@@ -0,0 +1,139 @@
+"""
+synth.py – 合成标准清单生成器
+---------------------------------------------------------------
+生成贴近真实数据的公告与公司清单：
+* GB / GB/T / GB/Z / JB/T / HG/T / Q/ 企业标准号，分部编号（如 1346.2）
+* 破折号变体（— - –）与全角字符（ＧＢ／Ｔ　１３４６）
+* “代替标准号”单元格含 1–3 个旧号，分隔符混用（；;，,）
+* 中文标准名称、持有部门
+公司清单中约 5% 精确持有旧号（OBSOLETE）、约 5% 为年份相近的旧号（REVIEW 候选）。
+"""
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import pandas as pd
+
+from stdsync.core.codes import SPLIT_PATTERN
+
+PREFIXES = ["GB", "GB/T", "GB/Z", "JB/T", "HG/T"]
+COMPANY_PREFIX = "Q/FCIC"
+DASHES = ["—", "-", "–"]
+SEPARATORS = ["；", ";", "，", ","]
+WORDS = ["水泥", "钢筋", "混凝土", "砂浆", "沥青", "试验", "测试", "方法", "规范",
+         "通用", "技术条件", "安全", "要求", "检测", "抗压强度", "耐久性", "术语"]
+DEPTS = ["质量部", "技术部", "生产部", "安全部", "检测中心", "工程部"]
+
+
+def _fullwidth(s: str) -> str:
+    """ASCII → 全角（空格 → 全角空格）"""
+    return "".join("　" if ch == " " else chr(ord(ch) + 0xFEE0) if "!" <= ch <= "~" else ch
+                   for ch in s)
+
+
+def _code(rng: random.Random, prefix: str, number: str, year: int) -> str:
+    return f"{prefix} {number}{rng.choice(DASHES)}{year}"
+
+
+def _variant(rng: random.Random, code: str) -> str:
+    """录入变体：换破折号、转全角、加首尾空格"""
+    r = rng.random()
+    if r < 0.2:
+        return _fullwidth(code)
+    if r < 0.5:
+        for d in DASHES:
+            code = code.replace(d, rng.choice(DASHES))
+    if r > 0.9:
+        code = f" {code} "
+    return code
+
+
+def _number(rng: random.Random) -> str:
+    n = str(rng.randint(1, 40000))
+    return f"{n}.{rng.randint(1, 9)}" if rng.random() < 0.15 else n
+
+
+def _name(rng: random.Random) -> str:
+    return "".join(rng.sample(WORDS, rng.randint(2, 5)))
+
+
+def make_gb(n: int, seed: int = 0) -> pd.DataFrame:
+    """
+    生成国家公告（清洗后列：code / name / replaced / impl_date）
+    """
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        prefix, number = rng.choice(PREFIXES), _number(rng)
+        year = rng.randint(2015, 2024)
+        if rng.random() < 0.15:
+            replaced = None                         # 全新制定
+        else:
+            olds = [_code(rng, prefix, number, rng.randint(1990, year - 1))]
+            for _ in range(rng.randint(0, 2)):      # 合并代替的其他旧号
+                olds.append(_code(rng, rng.choice(PREFIXES), _number(rng),
+                                  rng.randint(1990, year - 1)))
+            replaced = rng.choice(SEPARATORS).join(olds)
+        rows.append({
+            "code": _code(rng, prefix, number, year),
+            "name": _name(rng),
+            "replaced": replaced,
+            "impl_date": f"{year + 1}-{rng.randint(1, 12):02d}-01",
+        })
+    return pd.DataFrame(rows)
+
+
+def make_company(n: int, gb_df: pd.DataFrame, seed: int = 1) -> pd.DataFrame:
+    """
+    生成公司清单（清洗后列：code / name / dept / replaced / impl_date），
+    部分行引用 gb_df 中的旧号以覆盖 OBSOLETE / REVIEW 分支
+    """
+    rng = random.Random(seed)
+    olds = [(old.strip(), name)
+            for rep, name in zip(gb_df["replaced"], gb_df["name"]) if isinstance(rep, str)
+            for old in SPLIT_PATTERN.split(rep)]
+    rows = []
+    for _ in range(n):
+        r = rng.random()
+        if olds and r < 0.05:                       # 精确持有旧号
+            code, name = rng.choice(olds)
+            code = _variant(rng, code)
+        elif olds and r < 0.10:                     # 年份相近的旧号 → REVIEW 候选
+            code, name = rng.choice(olds)
+            code = code[:-4] + str(int(code[-4:]) - rng.randint(1, 6))
+        elif r < 0.40:
+            code, name = _code(rng, COMPANY_PREFIX, _number(rng), rng.randint(2010, 2024)), _name(rng)
+        else:
+            code = _code(rng, rng.choice(PREFIXES), _number(rng), rng.randint(1990, 2024))
+            name = _name(rng)
+        rows.append({
+            "code": code,
+            "name": name,
+            "dept": rng.choice(DEPTS),
+            "replaced": None,
+            "impl_date": f"{rng.randint(2000, 2024)}-01-01",
+        })
+    return pd.DataFrame(rows)
+
+
+# ----------------------------------------------------------------------
+# 写回原始表格格式（供 excel_io 读取计时）
+# ----------------------------------------------------------------------
+def write_gb_xlsx(gb_df: pd.DataFrame, path: Path | str) -> Path:
+    path = Path(path)
+    gb_df.rename(columns={"code": "国家标准编号", "name": "国 家 标 准 名 称",
+                          "replaced": "代替标准号", "impl_date": "实施日期"}
+                 ).to_excel(path, index=False)
+    return path
+
+
+def write_company_xlsx(company_df: pd.DataFrame, path: Path | str) -> Path:
+    """带装饰首行的公司清单"""
+    path = Path(path)
+    body = company_df.rename(columns={"code": "标准编号", "name": "标准名称", "dept": "持有部门",
+                                      "replaced": "代替/修订情况", "impl_date": "实施日期"})
+    with pd.ExcelWriter(path) as writer:
+        pd.DataFrame([["部门在用标准清单"]]).to_excel(writer, header=False, index=False)
+        body.to_excel(writer, startrow=1, index=False)
+    return path
@@ -4,24 +4,40 @@
 # 用法：
 #   python main.py                       # 启动 GUI
 #   python main.py --cli "公司清单.xlsx" "国家公告.xlsx"
+#   python main.py --cli "公司清单.xlsx" "国家公告.xlsx" --no-word   # 只要差异表
+#   python main.py --cli "公司清单.xlsx" "国家公告.xlsx" --catalog 标准目录.db   # 公告增量入库后对目录比对
+#   python main.py --serve [--port 8765]     # 本地比对服务（常驻公告索引）
 # -----------------------------------------------------------
 
+import multiprocessing
 import sys
 from pathlib import Path
 
 # -----------------------------------------------------------
 # 判断是否 CLI 模式
+# 进程池在 Windows / PyInstaller 下以 spawn 方式启动子进程，
+# 必须有 __main__ 保护与 freeze_support()，否则子进程会重复启动程序
 # -----------------------------------------------------------
-if len(sys.argv) > 1 and sys.argv[1] == "--cli":
-    # 把 "--cli" 从参数中移除，再交给 argparse 解析
-    sys.argv.pop(1)
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
 
-    # CLI 入口
-    from stdsync.cli import run_cli
+    if len(sys.argv) > 1 and sys.argv[1] == "--cli":
+        # 把 "--cli" 从参数中移除，再交给 argparse 解析
+        sys.argv.pop(1)
 
-    run_cli()
-else:
-    # GUI 入口（Tkinter 版）
-    from stdsync.gui.tk_app import run_gui
+        # CLI 入口
+        from stdsync.cli import run_cli
 
-    run_gui()
+        run_cli()
+    elif len(sys.argv) > 1 and sys.argv[1] == "--serve":
+        sys.argv.pop(1)
+
+        # 服务入口
+        from stdsync.server import run_server
+
+        run_server()
+    else:
+        # GUI 入口（Tkinter 版）
+        from stdsync.gui.tk_app import run_gui
+
+        run_gui()
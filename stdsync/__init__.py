@@ -2,12 +2,20 @@
 """
 StdSync 包初始化模块
 """
-from importlib.metadata import version, PackageNotFoundError
-try:
-    __version__ = version("stdsync")
-except PackageNotFoundError:
-    __version__ = "0.1.0"
 
 __all__ = [
     "__version__",
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str):
+    # importlib.metadata 导入较慢，首次访问 __version__ 时才查询
+    if name == "__version__":
+        from importlib.metadata import version, PackageNotFoundError
+        try:
+            value = version("stdsync")
+        except PackageNotFoundError:
+            value = "0.1.0"
+        globals()["__version__"] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,31 +1,170 @@
 # ==================== stdsync/cli.py =======================
 """
 简单命令行接口
+
+启动时只导入标准库与轻量模块；pandas / rapidfuzz / openpyxl / xlsxwriter / python-docx
+在用到它们的阶段才导入，--help、参数错误等路径不付这部分开销。
 """
+from __future__ import annotations
+
 import argparse
+from datetime import date
 from pathlib import Path
-from datetime import datetime
+from typing import TYPE_CHECKING
+
+from stdsync.core.instrument import Profiler, profiling, stage
+from stdsync.core.outputs import DEFAULT_OUTPUTS, OUTPUTS
 
-from stdsync.core import excel_io, comparer, reporter
-from stdsync.core import word_exporter
+if TYPE_CHECKING:
+    from stdsync.core.cache import ParseCache
 
 
 def run_cli() -> None:
     """CLI 入口"""
     ap = argparse.ArgumentParser("StdSync CLI")
-    ap.add_argument("company", help="公司清单 xlsx")
-    ap.add_argument("gb", help="国家公告 xlsx")
+    ap.add_argument("company", nargs="?",
+                    help="公司清单 xlsx / csv / parquet / arrow，按扩展名识别（也可为目录或通配符）")
+    ap.add_argument("gb", nargs="?",
+                    help="国家公告 xlsx / csv / parquet / arrow，按扩展名识别（也可为目录或通配符）")
+    ap.add_argument("--all-sheets", action="store_true", help="读取每个文件的全部工作表")
+    ap.add_argument("--no-cache", action="store_true", help="不读写解析缓存，强制重新解析 Excel")
+    ap.add_argument("--clear-cache", action="store_true", help="运行前清空解析缓存")
+    ap.add_argument("--workers", type=int, metavar="N",
+                    help="并行进程数（批量解析与分片比对）；默认批量解析用全部核心、比对单进程")
+    ap.add_argument("--catalog", metavar="DB",
+                    help="本地标准目录（SQLite）：国家公告增量入库（已入库的文件直接跳过），"
+                         "并对目录中的全部公告比对；此时可省略国家公告参数")
+    ap.add_argument("--incremental", metavar="STATE",
+                    help="增量比对：读取并更新状态文件，只重新比对变化的行")
+    ap.add_argument("--top-k", type=int, default=0, metavar="K",
+                    help="待复核行保留综合分最高的 K 个候选（建议 3–5），另写候选表")
+    ap.add_argument("--due-within", type=int, metavar="N",
+                    help="只输出 N 天内新标准实施（含已实施）的失效 / 待复核行，按期限先后排序")
+    ap.add_argument("--sort-due", action="store_true",
+                    help="差异表按距新标准实施天数升序排列（无期限的行在后）")
+    ap.add_argument("--as-of", type=date.fromisoformat, metavar="YYYY-MM-DD",
+                    help="计算剩余天数的基准日，默认今天")
+    ap.add_argument("--outputs", default=",".join(DEFAULT_OUTPUTS), metavar="LIST",
+                    help=f"输出类型，逗号分隔，可选 {','.join(OUTPUTS)}（并行写出）")
+    ap.add_argument("--no-word", action="store_true",
+                    help="不生成 Word 失效清单（从 --outputs 中去掉 docx，且不导入 python-docx）")
+    ap.add_argument("--profile", action="store_true", help="运行结束后打印各阶段耗时与计数")
+    ap.add_argument("--profile-out", metavar="PATH",
+                    help="写出性能数据：.json 为阶段计时，.pstats/.prof 为 cProfile 统计")
     args = ap.parse_args()
+    args.outputs = [o.strip() for o in args.outputs.split(",") if o.strip()]
+    unknown = [o for o in args.outputs if o not in OUTPUTS]
+    if unknown:
+        ap.error(f"未知输出类型：{','.join(unknown)}，可选 {','.join(OUTPUTS)}")
+    if args.no_word:
+        args.outputs = [o for o in args.outputs if o != "docx"]
+    if not args.outputs:
+        ap.error("至少需要一种输出类型")
+    if args.due_within is not None and args.due_within < 0:
+        ap.error("--due-within 不能为负数")
+
+    from stdsync.core.cache import ParseCache
+
+    cache = ParseCache()
+    if args.clear_cache:
+        print(f"已清除缓存 {cache.clear()} 项")
+        if not (args.company or args.gb):
+            return
+    if not (args.company and (args.gb or args.catalog)):
+        ap.error("需要同时提供公司清单与国家公告（或 --catalog）")
+    if args.no_cache:
+        cache = None
+
+    profiler = Profiler() if (args.profile or args.profile_out) else None
+    cprof = None
+    if args.profile_out and Path(args.profile_out).suffix in (".pstats", ".prof"):
+        import cProfile
+
+        cprof = cProfile.Profile()
+
+    with profiling(profiler):
+        if cprof:
+            cprof.enable()
+        try:
+            _run_pipeline(args, cache)
+        finally:
+            if cprof:
+                cprof.disable()
+
+    if profiler:
+        print(profiler.summary())
+    if args.profile_out:
+        if cprof:
+            cprof.dump_stats(args.profile_out)
+        else:
+            profiler.write_json(args.profile_out)
+        print(f"性能数据已写入 {args.profile_out}")
+
+
+def _run_pipeline(args, cache: ParseCache | None) -> None:
+    """读取 → 比对 → 输出，各阶段计入 instrument；各阶段的依赖在阶段内导入"""
+    from stdsync.core import excel_io
+    from stdsync.core.index import AnnouncementIndex
+
+    sheet_name = None if args.all_sheets else 0
+    with stage("load_company"):
+        if args.all_sheets or not Path(args.company).is_file():
+            c_df = excel_io.load_company_batch(args.company, sheet_name,
+                                              workers=args.workers, cache=cache)
+        else:
+            c_df = excel_io.load_company(Path(args.company), cache=cache)
+    with stage("load_gb"):
+        if args.catalog:
+            g_index = _catalog_index(args, sheet_name, cache)
+        elif args.all_sheets or not Path(args.gb).is_file():
+            g_index = AnnouncementIndex.from_frame(
+                excel_io.load_gb_batch(args.gb, sheet_name,
+                                       workers=args.workers, cache=cache))
+        else:
+            g_index = excel_io.load_gb_index(Path(args.gb), cache=cache)
+
+    with stage("compare"):
+        from stdsync.core import comparer, lifecycle
+        from stdsync.core.results import ResultTable
+
+        if args.incremental:
+            from stdsync.core.incremental import compare_incremental
+
+            rows, stats = compare_incremental(c_df, g_index, args.incremental,
+                                              top_k=args.top_k)
+            results = lifecycle.annotate(ResultTable.from_results(rows), g_index, args.as_of)
+            mode = "完整运行" if stats.full_run else "增量运行"
+            print(f"{mode}：重新比对 {stats.rescanned} / {stats.total} 行")
+        else:
+            results = comparer.compare_table(c_df, g_index, workers=args.workers or 1,
+                                             top_k=args.top_k, as_of=args.as_of)
+
+    with stage("lifecycle"):
+        if args.due_within is not None:
+            results = lifecycle.due_within(results, args.due_within)
+            print(f"{args.due_within} 天内到期：{len(results)} 行")
+        elif args.sort_due:
+            results = lifecycle.sort_by_due(results)
+
+    from stdsync.core.outputs import write_outputs
+
+    paths = write_outputs(results, Path.cwd() / "输出结果", args.outputs,
+                          gb_path=args.gb, workers=args.workers)
+    print("已生成 " + " 以及 ".join(str(p) for p in paths.values()))
 
-    c_df = excel_io.load_company(Path(args.company))
-    g_df = excel_io.load_gb(Path(args.gb))
-    results = comparer.compare(c_df, g_df)
 
-    out_dir = Path.cwd() / "输出结果"
-    out_dir.mkdir(exist_ok=True)
-    out_file = out_dir / f"差异_{datetime.now():%Y%m%d_%H%M%S}.xlsx"
-    reporter.render(results, out_file)
+def _catalog_index(args, sheet_name, cache: ParseCache | None):
+    """国家公告逐个文件增量入库后，从本地目录取比对索引"""
+    from stdsync.core import excel_io
+    from stdsync.core.catalog import StandardCatalog
 
-    doc_file = out_dir / f"差异详情_{datetime.now():%Y%m%d_%H%M%S}.docx"
-    word_exporter.render_word(results, doc_file)
-    print(f"已生成 {out_file} 以及 {doc_file}")
\ No newline at end of file
+    with StandardCatalog(args.catalog) as catalog:
+        for path in (excel_io.expand_sources(args.gb) if args.gb else []):
+            sheets = ([""] if excel_io.is_table_file(path)
+                      else excel_io.sheet_names(path) if sheet_name is None else [sheet_name])
+            for sheet in sheets:
+                written = catalog.ingest_file(path, sheet or 0, cache=cache)
+                print(f"目录入库 {path.name}：{written} 行" if written
+                      else f"目录已包含 {path.name}，跳过")
+        print(f"本地目录 {args.catalog}：共 {len(catalog)} 条标准")
+        return catalog.index()
@@ -0,0 +1,102 @@
+"""
+blocking.py – REVIEW 候选生成（倒排索引 + 无损过滤）
+---------------------------------------------------------------
+fuzz.ratio = 200 * LCS / (l1 + l2)，因此 “编号相似度 ≥ 85” 要求
+LCS ≥ L = ceil(0.425 * (l1 + l2))，由此推出三条无损过滤条件：
+1. 长度过滤：min(l1, l2) ≥ L
+2. 二元组计数过滤：每删除一个字符至多破坏 2 个二元组、每插入一个
+   至多破坏 1 个，故共享二元组数 ≥ 3L - l1 - l2 - 1
+3. 字符计数过滤：LCS ≤ Σ min(cnt1(ch), cnt2(ch))，须 ≥ L
+只有三条全部通过的公告旧号才进入 fuzz 打分，
+REVIEW 结果与逐行暴力扫描完全一致。
+"""
+from __future__ import annotations
+
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+# 编号相似度下限（与 comparer 的 REVIEW 规则一致）
+CODE_CUTOFF = 85
+
+
+def _bigrams(code: str) -> List[Tuple[str, int]]:
+    """
+    拆分二元组，并附带出现序号（按多重集计数，"00" 出现两次记为两项）
+    """
+    seen: dict[str, int] = {}
+    grams = []
+    for i in range(len(code) - 1):
+        g = code[i:i + 2]
+        n = seen.get(g, 0)
+        seen[g] = n + 1
+        grams.append((g, n))
+    return grams
+
+
+class CodeBlocker:
+    """
+    公告旧号的候选索引：每份公告构建一次，对每个公司编号返回可能达标的旧号下标
+    """
+
+    def __init__(self, old_codes: Iterable[str], cutoff: float = CODE_CUTOFF):
+        self.old_codes: List[str] = list(old_codes)
+        self.cutoff = cutoff
+        n = len(self.old_codes)
+        self._lens = np.fromiter((len(s) for s in self.old_codes),
+                                 dtype=np.int64, count=n)
+
+        # 二元组倒排表
+        postings: dict[Tuple[str, int], List[int]] = {}
+        for i, code in enumerate(self.old_codes):
+            for gram in _bigrams(code):
+                postings.setdefault(gram, []).append(i)
+        self._postings = {g: np.asarray(ids, dtype=np.int64)
+                          for g, ids in postings.items()}
+
+        # 字符计数矩阵（行 = 旧号，列 = 字符）
+        self._alphabet = {ch: j for j, ch in
+                          enumerate(sorted(set().union(*self.old_codes)))}
+        self._char_counts = np.zeros((n, len(self._alphabet)), dtype=np.int32)
+        for i, code in enumerate(self.old_codes):
+            for ch in code:
+                self._char_counts[i, self._alphabet[ch]] += 1
+
+    def __len__(self) -> int:
+        return len(self.old_codes)
+
+    def candidates(self, code: str) -> np.ndarray:
+        """
+        返回可能满足 fuzz.ratio(code, old) ≥ cutoff 的旧号下标（升序）
+        """
+        if not self.old_codes:
+            return np.empty(0, dtype=np.int64)
+
+        l1 = len(code)
+        lens = self._lens
+        total = lens + l1
+        # LCS 下限；-1e-9 仅吸收浮点误差，整数比较本身无损
+        lcs_min = np.ceil(self.cutoff * total / 200 - 1e-9).astype(np.int64)
+
+        # 1) 长度过滤
+        keep = np.minimum(lens, l1) >= lcs_min
+
+        # 2) 二元组计数过滤
+        shared = np.zeros(len(lens), dtype=np.int64)
+        for gram in _bigrams(code):
+            ids = self._postings.get(gram)
+            if ids is not None:
+                shared[ids] += 1        # 同一旧号在一个倒排表内至多出现一次
+        keep &= shared >= 3 * lcs_min - total - 1
+
+        # 3) 字符计数过滤（只对前两步的幸存者计算）
+        idx = np.flatnonzero(keep)
+        if len(idx):
+            query = np.zeros(len(self._alphabet), dtype=np.int32)
+            for ch in code:
+                j = self._alphabet.get(ch)
+                if j is not None:       # 旧号中不存在的字符不可能计入 LCS
+                    query[j] += 1
+            upper = np.minimum(self._char_counts[idx], query).sum(axis=1)
+            idx = idx[upper >= lcs_min[idx]]
+        return idx
@@ -0,0 +1,171 @@
+"""
+cache.py – 解析结果的本地磁盘缓存
+---------------------------------------------------------------
+* 键：文件内容 SHA-256 + 类别（company / gb / gb_index）+ 工作表 + 加载器版本
+* DataFrame 存为 Parquet（pyarrow），预编译索引存为 pickle
+* 总大小超过上限时按最近访问时间（LRU）淘汰
+未变化的文件再次运行时直接读取缓存，完全跳过 Excel 解析。
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Callable
+
+import pandas as pd
+
+from . import instrument
+
+DEFAULT_CACHE_DIR = Path.home() / ".stdsync_cache"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024       # 512 MB
+
+# 缓存格式版本：清洗逻辑或索引结构变化时递增，旧缓存自动失效
+CACHE_VERSION = 5
+
+
+def file_digest(path: Path | str) -> str:
+    """流式计算文件内容的 SHA-256"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _read_frame(entry: Path) -> pd.DataFrame:
+    """读取缓存的 Parquet；list 列（如 replaced_list）还原为 Arrow 列"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    return pq.read_table(entry).to_pandas(
+        types_mapper=lambda t: pd.ArrowDtype(t) if pa.types.is_list(t) else None)
+
+
+class ParseCache:
+    """按内容哈希寻址的解析缓存"""
+
+    def __init__(self, root: Path | str = DEFAULT_CACHE_DIR,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # 键与路径
+    # ------------------------------------------------------------------
+    def key(self, path: Path | str, kind: str, sheet_name=0) -> str:
+        raw = f"{file_digest(path)}|{kind}|{sheet_name!r}|v{CACHE_VERSION}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _entry(self, key: str, suffix: str) -> Path:
+        return self.root / f"{key}{suffix}"
+
+    # ------------------------------------------------------------------
+    # 读写
+    # ------------------------------------------------------------------
+    def frame(self, path: Path | str, kind: str, sheet_name,
+              loader: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """命中则读 Parquet，否则调用 loader 解析并写入缓存"""
+        entry = self._entry(self.key(path, kind, sheet_name), ".parquet")
+        if entry.exists():
+            try:
+                df = _read_frame(entry)
+                self._touch(entry)
+                self.hits += 1
+                instrument.count("cache_hits")
+                return df
+            except Exception:
+                entry.unlink(missing_ok=True)       # 损坏的缓存直接丢弃
+
+        self.misses += 1
+        instrument.count("cache_misses")
+        df = loader()
+        self._write(entry, lambda tmp: df.to_parquet(tmp, index=False))
+        return df
+
+    def obj(self, path: Path | str, kind: str, sheet_name,
+            builder: Callable[[], Any]) -> Any:
+        """命中则反序列化 pickle，否则调用 builder 构建并写入缓存"""
+        entry = self._entry(self.key(path, kind, sheet_name), ".pkl")
+        if entry.exists():
+            try:
+                with open(entry, "rb") as f:
+                    value = pickle.load(f)
+                self._touch(entry)
+                self.hits += 1
+                instrument.count("cache_hits")
+                return value
+            except Exception:
+                entry.unlink(missing_ok=True)
+
+        self.misses += 1
+        instrument.count("cache_misses")
+        value = builder()
+
+        def dump(tmp: Path):
+            with open(tmp, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        self._write(entry, dump)
+        return value
+
+    def _write(self, entry: Path, writer: Callable[[Path], None]) -> None:
+        """先写临时文件再原子替换；写入失败（如重复列名）只放弃缓存，不影响结果"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+        try:
+            writer(tmp)
+            os.replace(tmp, entry)
+        except Exception:
+            tmp.unlink(missing_ok=True)
+            return
+        self._evict()
+
+    @staticmethod
+    def _touch(entry: Path) -> None:
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+
+    # ------------------------------------------------------------------
+    # 容量管理
+    # ------------------------------------------------------------------
+    def _entries(self) -> list[Path]:
+        if not self.root.is_dir():
+            return []
+        return [p for p in self.root.iterdir()
+                if p.is_file() and p.suffix in (".parquet", ".pkl")]
+
+    def _stats(self) -> list[tuple[Path, os.stat_result]]:
+        """各条目只 stat 一次；批量读取时多个进程共用缓存目录，已被其他进程淘汰的条目跳过"""
+        stats = []
+        for p in self._entries():
+            try:
+                stats.append((p, p.stat()))
+            except FileNotFoundError:
+                continue
+        return stats
+
+    def size(self) -> int:
+        return sum(st.st_size for _, st in self._stats())
+
+    def _evict(self) -> None:
+        """总大小超限时，从最久未访问的条目开始删除"""
+        entries = sorted(self._stats(), key=lambda e: e[1].st_mtime)
+        total = sum(st.st_size for _, st in entries)
+        for p, st in entries:
+            if total <= self.max_bytes:
+                break
+            total -= st.st_size
+            p.unlink(missing_ok=True)
+
+    def clear(self) -> int:
+        """清空缓存，返回删除的条目数"""
+        entries = self._entries()
+        for p in entries:
+            p.unlink(missing_ok=True)
+        return len(entries)
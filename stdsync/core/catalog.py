@@ -0,0 +1,314 @@
+"""
+catalog.py – 本地国家标准目录（SQLite）
+---------------------------------------------------------------
+国家公告每月只有少量变化，目录把历次公告增量入库，比对时不再从原始表格解析：
+* standards – 每个规范化新号一行（按 code_norm 去重，后入库的公告覆盖先入库的，
+              但未填“代替标准号”的行不清除已入库的旧号；同一批内的重复行合并旧号）；
+              code_norm 唯一索引，base（前缀 + 顺序号，如 “GB/T 1346.1”）索引
+* replaced  – 新号代替的旧号，每个旧号一行；old、old_base 索引
+* names_fts – 标准名称的 FTS5 全文索引（trigram 分词，中文子串可直接检索）
+* sources   – 已入库的文件（内容哈希 + 工作表），同一文件再次入库直接跳过
+
+查询（lookup / replaced_by / history / search）均走索引，毫秒级返回。
+比对时 index() 按入库顺序一次读出全部行构建 AnnouncementIndex，并按目录版本缓存：
+REVIEW 的编号相似度阈值无法由前缀或全文索引无损回答，仍由 CodeBlocker 生成候选，
+结果与直接比对同一份公告一致。
+"""
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime
+from itertools import groupby
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .cache import file_digest
+from .clean import derive_columns, to_dates, to_pylist
+from .index import AnnouncementIndex
+
+DEFAULT_CATALOG_PATH = Path.home() / ".stdsync_catalog.sqlite3"
+
+# 目录结构版本：表结构变化时递增，旧目录需重新入库
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS standards (
+    id        INTEGER PRIMARY KEY,
+    code_norm TEXT NOT NULL UNIQUE,
+    code      TEXT,
+    name      TEXT,
+    impl_date TEXT,
+    base      TEXT NOT NULL,
+    replaced  TEXT,
+    seq       INTEGER NOT NULL,
+    source    TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_standards_base ON standards(base);
+CREATE INDEX IF NOT EXISTS idx_standards_seq ON standards(seq);
+CREATE TABLE IF NOT EXISTS replaced (
+    standard_id INTEGER NOT NULL REFERENCES standards(id) ON DELETE CASCADE,
+    pos         INTEGER NOT NULL,
+    old         TEXT NOT NULL,
+    old_base    TEXT NOT NULL,
+    PRIMARY KEY (standard_id, pos)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_replaced_old ON replaced(old);
+CREATE INDEX IF NOT EXISTS idx_replaced_old_base ON replaced(old_base);
+CREATE TABLE IF NOT EXISTS sources (
+    digest   TEXT NOT NULL,
+    sheet    TEXT NOT NULL,
+    path     TEXT,
+    rows     INTEGER,
+    ingested TEXT,
+    PRIMARY KEY (digest, sheet)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS names_fts USING fts5(
+    name, content='standards', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS standards_ai AFTER INSERT ON standards BEGIN
+    INSERT INTO names_fts(rowid, name) VALUES (new.id, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS standards_ad AFTER DELETE ON standards BEGIN
+    INSERT INTO names_fts(names_fts, rowid, name) VALUES ('delete', old.id, old.name);
+END;
+CREATE TRIGGER IF NOT EXISTS standards_au AFTER UPDATE OF name ON standards BEGIN
+    INSERT INTO names_fts(names_fts, rowid, name) VALUES ('delete', old.id, old.name);
+    INSERT INTO names_fts(rowid, name) VALUES (new.id, new.name);
+END;
+"""
+
+_COLUMNS = ("code_norm", "code", "name", "impl_date", "base", "replaced", "seq", "source")
+
+# 后入库的行没有“代替标准号”时保留已入库的旧号及其入库顺序，不因重复列出而丢失代替关系
+_KEEP_OLDS = "excluded.replaced IS NULL AND standards.replaced IS NOT NULL"
+_KEEP_COLUMNS = {
+    "replaced": "replaced = COALESCE(excluded.replaced, standards.replaced)",
+    "seq": f"seq = CASE WHEN {_KEEP_OLDS} THEN standards.seq ELSE excluded.seq END",
+}
+
+# trigram 分词的最短检索串
+FTS_MIN_CHARS = 3
+
+
+def base_number(code: str) -> str:
+    """规范化编号去掉年代号：“GB/T 1346.1—2011” → “GB/T 1346.1”"""
+    return code.split("—", 1)[0].strip()
+
+
+class StandardCatalog:
+    """SQLite 标准目录；可作为 compare / compare_table 的 gb 参数"""
+
+    def __init__(self, path: Path | str = DEFAULT_CATALOG_PATH):
+        self.path = Path(path)
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+            version = self._meta("schema_version")
+            if version is None:
+                self._set_meta("schema_version", SCHEMA_VERSION)
+            elif int(version) != SCHEMA_VERSION:
+                raise ValueError(f"目录结构版本 {version} 与当前版本 {SCHEMA_VERSION} 不一致，"
+                                 f"请删除 {self.path} 后重新入库")
+        self._index: AnnouncementIndex | None = None
+        self._index_rev: int | None = None
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "StandardCatalog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM standards").fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # 元数据
+    # ------------------------------------------------------------------
+    def _meta(self, key: str) -> str | None:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def _set_meta(self, key: str, value) -> None:
+        self.conn.execute("INSERT INTO meta(key, value) VALUES (?, ?) "
+                          "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                          (key, str(value)))
+
+    @property
+    def revision(self) -> int:
+        """目录版本：每次有数据入库时递增"""
+        return int(self._meta("revision") or 0)
+
+    # ------------------------------------------------------------------
+    # 入库
+    # ------------------------------------------------------------------
+    def ingest(self, gb_df: pd.DataFrame, source: str | None = None) -> int:
+        """
+        将 load_gb() 返回的公告入库，返回写入的行数
+        * 按规范化新号去重：同一新号以后出现（后入库）的行为准，其旧号列表整体替换；
+          后出现的行没有“代替标准号”时保留已入库的旧号；
+          同一批内重复列出的新号合并各行的旧号
+        * 无编号的行不入库
+        """
+        with self.conn:
+            return self._ingest(gb_df, source)
+
+    def _ingest(self, gb_df: pd.DataFrame, source: str | None) -> int:
+        df = derive_columns(gb_df)
+        n = len(df)
+        codes = to_pylist(df["code_norm"])
+        names = df["name"].tolist()
+        raw_codes = df["code"].tolist()
+        dates = to_dates(df["impl_date"]) if "impl_date" in df.columns else [None] * n
+        has_replaced = "replaced" in df.columns
+        raws = df["replaced"].tolist() if has_replaced else [None] * n
+        olds = to_pylist(df["replaced_list"]) if has_replaced else [None] * n
+
+        # 同一批内重复的新号：编号、名称、日期取最后一行；各行的旧号合并（与 replaced_map
+        # 一样每个旧号都指向该新号），位置取最后一行带旧号的行
+        last = {code: i for i, code in enumerate(codes) if code}
+        if not last:
+            return 0
+        with_olds: dict[str, int] = {}
+        merged_olds: dict[str, dict] = {}
+        merged_raws: dict[str, list] = {}
+        for i, code in enumerate(codes):
+            if code and olds[i] is not None:
+                with_olds[code] = i
+                merged_olds.setdefault(code, {}).update(dict.fromkeys(olds[i]))
+                if not pd.isna(raws[i]):
+                    merged_raws.setdefault(code, []).append(str(raws[i]))
+        src = sorted(with_olds.get(code, i) for code, i in last.items())
+        seq0 = self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM standards").fetchone()[0]
+        rows = []
+        for k, j in enumerate(src, start=1):
+            code = codes[j]
+            i = last[code]
+            raw = "；".join(dict.fromkeys(merged_raws[code])) if code in merged_raws else None
+            rows.append((code, raw_codes[i], None if pd.isna(names[i]) else str(names[i]),
+                         dates[i].isoformat() if dates[i] else None, base_number(code),
+                         raw, seq0 + k, source))
+        self.conn.executemany(
+            f"INSERT INTO standards({', '.join(_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(_COLUMNS))}) "
+            "ON CONFLICT(code_norm) DO UPDATE SET "
+            + ", ".join(f"{c} = excluded.{c}" for c in _COLUMNS[1:] if c not in _KEEP_COLUMNS)
+            + ", " + ", ".join(_KEEP_COLUMNS.values()),
+            rows,
+        )
+
+        # 保留了原旧号的行 seq 未变，不在此列，其 replaced 行不删除
+        ids = dict(self.conn.execute(
+            "SELECT code_norm, id FROM standards WHERE seq > ?", (seq0,)).fetchall())
+        self.conn.executemany("DELETE FROM replaced WHERE standard_id = ?",
+                              [(sid,) for sid in ids.values()])
+        self.conn.executemany(
+            "INSERT INTO replaced(standard_id, pos, old, old_base) VALUES (?, ?, ?, ?)",
+            [(ids[codes[j]], pos, old, base_number(old))
+             for j in src if codes[j] in merged_olds
+             for pos, old in enumerate(merged_olds[codes[j]])],
+        )
+        self._set_meta("revision", self.revision + 1)
+        return len(rows)
+
+    def ingest_file(self, path: Path | str, sheet_name=0, cache=None) -> int:
+        """
+        读取公告文件并入库，返回写入的行数；
+        同一内容、同一工作表已入库时直接跳过（返回 0），不解析表格
+        """
+        from . import excel_io
+
+        path = Path(path)
+        digest = file_digest(path)
+        sheet = repr(sheet_name)
+        if self.conn.execute("SELECT 1 FROM sources WHERE digest = ? AND sheet = ?",
+                             (digest, sheet)).fetchone():
+            return 0
+        df = excel_io.load_gb(path, sheet_name, cache)
+        with self.conn:
+            written = self._ingest(df, str(path))
+            self.conn.execute("INSERT INTO sources(digest, sheet, path, rows, ingested) "
+                              "VALUES (?, ?, ?, ?, ?)",
+                              (digest, sheet, str(path), written,
+                               datetime.now().isoformat(timespec="seconds")))
+        return written
+
+    # ------------------------------------------------------------------
+    # 比对索引
+    # ------------------------------------------------------------------
+    def index(self) -> AnnouncementIndex:
+        """按入库顺序构建带旧号的公告索引；目录未变化时复用上次构建的索引"""
+        rev = self.revision
+        if self._index is not None and self._index_rev == rev:
+            return self._index
+
+        rows = self.conn.execute(
+            "SELECT id, code_norm, name, impl_date FROM standards "
+            "WHERE replaced IS NOT NULL ORDER BY seq").fetchall()
+        olds = {sid: [old for _, old in grp] for sid, grp in groupby(
+            self.conn.execute("SELECT standard_id, old FROM replaced ORDER BY standard_id, pos"),
+            key=lambda r: r[0])}
+        self._index = AnnouncementIndex(
+            [r["code_norm"] for r in rows],
+            [r["name"] for r in rows],
+            [olds.get(r["id"], []) for r in rows],
+            np.array([r["impl_date"] for r in rows], dtype="datetime64[D]"),
+        )
+        self._index_rev = rev
+        return self._index
+
+    # ------------------------------------------------------------------
+    # 索引查询
+    # ------------------------------------------------------------------
+    def lookup(self, code: str) -> dict | None:
+        """按规范化新号查询一条标准"""
+        row = self.conn.execute("SELECT * FROM standards WHERE code_norm = ?", (code,)).fetchone()
+        return None if row is None else self._record(row)
+
+    def replaced_by(self, old: str) -> list[dict]:
+        """代替了给定旧号的标准（按入库顺序，最后一条即 replaced_map 的结果）"""
+        rows = self.conn.execute(
+            "SELECT s.* FROM replaced r JOIN standards s ON s.id = r.standard_id "
+            "WHERE r.old = ? ORDER BY s.seq", (old,)).fetchall()
+        return [self._record(r) for r in rows]
+
+    def history(self, base: str) -> list[dict]:
+        """同一前缀 + 顺序号的历次版本（新号或被代替的旧号），按编号排序"""
+        rows = self.conn.execute(
+            "SELECT * FROM standards WHERE base = ? "
+            "UNION SELECT s.* FROM replaced r JOIN standards s ON s.id = r.standard_id "
+            "WHERE r.old_base = ? ORDER BY code_norm", (base, base)).fetchall()
+        return [self._record(r) for r in rows]
+
+    def search(self, text: str, limit: int = 20) -> list[dict]:
+        """名称全文检索（子串匹配，按相关度排序）；少于 FTS_MIN_CHARS 个字时退回 LIKE"""
+        text = text.strip()
+        if len(text) >= FTS_MIN_CHARS:
+            query = '"' + text.replace('"', '""') + '"'
+            rows = self.conn.execute(
+                "SELECT s.* FROM names_fts f JOIN standards s ON s.id = f.rowid "
+                "WHERE names_fts MATCH ? ORDER BY f.rank LIMIT ?", (query, limit)).fetchall()
+        else:
+            rows = self.conn.execute(
+                "SELECT * FROM standards WHERE instr(name, ?) > 0 ORDER BY seq LIMIT ?",
+                (text, limit)).fetchall()
+        return [self._record(r) for r in rows]
+
+    def _record(self, row: sqlite3.Row) -> dict:
+        rec = {k: row[k] for k in ("code_norm", "code", "name", "impl_date", "base", "source")}
+        rec["replaced"] = [r[0] for r in self.conn.execute(
+            "SELECT old FROM replaced WHERE standard_id = ? ORDER BY pos", (row["id"],))]
+        return rec
@@ -0,0 +1,90 @@
+"""
+chains.py – 跨公告的替代链
+---------------------------------------------------------------
+replaced_map 只记录一跳：A 被 B 代替。若更新的公告中 B 又被 C 代替，
+持有 A 的公司应直接指向现行的 C，而不是已作废的 B。
+
+ReplacementGraph 在构建索引时对全部已加载公告的“旧号 → 新号”边一次性求传递闭包：
+沿边迭代前进，遇到已解析的节点即复用其结果（路径压缩），每个节点只解析一次，
+总耗时 O(边数)；之后任一旧号的现行新号为一次字典查询。
+  successor – 旧号 → 现行新号（链的终点）
+  hops      – 旧号到现行新号的跳数（1 为直接代替）
+  cyclic    – 处于循环或通向循环的旧号；此类旧号无法确定现行新号，
+              successor 保留直接代替的新号，由 reason() 提示人工核对
+"""
+from __future__ import annotations
+
+from typing import Dict, List, Set
+
+# 替代链显示用的箭头
+ARROW = " → "
+
+# 直接代替时的备注（与原一跳比对一致）
+DIRECT_REASON = "精确命中旧号"
+
+
+class ReplacementGraph:
+    """旧号 → 新号 替代图及其传递闭包"""
+
+    def __init__(self, replaced_map: Dict[str, str]):
+        self.next = replaced_map
+        self.successor: Dict[str, str] = {}
+        self.hops: Dict[str, int] = {}
+        self.cyclic: Set[str] = set()
+
+        for start in replaced_map:
+            if start in self.successor:
+                continue
+            # 沿边前进，直到现行编号（不再被代替）、已解析节点或回到本条路径
+            path: List[str] = []
+            on_path: Set[str] = set()
+            node = start
+            while node in replaced_map and node not in self.successor and node not in on_path:
+                path.append(node)
+                on_path.add(node)
+                node = replaced_map[node]
+
+            if node in on_path or node in self.cyclic:
+                # 成环（或汇入已知的环）：整条路径都无法确定现行新号
+                self.cyclic.update(path)
+                for n in path:
+                    self.successor[n] = replaced_map[n]
+                    self.hops[n] = 1
+                continue
+
+            if node in self.successor:
+                final, base = self.successor[node], self.hops[node]
+            else:
+                final, base = node, 0
+            for depth, n in enumerate(reversed(path), start=base + 1):
+                self.successor[n] = final
+                self.hops[n] = depth
+
+    def __contains__(self, code: str) -> bool:
+        return code in self.successor
+
+    def __len__(self) -> int:
+        return len(self.successor)
+
+    def chain(self, code: str) -> List[str]:
+        """
+        完整替代链 [旧号, 中间编号..., 现行新号]；成环时以第一个重复出现的编号结尾，
+        如 [A, B, C, B]。code 未被代替时返回 [code]
+        """
+        out = [code]
+        seen = {code}
+        while code in self.next:
+            code = self.next[code]
+            out.append(code)
+            if code in seen:
+                break
+            seen.add(code)
+        return out
+
+    def reason(self, code: str) -> str:
+        """OBSOLETE 备注：直接代替沿用原备注，多跳附完整替代链，成环时提示人工核对"""
+        if code in self.cyclic:
+            return f"{DIRECT_REASON}；替代链存在循环，需人工核对：{ARROW.join(self.chain(code))}"
+        if self.hops.get(code, 1) == 1:
+            return DIRECT_REASON
+        return f"{DIRECT_REASON}；替代链：{ARROW.join(self.chain(code))}"
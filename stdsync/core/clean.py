@@ -0,0 +1,142 @@
+"""
+clean.py – 读取后的单次向量化清洗
+---------------------------------------------------------------
+load_company / load_gb 读取原始表后各调用一次，整列计算（pyarrow 字符串内核），
+比对、索引与增量比对直接读取结果列，不再逐行重复规范化：
+  code_norm      – 规范化编号，规则同 codes.normalize_code（NFKC → 统一破折号 → 去首尾空白），
+                   缺失为 ""
+  replaced_list  – “代替标准号”按 SPLIT_PATTERN 拆分、逐个规范化后的旧号列表
+                   （list<string> 列，保留空串以保持原判定；缺失为空值，不参与比对）
+  impl_date      – 解析为日期（datetime64），支持 2024-01-01 / 2024/1/1 / 2024.1.1 /
+                   2024年1月1日 / 20240101 及 Excel 日期序号，无法解析为 NaT
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .codes import SPLIT_PATTERN
+
+# 派生列
+DERIVED_COLS = ("code_norm", "replaced_list")
+
+# 统一为长破折号的字符（NFKC 之后）
+DASHES = ("-", "–")
+
+# 年 / 月 / 日
+DATE_PATTERN = (r"^\s*(?P<year>\d{4})\s*[-/.年]?\s*(?P<month>\d{1,2})"
+                r"\s*[-/.月]?\s*(?P<day>\d{1,2})")
+# 按常规格式存储的 Excel 日期序号（5 位，约 1927–2173 年）
+SERIAL_PATTERN = r"^\s*(?P<serial>\d{5})(?:\.0+)?\s*$"
+EXCEL_EPOCH = pd.Timestamp("1899-12-30")
+
+
+def _strings(values) -> pa.Array:
+    """列 → pyarrow string 数组；缺失（None / NaN）为空值，其余非字符串取 str()"""
+    s = values if isinstance(values, pd.Series) else pd.Series(values, dtype=object)
+    try:
+        arr = pa.array(s, type=pa.string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.array([None if v is None or v != v else str(v) for v in s.tolist()],
+                        type=pa.string())
+    # 拼接而来的 Arrow 字符串列（如 pd.concat 的结果）转换后为分块数组
+    return arr.combine_chunks() if isinstance(arr, pa.ChunkedArray) else arr
+
+
+def _series(arr: pa.Array, index: pd.Index) -> pd.Series:
+    return pd.Series(pd.arrays.ArrowExtensionArray(arr), index=index)
+
+
+# ------------------------------------------------------------------
+# 整列内核
+# ------------------------------------------------------------------
+def normalize_array(arr: pa.Array) -> pa.Array:
+    """整列 normalize_code；空值保持为空"""
+    arr = pc.utf8_normalize(arr, "NFKC")
+    for dash in DASHES:
+        arr = pc.replace_substring(arr, dash, "—")
+    return pc.utf8_trim_whitespace(arr)
+
+
+def split_replaced_array(arr: pa.Array) -> pa.ListArray:
+    """整列 codes.split_replaced：先拆分、展开后一次规范化，再按原偏移装回列表"""
+    lists = pc.split_pattern_regex(arr, SPLIT_PATTERN.pattern)
+    flat = normalize_array(pc.list_flatten(lists))
+    offsets = pc.subtract(lists.offsets, lists.offsets[0])
+    return pa.ListArray.from_arrays(offsets, flat, mask=lists.is_null())
+
+
+def code_norm(values) -> pd.Series:
+    """规范化编号列（缺失 → ""），保留原索引"""
+    index = values.index if isinstance(values, pd.Series) else None
+    arr = normalize_array(_strings(values)).fill_null("")
+    return _series(arr, index if index is not None else pd.RangeIndex(len(arr)))
+
+
+def replaced_list(values) -> pd.Series:
+    """拆分并规范化“代替标准号”列，保留原索引"""
+    index = values.index if isinstance(values, pd.Series) else None
+    arr = split_replaced_array(_strings(values))
+    return _series(arr, index if index is not None else pd.RangeIndex(len(arr)))
+
+
+def parse_dates(values) -> pd.Series:
+    """解析实施日期列为 datetime64；已是日期类型时原样返回"""
+    s = values if isinstance(values, pd.Series) else pd.Series(values, dtype=object)
+    if pd.api.types.is_datetime64_any_dtype(s.dtype):
+        return s
+    arr = _strings(s)
+
+    parts = pc.extract_regex(arr, DATE_PATTERN)
+    ymd = pd.DataFrame({f: pc.cast(pc.struct_field(parts, f), pa.float64())
+                        .to_numpy(zero_copy_only=False) for f in ("year", "month", "day")})
+    dates = pd.to_datetime(ymd, errors="coerce")
+
+    serial = pc.cast(pc.struct_field(pc.extract_regex(arr, SERIAL_PATTERN), "serial"),
+                     pa.float64()).to_numpy(zero_copy_only=False)
+    if not np.isnan(serial).all():
+        dates = dates.fillna(pd.Series(EXCEL_EPOCH + pd.to_timedelta(serial, unit="D")))
+
+    dates.index = s.index
+    return dates
+
+
+def to_pylist(values: pd.Series) -> list:
+    """列 → Python 列表；Arrow 列经 pyarrow 直接转换（远快于 Series.tolist），空值为 None"""
+    if isinstance(values.array, pd.arrays.ArrowExtensionArray):
+        return pa.array(values.array).to_pylist()
+    return values.tolist()
+
+
+def to_dates(values: pd.Series) -> list:
+    """datetime64 列 → datetime.date / None 列表（构造 CompanyStandard 用）"""
+    out = values.dt.date.tolist()
+    if values.hasnans:
+        out = [None if m else d for d, m in zip(out, values.isna().tolist())]
+    return out
+
+
+# ------------------------------------------------------------------
+# 整表
+# ------------------------------------------------------------------
+def derive_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    补齐派生列（已存在的列不重算）：code_norm、replaced_list（有 replaced 列时）、
+    impl_date 解析为日期。未经 load_* 的 DataFrame（如直接构造的测试数据）也可传入
+    """
+    missing = ("code_norm" not in df.columns
+               or ("replaced" in df.columns and "replaced_list" not in df.columns)
+               or ("impl_date" in df.columns
+                   and not pd.api.types.is_datetime64_any_dtype(df["impl_date"].dtype)))
+    if not missing:
+        return df
+    df = df.copy()
+    if "code_norm" not in df.columns:
+        df["code_norm"] = code_norm(df["code"])
+    if "replaced" in df.columns and "replaced_list" not in df.columns:
+        df["replaced_list"] = replaced_list(df["replaced"])
+    if "impl_date" in df.columns:
+        df["impl_date"] = parse_dates(df["impl_date"])
+    return df
@@ -0,0 +1,50 @@
+"""
+codes.py – 标准编号规范化与“代替标准号”拆分
+"""
+from __future__ import annotations
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import List
+
+import pandas as pd
+
+# “代替标准号”单元格内的多个旧号分隔符
+SPLIT_PATTERN = re.compile(r"[;；,，]")
+
+# 规范化结果缓存条数（同一批编号在公告与清单中反复出现）
+NORMALIZE_CACHE_SIZE = 1 << 18
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _normalize_str(code: str) -> str:
+    if code.isascii():                  # ASCII 在 NFKC 下不变，只需替换半角连字符
+        return code.replace("-", "—").strip()
+    code = unicodedata.normalize("NFKC", code)
+    return code.replace("-", "—").replace("–", "—").strip()
+
+
+def normalize_code(code: str) -> str:
+    """
+    全角→半角 + 统一破折号 → 去首尾空格
+    """
+    if code is None:
+        return ""
+    return _normalize_str(str(code))
+
+
+def normalize_codes(values) -> pd.Series:
+    """
+    normalize_code 的整列版本（DataFrame 的编号列），结果与逐个调用一致：
+    None → ""，其余取 str() 后规范化；重复编号直接命中缓存
+    """
+    s = values if isinstance(values, pd.Series) else pd.Series(values, dtype=object)
+    norm = _normalize_str
+    out = ["" if v is None else norm(v if type(v) is str else str(v)) for v in s.tolist()]
+    return pd.Series(out, index=s.index, dtype=object)
+
+
+def split_replaced(rep) -> List[str]:
+    """拆分“代替标准号”单元格，返回规范化后的旧号列表（保留空串以保持原判定）"""
+    return [normalize_code(old) for old in SPLIT_PATTERN.split(str(rep))]
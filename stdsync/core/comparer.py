@@ -1,119 +1,263 @@
 # ==================== stdsync/core/comparer.py ==================
 """
-comparer.py  v0.2.0
+comparer.py  v0.3.0
 ---------------------------------------------------------------
 规则：
-1. 若公司旧号精确出现在公告 "replaced" 列 → OBSOLETE
+1. 若公司旧号精确出现在公告 "replaced" 列 → OBSOLETE，新号沿替代链解析到现行标准
+   （A 被 B 代替、B 又被 C 代替时指向 C，备注中列出完整替代链，见 chains.py）
 2. 否则，若同时满足
       (a) 公司旧号与公告旧号字符串相似度 80–99
       (b) 名称相似度 ≥ 80
    → REVIEW
 3. 其余 → OK
+
+REVIEW 候选由 blocking.CodeBlocker 无损剪枝生成，结果与逐行扫描一致。
+编号与实施日期读取清洗阶段（clean.py）的 code_norm / impl_date 列，不再逐行规范化。
 """
 
 from __future__ import annotations
 
-import re
-import unicodedata
-from typing import List
+import heapq
+import multiprocessing as mp
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from datetime import date
+from typing import Iterator, List
 
 import pandas as pd
 from rapidfuzz import fuzz
 
-from .models import CompanyStandard, MatchResult
+from . import instrument, lifecycle
+from .catalog import StandardCatalog
+from .clean import derive_columns, to_dates, to_pylist
+from .codes import normalize_code, normalize_codes  # noqa: F401  （保持 comparer.normalize_code 可用）
+from .index import AnnouncementIndex
+from .models import CompanyStandard, MatchResult, ReviewCandidate
+from .results import ResultTable
+from .scoring import batch_code_scores
+
+ENGINES = ("blocked", "cdist", "brute")
+
+# iter_compare 每块处理的公司行数
+COMPANY_CHUNK = 4096
+
+
+def _review_brute(comp_code: str, index: AnnouncementIndex):
+    """逐行扫描全部公告行（参照实现），输出 (行号, 该行旧号最高编号相似度)"""
+    instrument.count("pairs_scored", len(index.old_codes))
+    for i, olds in enumerate(index.olds):
+        yield i, max(fuzz.ratio(comp_code, old) for old in olds)
+
+
+def _review_blocked(comp_code: str, index: AnnouncementIndex):
+    """只扫描候选索引放行的公告行，按原行序输出"""
+    cand = index.blocker.candidates(comp_code)
+    instrument.count("pairs_scored", len(cand))
+    instrument.count("candidates_pruned", len(index.old_codes) - len(cand))
+    for i in dict.fromkeys(index.old_rows[cand].tolist()):   # old_rows 单调，去重后仍有序
+        yield i, max(fuzz.ratio(comp_code, old) for old in index.olds[i])
+
+
+def as_index(gb: pd.DataFrame | AnnouncementIndex | StandardCatalog) -> AnnouncementIndex:
+    """比对用的公告索引：DataFrame 现场构建，本地目录读取（按目录版本缓存）"""
+    if isinstance(gb, AnnouncementIndex):
+        return gb
+    if isinstance(gb, StandardCatalog):
+        return gb.index()
+    return AnnouncementIndex.from_frame(gb)
+
 
 # ------------------------------------------------------------------
-# 编号规范化
+# 主对照函数
 # ------------------------------------------------------------------
-def normalize_code(code: str) -> str:
+def compare(company_df: pd.DataFrame,
+            gb: pd.DataFrame | AnnouncementIndex | StandardCatalog,
+            engine: str = "blocked", workers: int = 1, top_k: int = 0) -> List[MatchResult]:
+    """
+    gb: load_gb() 返回的 DataFrame，或预先构建的 AnnouncementIndex
+        （同一公告对多份公司清单比对时只需构建一次），或本地标准目录 StandardCatalog
+    engine:
+      * "blocked" – 二元组倒排索引生成候选后再打分（默认）
+      * "cdist"   – rapidfuzz.process.cdist 多核矩阵打分，仅对幸存行算名称分
+      * "brute"   – 逐行暴力扫描，作为对照基准
+    workers: 进程数；> 1 时公司清单分片到进程池并行比对，结果保持原顺序
+    top_k:   > 0 时 REVIEW 结果附带综合分最高的 K 个候选（MatchResult.candidates），
+             以容量为 K 的堆筛选，每行内存 O(K)；0 表示只保留最佳一行
+    days_to_replace 不在此逐行计算，由 compare_table / lifecycle.annotate 整列填写
+    """
+    return list(iter_compare(company_df, gb, engine, workers, top_k))
+
+
+def compare_table(company_df: pd.DataFrame,
+                  gb: pd.DataFrame | AnnouncementIndex | StandardCatalog,
+                  engine: str = "blocked", workers: int = 1, top_k: int = 0,
+                  as_of: date | None = None) -> ResultTable:
     """
-    全角→半角 + 统一破折号 → 去首尾空格
+    compare 的列式版本：结果直接拆入 ResultTable，不保留逐行 MatchResult；
+    并整列计算 OBSOLETE / REVIEW 行距新标准实施的天数（lifecycle.annotate，基准日 as_of 缺省为今天）
     """
-    if code is None:
-        return ""
-    code = unicodedata.normalize("NFKC", str(code))
-    code = re.sub(r"[-–]", "—", code)  # 半角或短破折号 → 长破折号
-    return code.strip()
+    index = as_index(gb)
+    table = ResultTable.from_results(iter_compare(company_df, index, engine, workers, top_k))
+    return lifecycle.annotate(table, index, as_of)
+
+
+def iter_compare(company_df: pd.DataFrame,
+                 gb: pd.DataFrame | AnnouncementIndex | StandardCatalog,
+                 engine: str = "blocked", workers: int = 1,
+                 top_k: int = 0) -> Iterator[MatchResult]:
+    """
+    compare 的生成器版本：公司清单按块处理、逐条产出结果，
+    配合 reporter.render 流式写出时内存不随行数增长
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"未知比对引擎：{engine}，可选 {ENGINES}")
+    if top_k < 0:
+        raise ValueError(f"top_k 不能为负数：{top_k}")
+
+    # 1) 公告索引（旧→新映射 + 展开后的旧号）；未经 load_company 的清单补齐派生列
+    index = as_index(gb)
+    company_df = derive_columns(company_df)
+    size = COMPANY_CHUNK
+    if workers > 1:
+        # 每个进程约分到 4 片，兼顾负载均衡与任务开销
+        size = max(1, min(COMPANY_CHUNK, -(-len(company_df) // (workers * 4))))
+    shards = [company_df.iloc[start:start + size]
+              for start in range(0, len(company_df), size)]
+
+    if workers > 1 and len(shards) > 1:
+        yield from _compare_parallel(shards, index, engine, workers, top_k)
+        return
+    for shard in shards:
+        yield from _compare_chunk(shard, index, engine, top_k=top_k)
 
 
 # ------------------------------------------------------------------
-# 主对照函数
+# 多进程分片
+# 公告索引每个工作进程只传递一次：fork 平台经写时复制继承父进程的全局变量，
+# 其余平台（spawn）在进程初始化时反序列化一次；任务只携带公司分片
 # ------------------------------------------------------------------
-def compare(company_df: pd.DataFrame, gb_df: pd.DataFrame) -> List[MatchResult]:
-    results: List[MatchResult] = []
-
-    # 1) 构建旧→新映射（精确替代）
-    replaced_map: dict[str, str] = {}
-    for _, row in gb_df.iterrows():
-        rep = row.get("replaced")
-        if pd.isna(rep):
-            continue
-        for old in re.split(r"[;；,，]", str(rep)):
-            old_n = normalize_code(old)
-            if old_n:
-                replaced_map[old_n] = normalize_code(row["code"])
-
-    # 2) 遍历公司标准
-    for _, c in company_df.iterrows():
-        comp_code = normalize_code(c["code"])
-        comp_name = str(c["name"])
-        cs = CompanyStandard(
-            code=comp_code,
-            name=comp_name,
-            impl_date=None,
-            dept=str(c.get("dept", "")),        # ← 新增
-        )
+_WORKER_INDEX: AnnouncementIndex | None = None
+_FORK_LOCK = threading.Lock()
+
+
+def _init_worker(index: AnnouncementIndex | None = None) -> None:
+    global _WORKER_INDEX
+    if index is not None:
+        _WORKER_INDEX = index
+
+
+def _compare_shard(company_df: pd.DataFrame, engine: str, top_k: int) -> List[MatchResult]:
+    # 进程间已按核分片，cdist 不再开多线程，避免超额订阅
+    return list(_compare_chunk(company_df, _WORKER_INDEX, engine,
+                               cdist_workers=1, top_k=top_k))
+
+
+def _compare_parallel(shards: List[pd.DataFrame], index: AnnouncementIndex,
+                      engine: str, workers: int, top_k: int) -> Iterator[MatchResult]:
+    global _WORKER_INDEX
+    if engine == "blocked":
+        index.blocker                  # 在父进程构建，子进程共享
+
+    tasks = (_compare_shard, shards, repeat(engine), repeat(top_k))
+    if "fork" in mp.get_all_start_methods():
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("fork"),
+                                   initializer=_init_worker)
+        # map 一次提交全部分片，工作进程随之 fork；提交完即可清除全局引用。
+        # 加锁使多线程（如服务模式）并发比对时各自的索引不会互相覆盖
+        with _FORK_LOCK:
+            _WORKER_INDEX = index
+            try:
+                shard_iter = pool.map(*tasks)
+            finally:
+                _WORKER_INDEX = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers,
+                                   initializer=_init_worker, initargs=(index,))
+        shard_iter = pool.map(*tasks)
+    with pool:
+        for shard_results in shard_iter:
+            yield from shard_results
 
+
+def _compare_chunk(company_df: pd.DataFrame, index: AnnouncementIndex,
+                   engine: str, cdist_workers: int = -1,
+                   top_k: int = 0) -> Iterator[MatchResult]:
+    chains = index.chains
+    instrument.count("rows_compared", len(company_df))
+
+    # 2) 公司标准预处理；未精确命中的行才进入 REVIEW 打分
+    n = len(company_df)
+    codes = to_pylist(company_df["code_norm"])
+    names = [str(v) for v in company_df["name"]]
+    depts = ([str(v) for v in company_df["dept"]] if "dept" in company_df.columns
+             else [""] * n)
+    dates = to_dates(company_df["impl_date"]) if "impl_date" in company_df.columns else [None] * n
+    companies = [
+        (comp_code, comp_name,
+         CompanyStandard(code=comp_code, name=comp_name, impl_date=impl_date, dept=dept))
+        for comp_code, comp_name, dept, impl_date in zip(codes, names, depts, dates)
+    ]
+
+    pending = [code for code, _, _ in companies if code not in chains]
+    if engine == "cdist":
+        scored_iter = batch_code_scores(pending, index.old_codes, index.old_rows,
+                                        workers=cdist_workers)
+    elif engine == "blocked":
+        scored_iter = (_review_blocked(code, index) for code in pending)
+    else:
+        scored_iter = (_review_brute(code, index) for code in pending)
+
+    # 3) 遍历公司标准
+    for comp_code, comp_name, cs in companies:
         # ------- OBSOLETE -------------------------------------------------
-        if comp_code in replaced_map:
-            results.append(
-                MatchResult(cs, comp_code, replaced_map[comp_code],
-                            "OBSOLETE", 100, "精确命中旧号")
-            )
+        if comp_code in chains:
+            yield MatchResult(cs, comp_code, chains.successor[comp_code],
+                              "OBSOLETE", 100, chains.reason(comp_code))
             continue
 
         # ------- REVIEW 判定 ----------------------------------------------
+        scored = next(scored_iter)
+
         review_hit = None
         best_combo_score = 0  # 同时记录“编号+名称”的综合分
+        best_scores = (0, 0)
+        heap = []    # top-K：(综合分, -行号, 编号分, 名称分) 小顶堆，堆顶为当前第 K 名
 
-        for _, row in gb_df.iterrows():
-            rep = row.get("replaced")
-            if pd.isna(rep):
-                continue  # 无旧号 → 不参与 REVIEW
-
-            # 遍历公告旧号，找与公司编号最相似的一条
-            code_score_max = 0
-            for old in re.split(r"[;；,，]", str(rep)):
-                old_norm = normalize_code(old)
-                code_score = fuzz.ratio(comp_code, old_norm)
-                code_score_max = max(code_score_max, code_score)
-
+        for i, code_score_max in scored:
             if not (85 <= code_score_max < 100):      # 编号相似度未达 85~99
                 continue
 
             # 计算名称相似度
-            name_score = fuzz.token_set_ratio(comp_name, row["name"])
+            name_score = fuzz.token_set_ratio(comp_name, index.names[i])
             if name_score < 85:                       # 名称相似度不足
                 continue
 
-            # 记录最佳组合（可选）
+            # 记录最佳组合（同分时保留公告中靠前的一行）
             combo_score = (code_score_max + name_score) / 2
+            if top_k:
+                item = (combo_score, -i, code_score_max, name_score)   # 同分时靠前的行优先
+                if len(heap) < top_k:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
             if combo_score > best_combo_score:
                 best_combo_score = combo_score
-                review_hit = normalize_code(row["code"])
+                best_scores = (code_score_max, name_score)
+                review_hit = index.codes[i]
 
         # ---------------- 结果输出 ----------------
         if review_hit:
-            results.append(
-                MatchResult(
-                    cs, None, review_hit, "REVIEW",
-                    int(best_combo_score),
-                    f"编号{code_score_max}%, 名称{name_score}%"  # 备注
-                )
+            yield MatchResult(
+                cs, None, review_hit, "REVIEW",
+                int(best_combo_score),
+                f"编号{best_scores[0]}%, 名称{best_scores[1]}%",  # 备注
+                candidates=[
+                    ReviewCandidate(index.codes[-neg_i], index.names[-neg_i],
+                                    code_score, name_score, combo)
+                    for combo, neg_i, code_score, name_score in sorted(heap, reverse=True)
+                ] if top_k else None,
             )
         else:
-            results.append(
-                MatchResult(cs, None, None, "OK",
-                            fuzz.token_set_ratio(comp_name, comp_name))
-            )
-    return results
+            yield MatchResult(cs, None, None, "OK",
+                              fuzz.token_set_ratio(comp_name, comp_name))
@@ -2,12 +2,28 @@
 """
 excel_io.py
 Excel 读写与数据清洗（支持装饰行、动态表头）
+CSV / Parquet / Arrow 文件按扩展名识别，经 pyarrow 读取后使用相同的列映射与清洗
 """
 from __future__ import annotations
 
-import pandas as pd
+import csv
+import glob
 import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Callable
+from xml.etree import ElementTree
+
+import numpy as np
+import openpyxl
+import pandas as pd
+from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+from pandas.io.parsers import TextParser
+
+from . import clean, instrument
+from .cache import ParseCache
+from .index import AnnouncementIndex
 
 # -----------------------------------------------------------
 # 列名映射
@@ -35,37 +51,177 @@ COL_MAP_GB = {
 # 装饰行匹配
 DECORATION_PATTERN = re.compile(r"部门在用标准清单")
 
-# 标准编号有效性
+# 标准编号有效性（对规范化后的编号判断，全角编号同样有效）
 VALID_CODE_PATTERN = re.compile(r"[A-Za-z0-9]")
 
+# 流式读取时每隔多少行回调一次进度
+PROGRESS_EVERY = 1000
+
+# 列式文件扩展名（其余按 Excel 读取）
+TABLE_SUFFIXES = (".csv", ".parquet", ".arrow", ".feather")
+# 目录输入时收集的文件
+INPUT_SUFFIXES = (".xlsx",) + TABLE_SUFFIXES
+
+
+# ----------------------------------------------------------------------
+# 列式文件：CSV（pyarrow 多线程解析）/ Parquet / Arrow
+# ----------------------------------------------------------------------
+def is_table_file(path: Path | str) -> bool:
+    return Path(path).suffix.lower() in TABLE_SUFFIXES
+
+
+def _csv_encoding(path: Path) -> str:
+    """UTF-8（可带 BOM）优先，表头无法按 UTF-8 解码时视为 GB18030（兼容 GBK 导出）"""
+    with open(path, "rb") as f:
+        head = f.read(1 << 16)
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError as err:
+        if err.start < len(head) - 3:           # 非截断在多字节字符中间
+            return "gb18030"
+    return "utf-8"
+
+
+def read_table(path: Path | str) -> pd.DataFrame:
+    """
+    读取 CSV / Parquet / Arrow 文件为 DataFrame，各列统一为字符串、空值为缺失，
+    与 read_excel(dtype=str) 的结果形态一致
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        from pyarrow import csv as pa_csv
+
+        encoding = _csv_encoding(path)
+        with open(path, encoding="utf-8-sig" if encoding == "utf-8" else encoding) as f:
+            names = next(csv.reader(f), [])
+        table = pa_csv.read_csv(
+            path,
+            read_options=pa_csv.ReadOptions(use_threads=True, encoding=encoding),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={n: pa.string() for n in names},
+                strings_can_be_null=True,
+            ),
+        )
+    elif suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(path)
+    elif suffix in (".arrow", ".feather"):
+        from pyarrow import feather
+
+        table = feather.read_table(path)
+    else:
+        raise ValueError(f"不支持的文件类型：{path.name}")
+
+    columns = [col if pa.types.is_string(col.type) or pa.types.is_large_string(col.type)
+               else pc.cast(col, pa.string()) for col in table.columns]
+    table = pa.table(columns, names=[str(n) for n in table.column_names])
+    return table.to_pandas()
+
 
 # ----------------------------------------------------------------------
 # 读取公司清单
 # ----------------------------------------------------------------------
-def _find_header_row(path: Path | str, sheet_name=0, max_scan=20) -> int:
+def _convert_cell(cell):
+    """单元格取值，规则与 pandas 的 openpyxl 读取器一致"""
+    if cell.value is None:
+        return ""
+    if cell.data_type == TYPE_ERROR:
+        return np.nan
+    if cell.data_type == TYPE_NUMERIC:
+        val = int(cell.value)
+        return val if val == cell.value else float(cell.value)
+    return cell.value
+
+
+def _iter_sheet_rows(path: Path | str, sheet_name=0):
+    """以 openpyxl 只读模式流式逐行读取工作表（去掉行尾空单元格）"""
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[sheet_name] if isinstance(sheet_name, int) else wb[sheet_name]
+        ws.reset_dimensions()
+        for row in ws.iter_rows():
+            values = [_convert_cell(c) for c in row]
+            while values and values[-1] == "":
+                values.pop()
+            yield values
+    finally:
+        wb.close()
+
+
+def _read_company_sheet(path: Path | str, sheet_name=0, max_scan=20,
+                        progress: Callable[[int], None] | None = None) -> pd.DataFrame:
     """
-    扫描前 max_scan 行，找到包含“标准编号”的行号
+    单次遍历读取公司清单：在前 max_scan 行内边读边定位含“标准编号”的表头，
+    其后各行直接构建 DataFrame，不再二次打开文件
     """
-    tmp = pd.read_excel(path, sheet_name=sheet_name, header=None,
-                        nrows=max_scan, dtype=str)
-    for idx, row in tmp.iterrows():
-        if row.astype(str).str.contains("标准编号").any():
-            return idx
-    raise ValueError("文件前 20 行未找到“标准编号”列，请检查格式")
+    data: list[list] = []
+    header_row = None
+    last_with_data = -1
+    for n, values in enumerate(_iter_sheet_rows(path, sheet_name)):
+        if header_row is None:
+            if n >= max_scan:
+                break
+            if any("标准编号" in str(v) for v in values):
+                header_row = n
+        if values:
+            last_with_data = n
+        data.append(values)
+        if progress is not None and (n + 1) % PROGRESS_EVERY == 0:
+            progress(n + 1)
+    if header_row is None:
+        raise ValueError(f"文件前 {max_scan} 行未找到“标准编号”列，请检查格式")
+    if progress is not None:
+        progress(len(data))
+
+    # 去掉末尾空行，并把各行补齐到同一宽度（与 read_excel 相同）
+    data = data[:last_with_data + 1]
+    width = max(len(row) for row in data)
+    data = [row + [""] * (width - len(row)) for row in data]
 
+    return TextParser(data, header=header_row, dtype=str,
+                      skip_blank_lines=False).read()
 
-def load_company(path: Path | str, sheet_name=0) -> pd.DataFrame:
+
+def load_company(path: Path | str, sheet_name=0,
+                 cache: ParseCache | None = None,
+                 progress: Callable[[int], None] | None = None) -> pd.DataFrame:
     """
     读取并清洗公司标准清单
     * 自动跳过装饰首行
     * 自动定位表头
     * 重命名列 → code / name / dept / replaced / impl_date
+    * 编号为空、但有名称或部门的行（合并单元格）沿用上一行编号
+    * 向量化清洗：code_norm / replaced_list 派生列，impl_date 解析为日期（见 clean.py）
+    * 传入 cache 时，文件内容未变则直接读取缓存
+    * progress(已读行数) 在流式读取过程中周期性回调；命中缓存时以缓存行数回调一次
+    * CSV / Parquet / Arrow 文件（按扩展名）首行即表头，sheet_name 忽略
     """
     path = Path(path)
-    header_row = _find_header_row(path, sheet_name)
+    if cache is not None:
+        parsed = False
+
+        def parse() -> pd.DataFrame:
+            nonlocal parsed
+            parsed = True
+            return load_company(path, sheet_name, progress=progress)
 
-    # 第二次读取：指定 header 行
-    df = pd.read_excel(path, sheet_name=sheet_name, header=header_row, dtype=str)
+        df = cache.frame(path, "company", sheet_name, parse)
+        if progress is not None and not parsed:
+            progress(len(df))
+        return df
+
+    if is_table_file(path):
+        df = read_table(path)
+        if progress is not None:
+            progress(len(df))
+    else:
+        # 单次读取：边读边定位表头
+        df = _read_company_sheet(path, sheet_name, progress=progress)
 
     # 去除装饰行（防止 header=0 时仍留下第一行）
     df = df[~df.iloc[:, 0].astype(str).str.match(DECORATION_PATTERN, na=False)]
@@ -85,25 +241,49 @@ def load_company(path: Path | str, sheet_name=0) -> pd.DataFrame:
         if col not in df.columns:
             df[col] = None
 
-    # 过滤无效行
-    df = df[df["code"].astype(str).str.match(VALID_CODE_PATTERN, na=False)]
+    # 编号整列规范化一次
+    df["code_norm"] = clean.code_norm(df["code"])
+
+    # 合并单元格：同一标准由多个部门持有时编号单元格合并，只有首行有值；
+    # 编号为空但有名称 / 部门的行沿用上一行编号，整行空白的行仍按无效行去掉
+    has_code = (df["code_norm"] != "").to_numpy(dtype=bool)
+    has_data = ((clean.code_norm(df["name"]) != "").to_numpy(dtype=bool)
+                | (clean.code_norm(df["dept"]) != "").to_numpy(dtype=bool))
+    merged = pd.Series(has_code | has_data, index=df.index)
+    for col in ("code", "code_norm"):
+        df[col] = df[col].where(has_code).ffill().where(merged)
+    df["code_norm"] = df["code_norm"].fillna("")
+
+    # 按规范化结果过滤无效行
+    df = df[df["code_norm"].str.match(VALID_CODE_PATTERN.pattern).to_numpy(dtype=bool)]
 
     # 填充可能出现的合并单元格空值
-    # 新写法（不触发链式赋值警告）
-    df["code"] = df["code"].ffill()
     df["name"] = df["name"].ffill()
 
+    # 旧号拆分、实施日期解析
+    df = clean.derive_columns(df)
+
+    instrument.count("rows_loaded", len(df))
     return df.reset_index(drop=True)
 
 
 # ----------------------------------------------------------------------
 # 读取国家公告
 # ----------------------------------------------------------------------
-def load_gb(path: Path | str, sheet_name=0) -> pd.DataFrame:
+def load_gb(path: Path | str, sheet_name=0,
+            cache: ParseCache | None = None) -> pd.DataFrame:
     """
-    读取国家标准公告（默认第一张表），并重命名列
+    读取国家标准公告（默认第一张表），重命名列并派生 code_norm / replaced_list；
+    CSV / Parquet / Arrow 文件按扩展名识别，sheet_name 忽略
     """
-    df = pd.read_excel(path, sheet_name=sheet_name, dtype=str)
+    if cache is not None:
+        return cache.frame(path, "gb", sheet_name,
+                           lambda: load_gb(path, sheet_name))
+
+    if is_table_file(path):
+        df = read_table(path)
+    else:
+        df = pd.read_excel(path, sheet_name=sheet_name, dtype=str)
     df.rename(columns=lambda s: str(s).strip(), inplace=True)
     df.rename(columns=COL_MAP_GB, inplace=True, errors="ignore")
 
@@ -112,4 +292,122 @@ def load_gb(path: Path | str, sheet_name=0) -> pd.DataFrame:
         if col not in df.columns:
             df[col] = None
 
+    # 编号规范化、旧号拆分、实施日期解析
+    df = clean.derive_columns(df)
+
+    instrument.count("rows_loaded", len(df))
+    return df
+
+
+def load_gb_index(path: Path | str, sheet_name=0,
+                  cache: ParseCache | None = None) -> AnnouncementIndex:
+    """
+    读取国家公告并构建比对索引（含 REVIEW 候选索引）
+    * 传入 cache 时连同索引一并缓存，命中后既不解析 Excel 也不重建索引
+    """
+    def build() -> AnnouncementIndex:
+        index = AnnouncementIndex.from_frame(load_gb(path, sheet_name, cache))
+        index.blocker                  # 预先构建，随索引一起缓存
+        return index
+
+    if cache is None:
+        return build()
+    return cache.obj(path, "gb_index", sheet_name, build)
+
+
+# ----------------------------------------------------------------------
+# 批量读取：多文件 / 多工作表，进程池并行解析
+# ----------------------------------------------------------------------
+SOURCE_COLS = ("source_file", "source_sheet")
+
+_XLSX_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+
+def sheet_names(path: Path | str) -> list[str]:
+    """直接读取 xl/workbook.xml 获取工作表名称，无需解析整个工作簿"""
+    with zipfile.ZipFile(path) as zf:
+        root = ElementTree.fromstring(zf.read("xl/workbook.xml"))
+    return [s.get("name") for s in root.iter(f"{_XLSX_NS}sheet")]
+
+
+def expand_sources(sources) -> list[Path]:
+    """
+    展开输入源：单个路径 / 目录（其中全部 .xlsx / .csv / .parquet / .arrow）/ 通配符，
+    可混合传入列表
+    * 跳过 Excel 锁文件（~$ 开头），去重并保持顺序
+    """
+    if isinstance(sources, (str, Path)):
+        sources = [sources]
+    paths: list[Path] = []
+    for src in sources:
+        src = str(src)
+        if Path(src).is_dir():
+            found = sorted(p for p in Path(src).iterdir()
+                           if p.suffix.lower() in INPUT_SUFFIXES)
+        elif glob.has_magic(src):
+            found = sorted(Path(p) for p in glob.glob(src, recursive=True))
+        else:
+            found = [Path(src)]
+        paths.extend(p for p in found if not p.name.startswith("~$"))
+    if not paths:
+        raise FileNotFoundError(f"未找到匹配的输入文件：{sources}")
+    return list(dict.fromkeys(paths))
+
+
+def _load_tagged(kind: str, path: Path, sheet: str,
+                 cache: ParseCache | None) -> pd.DataFrame:
+    """进程池任务：读取单个工作表并标注来源"""
+    loader = load_company if kind == "company" else load_gb
+    try:
+        df = loader(path, sheet, cache=cache)
+    except Exception as err:
+        raise ValueError(f"{path.name} [{sheet}]：{err}") from err
+    df["source_file"] = str(path)
+    df["source_sheet"] = sheet
     return df
+
+
+def _load_batch(kind: str, sources, sheet_name, workers: int | None,
+                cache: ParseCache | None) -> pd.DataFrame:
+    tasks = []
+    for path in expand_sources(sources):
+        if is_table_file(path):                 # 列式文件没有工作表
+            tasks.append((kind, path, "", cache))
+            continue
+        names = sheet_names(path)
+        if sheet_name is None:
+            sheets = names
+        elif isinstance(sheet_name, int):
+            sheets = [names[sheet_name]]
+        elif isinstance(sheet_name, str):
+            sheets = [sheet_name]
+        else:
+            sheets = [names[s] if isinstance(s, int) else s for s in sheet_name]
+        tasks.extend((kind, path, sheet, cache) for sheet in sheets)
+
+    if len(tasks) == 1 or workers == 1:
+        frames = [_load_tagged(*t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            frames = list(pool.map(_load_tagged, *zip(*tasks)))
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_company_batch(sources, sheet_name=0, workers: int | None = None,
+                       cache: ParseCache | None = None) -> pd.DataFrame:
+    """
+    批量读取公司清单（如每个部门一张表）
+    * sources：路径 / 目录 / 通配符，或其列表
+    * sheet_name：工作表序号、名称或列表；None 表示全部工作表
+    * 各表在进程池中并行解析，结果附加 source_file / source_sheet 后按输入顺序拼接
+    """
+    return _load_batch("company", sources, sheet_name, workers, cache)
+
+
+def load_gb_batch(sources, sheet_name=0, workers: int | None = None,
+                  cache: ParseCache | None = None) -> pd.DataFrame:
+    """
+    批量读取国家公告（如多期季度公告），参数同 load_company_batch；
+    拼接顺序即文件顺序，同一旧号以后出现的公告为准
+    """
+    return _load_batch("gb", sources, sheet_name, workers, cache)
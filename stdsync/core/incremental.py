@@ -0,0 +1,168 @@
+"""
+incremental.py – 增量比对
+---------------------------------------------------------------
+保存上一次运行的输入指纹（公司行 / 公告行哈希）与比对结果，
+下一次运行时只重新比对可能受影响的公司行：
+1. 新增或内容变化的公司行
+2. 编号出现在新增 / 删除公告行旧号中的行（OBSOLETE 可能变化）
+3. 与新增公告行旧号编号相似度 ≥ 85 的行（REVIEW 可能出现新候选）
+4. 上次命中的新号（或 top-K 候选中任一新号）属于被删除公告行的行
+5. 上次为 OBSOLETE、但按本次替代链解析的新号或替代链已变化的行
+   （如新增公告代替了上次的现行新号）
+其余行直接沿用上次结果，输出与完整运行一致。
+公告行相对顺序变化会影响“后者覆盖 / 同分取前”的判定，此时退回完整运行；
+top_k 与上次不同时同样退回完整运行。
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from datetime import date
+from pathlib import Path
+from typing import List
+
+import pandas as pd
+from rapidfuzz import fuzz
+
+from .blocking import CODE_CUTOFF, CodeBlocker
+from .clean import derive_columns, to_dates, to_pylist
+from .comparer import as_index, compare
+from .index import AnnouncementIndex
+from .models import CompanyStandard, MatchResult, ReviewCandidate
+
+# 状态文件格式版本：比对规则或结果结构变化时递增，旧状态自动作废
+STATE_VERSION = 3
+
+
+@dataclass
+class IncrementalStats:
+    """增量运行统计"""
+    total: int
+    rescanned: int
+    full_run: bool
+
+
+def _digest(*parts) -> str:
+    return hashlib.sha1("\x1f".join(map(str, parts)).encode("utf-8")).hexdigest()
+
+
+def _company_keys(company_df: pd.DataFrame) -> List[str]:
+    """公司行指纹：compare 实际读取的 code / name / dept / impl_date 四列"""
+    n = len(company_df)
+    depts = company_df["dept"] if "dept" in company_df.columns else [""] * n
+    dates = to_dates(company_df["impl_date"]) if "impl_date" in company_df.columns else [None] * n
+    return [_digest(code, name, dept, impl_date)
+            for code, name, dept, impl_date in zip(company_df["code"], company_df["name"],
+                                                   depts, dates)]
+
+
+def _gb_rows(index: AnnouncementIndex) -> List[list]:
+    """公告行快照：[指纹, 新号, 旧号列表]"""
+    return [[_digest(code, name, *olds), code, olds]
+            for code, name, olds in zip(index.codes, index.names, index.olds)]
+
+
+def _result_from_dict(d: dict) -> MatchResult:
+    candidates = d.pop("candidates", None)
+    if candidates is not None:
+        candidates = [ReviewCandidate(**c) for c in candidates]
+    company = d.pop("company")
+    if company.get("impl_date"):
+        company["impl_date"] = date.fromisoformat(company["impl_date"])
+    return MatchResult(company=CompanyStandard(**company), candidates=candidates, **d)
+
+
+def _load_state(state_path: Path) -> dict | None:
+    if not state_path.exists():
+        return None
+    try:
+        state = json.loads(state_path.read_text("utf-8"))
+    except (OSError, ValueError):
+        return None
+    return state if state.get("version") == STATE_VERSION else None
+
+
+def _affected_codes(prev_gb: List[list], new_gb: List[list]):
+    """
+    对比公告快照，返回 (是否需完整运行, 变动行涉及的旧号, 删除行的新号, 新增行)
+    """
+    prev_keys = [r[0] for r in prev_gb]
+    new_keys = [r[0] for r in new_gb]
+    prev_set, new_set = set(prev_keys), set(new_keys)
+
+    # 保留行的相对顺序必须一致
+    if [k for k in prev_keys if k in new_set] != [k for k in new_keys if k in prev_set]:
+        return True, set(), set(), []
+
+    removed = [r for r in prev_gb if r[0] not in new_set]
+    added = [r for r in new_gb if r[0] not in prev_set]
+    touched_olds = {old for r in removed + added for old in r[2] if old}
+    removed_codes = {r[1] for r in removed}
+    return False, touched_olds, removed_codes, added
+
+
+def compare_incremental(company_df: pd.DataFrame, gb: pd.DataFrame | AnnouncementIndex,
+                        state_path: Path | str, engine: str = "blocked", top_k: int = 0):
+    """
+    增量比对：返回 (结果列表, IncrementalStats)，并把本次输入与结果写回 state_path
+    """
+    state_path = Path(state_path)
+    index = as_index(gb)
+    company_df = derive_columns(company_df)
+    keys = _company_keys(company_df)
+    codes = to_pylist(company_df["code_norm"])
+    gb_rows = _gb_rows(index)
+
+    state = _load_state(state_path)
+    full_run = state is None or state.get("top_k", 0) != top_k
+    chains = index.chains
+    if not full_run:
+        full_run, touched_olds, removed_codes, added = _affected_codes(state["gb"], gb_rows)
+
+    rescan: List[int] = []
+    carried: dict[int, MatchResult] = {}
+    if full_run:
+        rescan = list(range(len(keys)))
+    else:
+        prev = state["results"]
+        added_olds = [old for r in added for old in r[2] if old]
+        blocker = CodeBlocker(added_olds)
+        for pos, key in enumerate(keys):
+            d = prev.get(key)
+            if d is None or d["gb_new_code"] in removed_codes or any(
+                c["gb_new_code"] in removed_codes for c in d.get("candidates") or []
+            ):
+                rescan.append(pos)
+                continue
+            code = codes[pos]
+            if d["status"] == "OBSOLETE" and (
+                code not in chains
+                or (d["gb_new_code"], d["reason"]) != (chains.successor[code], chains.reason(code))
+            ):
+                rescan.append(pos)
+                continue
+            if code in touched_olds or any(
+                fuzz.ratio(code, added_olds[j]) >= CODE_CUTOFF
+                for j in blocker.candidates(code).tolist()
+            ):
+                rescan.append(pos)
+                continue
+            carried[pos] = _result_from_dict(dict(d))
+
+    fresh = compare(company_df.iloc[rescan], index, engine=engine, top_k=top_k) if rescan else []
+    fresh_by_pos = dict(zip(rescan, fresh))
+    results = [fresh_by_pos[pos] if pos in fresh_by_pos else carried[pos]
+               for pos in range(len(keys))]
+
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = state_path.with_name(state_path.name + ".tmp")
+    tmp.write_text(json.dumps({
+        "version": STATE_VERSION,
+        "top_k": top_k,
+        "gb": gb_rows,
+        "results": {key: asdict(m) for key, m in zip(keys, results)},
+    }, ensure_ascii=False, default=date.isoformat), "utf-8")
+    tmp.replace(state_path)
+
+    return results, IncrementalStats(len(keys), len(rescan), full_run)
@@ -0,0 +1,81 @@
+"""
+index.py – 国家公告预编译索引
+---------------------------------------------------------------
+公告只需由 load_gb 的结果构建一次，之后可对任意多份公司清单
+重复比对：旧号的拆分、规范化、倒排索引均不再重复计算。
+"""
+from __future__ import annotations
+
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from .blocking import CodeBlocker
+from .chains import ReplacementGraph
+from .clean import DERIVED_COLS, derive_columns, to_pylist
+
+
+class AnnouncementIndex:
+    """
+    公告索引（列式存储，仅保留带“代替标准号”的行）
+    * codes / names   – 第 i 行的规范化新号、原始名称
+    * olds            – 第 i 行规范化后的旧号列表
+    * replaced_map    – 旧号 → 新号（精确替代，后出现的行覆盖先出现的行）
+    * chains          – 由 replaced_map 构建的替代图，旧号 → 现行新号（跨公告传递闭包）
+    * old_codes       – 展开后的非空旧号
+    * old_rows        – old_codes[j] 所在的行号（单调不减）
+    * impl_dates      – 第 i 行新标准的实施日期（datetime64[D]，缺失为 NaT）
+    """
+
+    def __init__(self, codes: List[str], names: list, olds: List[List[str]],
+                 impl_dates=None):
+        self.codes = codes
+        self.names = names
+        self.olds = olds
+        self.impl_dates = (np.full(len(codes), np.datetime64("NaT"), dtype="datetime64[D]")
+                           if impl_dates is None
+                           else np.asarray(impl_dates, dtype="datetime64[D]"))
+
+        self.replaced_map: dict[str, str] = {}
+        for new_code, row_olds in zip(codes, olds):
+            for old in row_olds:
+                if old:
+                    self.replaced_map[old] = new_code
+        self.chains = ReplacementGraph(self.replaced_map)
+
+        # 空旧号与任何非空编号的相似度均为 0，不参与候选生成与矩阵打分
+        flat = [(i, old) for i, row_olds in enumerate(olds) for old in row_olds if old]
+        self.old_codes: List[str] = [old for _, old in flat]
+        self.old_rows = np.fromiter((i for i, _ in flat), dtype=np.int64, count=len(flat))
+        self._blocker: CodeBlocker | None = None
+
+    @classmethod
+    def from_frame(cls, gb_df: pd.DataFrame) -> "AnnouncementIndex":
+        """由 load_gb() 返回的 DataFrame 构建，直接读取清洗阶段的 code_norm / replaced_list"""
+        if "replaced" not in gb_df.columns:
+            return cls([], [], [])
+        df = gb_df[gb_df["replaced"].notna()]     # 无旧号 → 不参与比对
+        df = derive_columns(df[["code", "name", "replaced"]
+                               + [c for c in DERIVED_COLS + ("impl_date",) if c in df.columns]])
+        return cls(
+            to_pylist(df["code_norm"]),
+            df["name"].tolist(),
+            to_pylist(df["replaced_list"]),
+            df["impl_date"].to_numpy(dtype="datetime64[D]") if "impl_date" in df.columns else None,
+        )
+
+    def new_code_dates(self) -> pd.Series:
+        """新号 → 实施日期；同一新号出现在多行时以后出现的行为准（与 replaced_map 一致）"""
+        dates = pd.Series(self.impl_dates, index=pd.Index(self.codes, dtype=object))
+        return dates[~dates.index.duplicated(keep="last")]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @property
+    def blocker(self) -> CodeBlocker:
+        """REVIEW 候选索引，首次使用时构建并缓存"""
+        if self._blocker is None:
+            self._blocker = CodeBlocker(self.old_codes)
+        return self._blocker
@@ -0,0 +1,107 @@
+"""
+instrument.py – 分阶段计时与计数
+---------------------------------------------------------------
+用法：
+    prof = Profiler()
+    with profiling(prof):
+        with stage("load"):
+            ...
+        count("rows_loaded", len(df))
+    print(prof.summary())
+
+未启用时 stage() / count() 走空实现，开销仅一次函数调用。
+当前 profiler 按线程（上下文）隔离，GUI 中并发的任务各自计时。
+多进程比对时子进程内的计数不回传，计时以父进程各阶段为准。
+"""
+from __future__ import annotations
+
+import json
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from pathlib import Path
+
+
+class Profiler:
+    """收集各阶段耗时（可重入、可累加）与计数器"""
+
+    def __init__(self):
+        self.timings: dict[str, float] = {}
+        self.calls: Counter = Counter()
+        self.counters: Counter = Counter()
+        self._order: list[str] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            if name not in self.timings:
+                self._order.append(name)
+                self.timings[name] = 0.0
+            self.timings[name] += time.perf_counter() - t0
+            self.calls[name] += 1
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] += n
+
+    def to_dict(self) -> dict:
+        return {
+            "stages": [{"stage": s, "seconds": round(self.timings[s], 6),
+                        "calls": self.calls[s]} for s in self._order],
+            "counters": dict(self.counters),
+        }
+
+    def summary(self) -> str:
+        """文本汇总表"""
+        total = sum(self.timings.values()) or 1.0
+        lines = [f"{'阶段':<16}{'耗时(s)':>8}{'占比':>7}{'次数':>4}"]   # 中文按双宽对齐
+        for s in self._order:
+            t = self.timings[s]
+            lines.append(f"{s:<18}{t:>10.3f}{t / total:>9.1%}{self.calls[s]:>6}")
+        if self.counters:
+            lines.append("")
+            lines.extend(f"{k:<24}{v:>12,}" for k, v in sorted(self.counters.items()))
+        return "\n".join(lines)
+
+    def write_json(self, path: Path | str) -> Path:
+        path = Path(path)
+        path.write_text(json.dumps(self.to_dict(), ensure_ascii=False, indent=2), "utf-8")
+        return path
+
+
+class _NullProfiler:
+    """未启用时的空实现"""
+    _ctx = nullcontext()
+
+    def stage(self, name: str):
+        return self._ctx
+
+    def count(self, name: str, n: int = 1) -> None:
+        pass
+
+
+_NULL = _NullProfiler()
+_active: ContextVar[Profiler | _NullProfiler] = ContextVar("stdsync_profiler", default=_NULL)
+
+
+def stage(name: str):
+    """计时上下文：with stage("compare"): ..."""
+    return _active.get().stage(name)
+
+
+def count(name: str, n: int = 1) -> None:
+    """累加计数器"""
+    _active.get().count(name, n)
+
+
+@contextmanager
+def profiling(profiler: Profiler | None):
+    """在 with 块内启用 profiler；传入 None 时保持关闭"""
+    token = _active.set(profiler if profiler is not None else _NULL)
+    try:
+        yield profiler
+    finally:
+        _active.reset(token)
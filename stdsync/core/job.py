@@ -0,0 +1,172 @@
+"""
+job.py – 可取消的后台比对任务
+---------------------------------------------------------------
+PipelineJob 把“读取 → 比对 → 输出”封装为一个任务对象：
+* run() 在执行器线程中运行，进度以 JobEvent 写入线程安全的 queue.Queue，
+  由界面主循环轮询（Tk 中用 after()），工作线程不直接操作任何控件
+* cancel() 为协作式取消：读取与比对过程中逐批检查，任务以 "cancelled" 事件结束
+* 比对完成即发出 "computed" 事件，界面可以开始下一次运行；
+  本任务继续写出结果文件，写出阶段不再响应取消，避免留下半个文件
+
+事件类型（JobEvent.kind）：
+  stage      – 进入新阶段（load / compare / write）
+  progress   – 当前阶段进度：done / total / 行每秒 / 预计剩余秒数
+  computed   – 比对完成，开始写出
+  done       – 全部完成，result 为 JobResult
+  error      – 异常结束，message 为错误信息
+  cancelled  – 已取消
+
+比对与写出依赖在 run() 内导入，界面启动时不加载 pandas 等重型库。
+"""
+from __future__ import annotations
+
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass
+from pathlib import Path
+
+from .instrument import Profiler, profiling, stage
+
+# 两次进度事件的最小间隔（秒），避免队列被逐行事件淹没
+PROGRESS_INTERVAL = 0.2
+
+
+class JobCancelled(Exception):
+    """任务被 cancel() 中止"""
+
+
+@dataclass
+class JobEvent:
+    """任务发往界面的进度事件"""
+    job_id: int
+    kind: str
+    stage: str = ""
+    done: int = 0
+    total: int | None = None
+    rate: float | None = None       # 行 / 秒
+    eta: float | None = None        # 预计剩余秒数
+    message: str = ""
+    result: "JobResult | None" = None
+
+
+@dataclass
+class JobResult:
+    """任务产出"""
+    out_path: Path
+    doc_path: Path
+    counts: dict[str, int]
+    profile: str                    # Profiler.summary()
+
+
+class PipelineJob:
+    """一次完整的比对任务；同一任务只运行一次"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, company_path: Path | str, gb_path: Path | str,
+                 out_dir: Path | str, events: queue.Queue | None = None, top_k: int = 0):
+        self.id = next(self._ids)
+        self.company_path = Path(company_path)
+        self.gb_path = Path(gb_path)
+        self.out_dir = Path(out_dir)
+        self.top_k = top_k
+        self.events: queue.Queue = events if events is not None else queue.Queue()
+        self.profiler = Profiler()
+        self._cancel = threading.Event()
+        self._last_emit = 0.0
+
+    # ------------------------------------------------------------------
+    # 控制
+    # ------------------------------------------------------------------
+    def submit(self, executor: Executor) -> Future:
+        """提交到执行器，返回的 Future 结果为 JobResult（取消时为 None）"""
+        return executor.submit(self.run)
+
+    def cancel(self) -> None:
+        """请求取消；任务在下一个检查点结束"""
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def _check(self) -> None:
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    # ------------------------------------------------------------------
+    # 事件
+    # ------------------------------------------------------------------
+    def _emit(self, kind: str, **fields) -> None:
+        self.events.put(JobEvent(self.id, kind, **fields))
+
+    def _progress(self, stage_name: str, done: int, total: int | None,
+                  started: float, force: bool = False) -> None:
+        """检查取消并按间隔发出进度事件"""
+        self._check()
+        now = time.perf_counter()
+        if not force and now - self._last_emit < PROGRESS_INTERVAL:
+            return
+        self._last_emit = now
+        elapsed = now - started
+        rate = done / elapsed if elapsed > 0 else None
+        eta = (total - done) / rate if rate and total is not None else None
+        self._emit("progress", stage=stage_name, done=done, total=total, rate=rate, eta=eta)
+
+    # ------------------------------------------------------------------
+    # 运行
+    # ------------------------------------------------------------------
+    def run(self) -> JobResult | None:
+        try:
+            with profiling(self.profiler):
+                result = self._run_stages()
+        except JobCancelled:
+            self._emit("cancelled", message="已取消")
+            return None
+        except Exception as e:
+            self._emit("error", message=str(e))
+            raise
+        self._emit("done", result=result,
+                   message=f"已生成差异表 {result.out_path}\n已生成 Word {result.doc_path}")
+        return result
+
+    def _run_stages(self) -> JobResult:
+        from . import comparer, excel_io, lifecycle
+        from .outputs import write_outputs
+        from .results import ResultTable
+
+        self._check()
+        self._emit("stage", stage="load", message="读取文件 …")
+        started = time.perf_counter()
+        with stage("load_company"):
+            c_df = excel_io.load_company(
+                self.company_path,
+                progress=lambda n: self._progress("load", n, None, started))
+        self._check()
+        with stage("load_gb"):
+            index = excel_io.load_gb_index(self.gb_path)
+        self._progress("load", len(c_df), len(c_df), started, force=True)
+
+        self._emit("stage", stage="compare", message="正在比对 …")
+        total = len(c_df)
+        started = time.perf_counter()
+
+        def tracked():
+            for done, m in enumerate(comparer.iter_compare(c_df, index, top_k=self.top_k),
+                                     start=1):
+                yield m
+                self._progress("compare", done, total, started)
+
+        with stage("compare"):
+            res = lifecycle.annotate(ResultTable.from_results(tracked()), index)
+        self._progress("compare", total, total, started, force=True)
+        self._emit("computed", message=f"比对完成，共 {total} 行")
+
+        # 写出阶段：各输出并行写出，不再检查取消
+        self._emit("stage", stage="write", message="写出结果 …")
+        paths = write_outputs(res, self.out_dir, ("xlsx", "docx"))
+
+        return JobResult(paths["xlsx"], paths["docx"], res.counts(), self.profiler.summary())
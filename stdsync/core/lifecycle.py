@@ -0,0 +1,52 @@
+"""
+lifecycle.py – 替换期限（整列计算）
+---------------------------------------------------------------
+公告与公司清单的实施日期在清洗阶段（clean.py）已解析为日期，索引中按行保存为
+datetime64[D]。本模块在 ResultTable 上整列计算：
+  annotate()    – OBSOLETE / REVIEW 行的 days_to_replace = 新标准实施日期 − 基准日（天），
+                  已实施为负数，新号无实施日期或其余状态为空
+  due_within()  – 只保留 N 天内到期（含已实施）的行，按到期先后排序
+  sort_by_due() – 按 days_to_replace 升序排列，无期限的行排在最后（同值保持原顺序）
+全程为 NumPy / pandas 向量运算，不逐行解析日期。
+"""
+from __future__ import annotations
+
+from datetime import date
+
+import numpy as np
+
+from .index import AnnouncementIndex
+from .results import ResultTable
+
+# 参与期限计算的状态
+DUE_STATUSES = ("OBSOLETE", "REVIEW")
+
+
+def annotate(results: ResultTable, index: AnnouncementIndex,
+             as_of: date | None = None) -> ResultTable:
+    """按命中的新号查公告实施日期，返回填好 days_to_replace 列的新结果表（各列共享）"""
+    as_of = np.datetime64(as_of or date.today(), "D")
+    by_code = index.new_code_dates()
+
+    days = np.full(len(results), np.nan)
+    pos = by_code.index.get_indexer(results.columns["gb_new_code"])
+    rows = np.flatnonzero((pos >= 0) & results.mask(*DUE_STATUSES))
+    impl = by_code.to_numpy(dtype="datetime64[D]")[pos[rows]]
+    known = ~np.isnat(impl)
+    days[rows[known]] = (impl[known] - as_of).astype(np.float64)
+    return ResultTable({**results.columns, "days_to_replace": days})
+
+
+def sort_by_due(results: ResultTable) -> ResultTable:
+    """按剩余天数升序（NaN 在后，稳定排序）"""
+    return results.take(np.argsort(results.columns["days_to_replace"], kind="stable"))
+
+
+def due_within(results: ResultTable, days: int) -> ResultTable:
+    """N 天内到期（days_to_replace ≤ N，含已实施的负数）的 OBSOLETE / REVIEW 行，按期限排序"""
+    if days < 0:
+        raise ValueError(f"天数不能为负数：{days}")
+    left = results.columns["days_to_replace"]
+    with np.errstate(invalid="ignore"):
+        mask = (left <= days) & results.mask(*DUE_STATUSES)
+    return sort_by_due(results.take(mask))
@@ -28,6 +28,16 @@ class AnnouncementItem(Standard):
     replaced_codes: List[str]
 
 
+@dataclass
+class ReviewCandidate:
+    """待复核候选：公告中的一行及其编号 / 名称相似度"""
+    gb_new_code: str
+    gb_name: str
+    code_score: float
+    name_score: float
+    score: float                # (编号 + 名称) / 2
+
+
 @dataclass
 class MatchResult:
     """比对结果，用于报表输出"""
@@ -37,4 +47,5 @@ class MatchResult:
     status: str                 # OBSOLETE / REVIEW / OK / UNUSED
     similarity: int | None = None
     reason: str | None = None
-    days_to_replace: int | None = None
\ No newline at end of file
+    days_to_replace: int | None = None
+    candidates: List[ReviewCandidate] | None = None   # top-K 模式下的候选，按综合分降序
\ No newline at end of file
@@ -0,0 +1,180 @@
+"""
+outputs.py – 并行输出阶段
+---------------------------------------------------------------
+比对结果（只读的 ResultTable）一次交给进程池，各类输出互不依赖、并行写出：
+  xlsx     – 差异表（reporter.render）
+  docx     – Word 失效清单（word_exporter.render_word）
+  trace    – 国家公告追加“匹配状态”列（reporter.append_trace）
+  csv      – 差异表 CSV（reporter.render_csv）
+  parquet  – 原始结果列 Parquet（reporter.render_parquet）
+  arrow    – 原始结果列 Arrow IPC（reporter.render_arrow）
+每个文件先写入同目录临时文件，完成后 os.replace 原子改名，
+不会留下写了一半的目标文件；输出阶段总耗时接近最慢的单个写出端。
+
+结果表与 comparer 的公告索引一样只向每个工作进程传递一次：
+fork 平台经写时复制继承，其余平台在进程初始化时反序列化。
+GUI 中多个任务可能同时写出，fork 前后对全局变量的设置由锁保护。
+
+reporter / word_exporter 在写出时才导入：CLI 启动与只要 xlsx 的运行
+不会加载 python-docx，spawn 平台的工作进程也只导入自己负责的写出端。
+"""
+from __future__ import annotations
+
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable
+
+from .instrument import stage
+
+if TYPE_CHECKING:
+    from .results import ResultTable
+
+OUTPUTS = ("xlsx", "docx", "trace", "csv", "parquet", "arrow")
+DEFAULT_OUTPUTS = ("xlsx", "docx")
+
+
+def _write_xlsx(res, path, gb_path):
+    from .reporter import render
+    render(res, path)
+
+
+def _write_docx(res, path, gb_path):
+    from .word_exporter import render_word
+    render_word(res, path)
+
+
+def _write_trace(res, path, gb_path):
+    from .reporter import append_trace
+    append_trace(gb_path, res, path)
+
+
+def _write_csv(res, path, gb_path):
+    from .reporter import render_csv
+    render_csv(res, path)
+
+
+def _write_parquet(res, path, gb_path):
+    from .reporter import render_parquet
+    render_parquet(res, path)
+
+
+def _write_arrow(res, path, gb_path):
+    from .reporter import render_arrow
+    render_arrow(res, path)
+
+
+# 输出类型 → 写出函数 (results, 目标路径, 国家公告路径)
+WRITERS = {
+    "xlsx": _write_xlsx,
+    "docx": _write_docx,
+    "trace": _write_trace,
+    "csv": _write_csv,
+    "parquet": _write_parquet,
+    "arrow": _write_arrow,
+}
+
+
+def output_paths(outputs: Iterable[str], out_dir: Path | str,
+                 gb_path: Path | str | None = None, stamp: str | None = None) -> dict[str, Path]:
+    """各输出的目标路径；trace 缺省写在国家公告同目录（与 append_trace 一致）"""
+    out_dir = Path(out_dir)
+    stamp = stamp or f"{datetime.now():%Y%m%d_%H%M%S}"
+    names = {
+        "xlsx": f"差异_{stamp}.xlsx",
+        "docx": f"差异详情_{stamp}.docx",
+        "csv": f"差异_{stamp}.csv",
+        "parquet": f"差异_{stamp}.parquet",
+        "arrow": f"差异_{stamp}.arrow",
+    }
+    paths = {}
+    for kind in outputs:
+        if kind not in OUTPUTS:
+            raise ValueError(f"未知输出类型：{kind}，可选 {OUTPUTS}")
+        if kind == "trace":
+            if gb_path is None or not Path(gb_path).is_file():
+                raise ValueError("trace 输出需要单个国家公告文件")
+            gb_path = Path(gb_path)
+            paths[kind] = gb_path.with_stem(gb_path.stem + "_trace")
+        else:
+            paths[kind] = out_dir / names[kind]
+    return paths
+
+
+def _write_atomic(results: ResultTable, kind: str, target: Path,
+                  gb_path: Path | None) -> Path:
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    try:
+        WRITERS[kind](results, tmp, gb_path)
+        os.replace(tmp, target)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return target
+
+
+# ------------------------------------------------------------------
+# 多进程写出
+# ------------------------------------------------------------------
+_WORKER_RESULTS: ResultTable | None = None
+_FORK_LOCK = threading.Lock()
+
+
+def _init_worker(results: ResultTable | None = None) -> None:
+    global _WORKER_RESULTS
+    if results is not None:
+        _WORKER_RESULTS = results
+
+
+def _write_task(kind: str, target: Path, gb_path: Path | None) -> Path:
+    return _write_atomic(_WORKER_RESULTS, kind, target, gb_path)
+
+
+def write_outputs(results: ResultTable, out_dir: Path | str,
+                  outputs: Iterable[str] = DEFAULT_OUTPUTS,
+                  gb_path: Path | str | None = None, stamp: str | None = None,
+                  workers: int | None = None) -> dict[str, Path]:
+    """
+    并行写出 outputs 中的各类文件，返回 {输出类型: 路径}（顺序同 outputs）
+    workers: 进程数，缺省为 min(输出个数, CPU 核数)；为 1 时在当前进程内顺序写出
+    """
+    global _WORKER_RESULTS
+    from .results import ResultTable
+
+    if not isinstance(results, ResultTable):
+        results = ResultTable.from_results(results)
+    paths = output_paths(dict.fromkeys(outputs), out_dir, gb_path, stamp)
+    gb_path = Path(gb_path) if gb_path is not None else None
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    if workers <= 1:
+        for kind, target in paths.items():
+            with stage(f"render_{kind}"):
+                _write_atomic(results, kind, target, gb_path)
+        return paths
+
+    import multiprocessing as mp
+    from concurrent.futures import ProcessPoolExecutor
+
+    with stage("render_outputs"):
+        if "fork" in mp.get_all_start_methods():
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("fork"),
+                                       initializer=_init_worker)
+            with _FORK_LOCK:
+                # 工作进程在 submit 时 fork，提交完即可清除全局引用
+                _WORKER_RESULTS = results
+                try:
+                    futures = [pool.submit(_write_task, kind, target, gb_path)
+                               for kind, target in paths.items()]
+                finally:
+                    _WORKER_RESULTS = None
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers,
+                                       initializer=_init_worker, initargs=(results,))
+            futures = [pool.submit(_write_task, kind, target, gb_path)
+                       for kind, target in paths.items()]
+        with pool:
+            for f in futures:
+                f.result()
+    return paths
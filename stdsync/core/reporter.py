@@ -5,18 +5,22 @@ reporter.py – 生成差异报表（中文状态显示）
 关键改动：
 1. 英文状态 → 中文：已失效 / 待复核 / OK / 未使用
 2. 条件格式匹配中文标签
-3. append_trace() 同步写中文
+3. append_trace() 同步写中文（流式读写，按表头定位编号列；CSV / Parquet / Arrow 公告写回原格式）
+4. top-K 模式下追加“待复核候选”工作表
+5. render_csv() / render_parquet() / render_arrow() 输出同一结果的 CSV / Parquet / Arrow
 """
 from __future__ import annotations
 
+import csv
 from pathlib import Path
 from datetime import datetime
-from typing import List
+from typing import Iterable
 
 import xlsxwriter
-import openpyxl
 
+from .codes import normalize_code
 from .models import MatchResult
+from .results import STATUSES, ResultTable
 
 # 颜色映射
 COLOR_MAP = {
@@ -45,16 +49,67 @@ HEADERS = [
     "状态",
     "相似度",
     "查找过程",
+    "距实施天数",      # 新标准实施日期 − 今天，负数为已实施
+]
+
+# 候选表列头（每个候选一行）
+CANDIDATE_HEADERS = [
+    "持有部门",
+    "公司标准编号",
+    "公司标准名称",
+    "排名",
+    "国家新标准号",
+    "国家标准名称",
+    "编号相似度",
+    "名称相似度",
+    "综合分",
 ]
 
 # ------------------------------------------------------------------
 # 差异表输出
 # ------------------------------------------------------------------
 
-def render(results: List[MatchResult], out_path: Path | str) -> Path:
+def _report_rows(results: Iterable[MatchResult] | ResultTable):
+    """
+    产出 (按 HEADERS 顺序的行取值, 候选列表或 None)；
+    ResultTable 直接按列读取，不构造 MatchResult
+    """
+    if isinstance(results, ResultTable):
+        status_cn = [STATUS_DISPLAY.get(s, s) for s in STATUSES]
+        for dept, code, name, old, new, impl, st, sim, reason, days, cands in results.iter_rows(
+            ("dept", "code", "name", "gb_old_code", "gb_new_code", "impl_date",
+             "status", "similarity", "reason", "days_to_replace", "candidates")
+        ):
+            yield [dept, code, name, old, new, "" if impl is None else str(impl),
+                   status_cn[st], None if sim != sim else sim, reason,
+                   None if days != days else int(days)], cands
+        return
+
+    for m in results:
+        yield [
+            m.company.dept,          # new
+            m.company.code,
+            m.company.name,
+            m.gb_old_code,
+            m.gb_new_code,
+            "" if m.company.impl_date is None else str(m.company.impl_date),
+            STATUS_DISPLAY.get(m.status, m.status),
+            m.similarity,
+            m.reason,
+            m.days_to_replace,
+        ], m.candidates
+
+
+def render(results: Iterable[MatchResult], out_path: Path | str) -> Path:
+    """
+    results 可为列表或生成器（如 comparer.iter_compare）；
+    以 constant_memory 模式逐行落盘，峰值内存不随行数增长。
+    结果带 top-K 候选（comparer.compare(..., top_k=K)）时，
+    另建“待复核候选”工作表，每个候选一行
+    """
     out_path = Path(out_path)
 
-    wb = xlsxwriter.Workbook(out_path)
+    wb = xlsxwriter.Workbook(out_path, {"constant_memory": True})
     ws = wb.add_worksheet("差异表")
     hdr_fmt = wb.add_format({"bold": True, "bg_color": "#B7DEE8"})
 
@@ -62,27 +117,26 @@ def render(results: List[MatchResult], out_path: Path | str) -> Path:
     for col, h in enumerate(HEADERS):
         ws.write(0, col, h, hdr_fmt)
 
-    # 写数据行
-    for r, m in enumerate(results, start=1):
-        status_cn = STATUS_DISPLAY.get(m.status, m.status)
-        ws.write_row(
-            r,
-            0,
-            [
-                m.company.dept,          # new
-                m.company.code,
-                m.company.name,
-                m.gb_old_code,
-                m.gb_new_code,
-                "" if m.company.impl_date is None else str(m.company.impl_date),
-                status_cn,
-                m.similarity,
-                m.reason,
-            ],
-        )
+    # 写数据行（constant_memory 模式要求按行号递增顺序写入）
+    max_row = 0
+    cand_ws, cand_row = None, 0
+    for r, (row, candidates) in enumerate(_report_rows(results), start=1):
+        max_row = r
+        ws.write_row(r, 0, row)
+        if not candidates:
+            continue
+        if cand_ws is None:                 # 首次遇到候选时再建表
+            cand_ws = wb.add_worksheet("待复核候选")
+            for col, h in enumerate(CANDIDATE_HEADERS):
+                cand_ws.write(0, col, h, hdr_fmt)
+        for rank, cand in enumerate(candidates, start=1):
+            cand_row += 1
+            cand_ws.write_row(cand_row, 0, [
+                row[0], row[1], row[2], rank, cand.gb_new_code, cand.gb_name,
+                cand.code_score, cand.name_score, cand.score,
+            ])
 
-    # 条件格式着色（按中文标签）
-    max_row = len(results)
+    # 条件格式着色（按中文标签），行范围在写完数据后才确定
     for status_cn, color in COLOR_MAP.items():
         ws.conditional_format(
             1,
@@ -100,24 +154,143 @@ def render(results: List[MatchResult], out_path: Path | str) -> Path:
     wb.close()
     return out_path
 
+
+def render_csv(results: Iterable[MatchResult] | ResultTable, out_path: Path | str) -> Path:
+    """差异表的 CSV 版本（列同 HEADERS，UTF-8 带 BOM 以便 Excel 直接打开），逐行写出"""
+    out_path = Path(out_path)
+    with open(out_path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADERS)
+        writer.writerows(row for row, _ in _report_rows(results))
+    return out_path
+
+
+def render_parquet(results: Iterable[MatchResult] | ResultTable, out_path: Path | str) -> Path:
+    """原始结果列（英文列名、状态为字典编码）写出为 Parquet，便于下游分析"""
+    import pyarrow.parquet as pq
+
+    out_path = Path(out_path)
+    if not isinstance(results, ResultTable):
+        results = ResultTable.from_results(results)
+    pq.write_table(results.to_arrow(), out_path)
+    return out_path
+
+
+def render_arrow(results: Iterable[MatchResult] | ResultTable, out_path: Path | str) -> Path:
+    """同 render_parquet，写出为 Arrow IPC（Feather v2）文件"""
+    from pyarrow import feather
+
+    out_path = Path(out_path)
+    if not isinstance(results, ResultTable):
+        results = ResultTable.from_results(results)
+    feather.write_feather(results.to_arrow(), out_path)
+    return out_path
+
 # ------------------------------------------------------------------
 # 在原国家公告文件追加“匹配状态”列
 # ------------------------------------------------------------------
 
-def append_trace(gb_path: Path | str, results: List[MatchResult]) -> None:
+def _trace_status_map(results: Iterable[MatchResult] | ResultTable) -> dict:
+    """公司标准编号 → 中文状态（同一编号以后出现的结果为准）"""
+    if isinstance(results, ResultTable):
+        status_cn = [STATUS_DISPLAY.get(s, s) for s in STATUSES]
+        return dict(zip(results.columns["code"].tolist(),
+                        [status_cn[st] for st in results.status_codes.tolist()]))
+    return {m.company.code: STATUS_DISPLAY.get(m.status, m.status) for m in results}
+
+
+def _code_column(header: tuple) -> int:
+    """按表头定位国家标准编号列（COL_MAP_GB 中映射为 code 的列），找不到时取第 1 列"""
+    from .excel_io import COL_MAP_GB
+
+    for idx, title in enumerate(header):
+        if COL_MAP_GB.get(str(title).strip()) == "code":
+            return idx
+    return 0
+
+
+def append_trace(gb_path: Path | str, results: Iterable[MatchResult] | ResultTable,
+                 out_path: Path | str | None = None) -> Path:
+    """
+    复制国家公告并在活动工作表末尾追加“匹配状态”列；
+    out_path 缺省为公告同目录下的 “<原名>_trace.xlsx”
+
+    只读模式逐行读取、constant_memory 逐行写出，内存不随公告行数增长。
+    其余工作表按值原样复制（不保留原格式）。
+    CSV / Parquet / Arrow 公告按列读取、追加状态列后写回同一格式。
+    """
     gb_path = Path(gb_path)
-    wb = openpyxl.load_workbook(gb_path)
-    ws = wb.active
+    out_path = Path(out_path) if out_path else gb_path.with_stem(gb_path.stem + "_trace")
+    get_status = _trace_status_map(results).get
+
+    from .excel_io import is_table_file
+
+    if is_table_file(gb_path):
+        return _append_trace_table(gb_path, get_status, out_path)
 
-    # 新列标题
-    col_idx = ws.max_column + 1
-    ws.cell(row=1, column=col_idx).value = "匹配状态"
+    import openpyxl    # 只有 trace 需要读取 xlsx
 
-    # 公司标准编号 → 中文状态
-    status_map = {m.company.code: STATUS_DISPLAY.get(m.status, m.status) for m in results}
+    src = openpyxl.load_workbook(gb_path, read_only=True, data_only=True)
+    try:
+        active = src.active.title
+        wb = xlsxwriter.Workbook(out_path, {
+            "constant_memory": True,
+            "default_date_format": "yyyy-mm-dd",
+            # 按原值复制，不把文本解释为公式 / 链接
+            "strings_to_formulas": False,
+            "strings_to_urls": False,
+        })
+        for ws_in in src.worksheets:
+            ws_out = wb.add_worksheet(ws_in.title)
+            rows = ws_in.iter_rows(values_only=True)
+            if ws_in.title != active:
+                for r, row in enumerate(rows):
+                    ws_out.write_row(r, 0, row)
+                continue
 
-    for r in range(2, ws.max_row + 1):
-        std_code = ws.cell(row=r, column=1).value
-        ws.cell(row=r, column=col_idx).value = status_map.get(std_code, "未使用")
+            header = next(rows, ())
+            code_col = _code_column(header)
+            status_col = max(ws_in.max_column or 0, len(header))
+            ws_out.write_row(0, 0, header)
+            ws_out.write(0, status_col, "匹配状态")
 
-    wb.save(gb_path.with_stem(gb_path.stem + "_trace"))
+            for r, row in enumerate(rows, start=1):
+                ws_out.write_row(r, 0, row)
+                code = row[code_col] if code_col < len(row) else None
+                ws_out.write(r, status_col,
+                             "未使用" if code is None else get_status(normalize_code(code), "未使用"))
+        wb.close()
+    finally:
+        src.close()
+    return out_path
+
+
+def _append_trace_table(gb_path: Path, get_status, out_path: Path) -> Path:
+    """
+    列式公告的 trace：各列按字符串读取（同 read_table），末尾追加“匹配状态”列；
+    格式取公告的扩展名（out_path 可能是写出阶段的临时文件名）
+    """
+    from .excel_io import read_table
+
+    df = read_table(gb_path)
+    codes = df.iloc[:, _code_column(tuple(df.columns))].tolist() if len(df.columns) else []
+    df["匹配状态"] = ["未使用" if code is None or code != code
+                      else get_status(normalize_code(code), "未使用") for code in codes]
+
+    suffix = gb_path.suffix.lower()
+    if suffix == ".csv":
+        df.to_csv(out_path, index=False, encoding="utf-8-sig")
+        return out_path
+
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, out_path)
+    else:
+        from pyarrow import feather
+
+        feather.write_feather(table, out_path)
+    return out_path
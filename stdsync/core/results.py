@@ -0,0 +1,142 @@
+"""
+results.py – 列式比对结果容器
+---------------------------------------------------------------
+每列一个 NumPy 数组，状态以 int8 编码存储：
+* counts() / filter() 为向量化操作，不逐条遍历 MatchResult
+* to_arrow() 交给 Arrow / Parquet 等写出端，数值列与状态码零拷贝
+* 按行访问（迭代 / 下标）时才临时构造 MatchResult，兼容旧接口
+* candidates 列保存 top-K 候选列表（无则为 None），不参与 to_arrow
+"""
+from __future__ import annotations
+
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+
+from .models import CompanyStandard, MatchResult
+
+# 状态编码（顺序即 int8 取值）
+STATUSES = ("OBSOLETE", "REVIEW", "OK", "UNUSED")
+STATUS_CODE = {s: i for i, s in enumerate(STATUSES)}
+
+# 字符串 / 对象列
+OBJECT_COLS = ("dept", "code", "name", "impl_date",
+               "gb_old_code", "gb_new_code", "reason")
+# 数值列，None 以 NaN 存储
+NUMERIC_COLS = ("similarity", "days_to_replace")
+
+
+def _optional(value):
+    """NaN → None，整数值浮点 → int（还原 MatchResult 的原始取值形态）"""
+    if value != value:
+        return None
+    return int(value) if float(value).is_integer() else value
+
+
+class ResultTable:
+    """列式比对结果；支持 len / 迭代 / 下标访问，行为与 List[MatchResult] 一致"""
+
+    def __init__(self, columns: dict[str, np.ndarray]):
+        self.columns = columns
+        self.status_codes: np.ndarray = columns["status"]
+
+    # ------------------------------------------------------------------
+    # 构建
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_results(cls, results: Iterable[MatchResult]) -> "ResultTable":
+        """由 MatchResult 序列（可为生成器）构建，逐条拆入各列"""
+        buf: dict[str, list] = {c: [] for c in OBJECT_COLS + NUMERIC_COLS
+                                + ("status", "candidates")}
+        for m in results:
+            cs = m.company
+            buf["dept"].append(cs.dept)
+            buf["code"].append(cs.code)
+            buf["name"].append(cs.name)
+            buf["impl_date"].append(cs.impl_date)
+            buf["gb_old_code"].append(m.gb_old_code)
+            buf["gb_new_code"].append(m.gb_new_code)
+            buf["reason"].append(m.reason)
+            buf["similarity"].append(np.nan if m.similarity is None else m.similarity)
+            buf["days_to_replace"].append(
+                np.nan if m.days_to_replace is None else m.days_to_replace)
+            buf["status"].append(STATUS_CODE[m.status])
+            buf["candidates"].append(m.candidates)
+
+        columns = {c: np.array(buf[c], dtype=object) for c in OBJECT_COLS}
+        columns.update({c: np.array(buf[c], dtype=np.float64) for c in NUMERIC_COLS})
+        columns["status"] = np.array(buf["status"], dtype=np.int8)
+        # 逐个赋值：等长列表不能让 NumPy 展开成二维数组
+        columns["candidates"] = np.empty(len(buf["candidates"]), dtype=object)
+        columns["candidates"][:] = buf["candidates"]
+        return cls(columns)
+
+    # ------------------------------------------------------------------
+    # 向量化操作
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.status_codes)
+
+    def counts(self) -> dict[str, int]:
+        """各状态条数"""
+        tally = np.bincount(self.status_codes, minlength=len(STATUSES))
+        return {s: int(n) for s, n in zip(STATUSES, tally)}
+
+    def count(self, status: str) -> int:
+        return int(np.count_nonzero(self.status_codes == STATUS_CODE[status]))
+
+    def mask(self, *statuses: str) -> np.ndarray:
+        return np.isin(self.status_codes, [STATUS_CODE[s] for s in statuses])
+
+    def take(self, rows: np.ndarray) -> "ResultTable":
+        """按布尔掩码或行号选取子表"""
+        return ResultTable({c: arr[rows] for c, arr in self.columns.items()})
+
+    def filter(self, *statuses: str) -> "ResultTable":
+        """只保留指定状态的行，如 filter("OBSOLETE")"""
+        return self.take(self.mask(*statuses))
+
+    def iter_rows(self, names: Sequence[str]) -> Iterator[tuple]:
+        """按列名逐行产出原始取值元组，写出端可跳过 MatchResult 构造"""
+        return zip(*(self.columns[n] for n in names))
+
+    def to_arrow(self):
+        """转换为 pyarrow.Table；状态列为字典编码（int8 索引直接复用）"""
+        import pyarrow as pa
+
+        data = {c: pa.array(self.columns[c], from_pandas=True) for c in OBJECT_COLS
+                if c != "impl_date"}
+        data["impl_date"] = pa.array(self.columns["impl_date"].tolist(), type=pa.date32())
+        for c in NUMERIC_COLS:
+            data[c] = pa.array(self.columns[c], from_pandas=True)
+        data["status"] = pa.DictionaryArray.from_arrays(
+            pa.array(self.status_codes), pa.array(STATUSES))
+        return pa.table(data)
+
+    # ------------------------------------------------------------------
+    # 按行访问（兼容 List[MatchResult]）
+    # ------------------------------------------------------------------
+    def row(self, i: int) -> MatchResult:
+        col = self.columns
+        return MatchResult(
+            company=CompanyStandard(code=col["code"][i], name=col["name"][i],
+                                    impl_date=col["impl_date"][i], dept=col["dept"][i]),
+            gb_old_code=col["gb_old_code"][i],
+            gb_new_code=col["gb_new_code"][i],
+            status=STATUSES[self.status_codes[i]],
+            similarity=_optional(col["similarity"][i]),
+            reason=col["reason"][i],
+            days_to_replace=_optional(col["days_to_replace"][i]),
+            candidates=col["candidates"][i],
+        )
+
+    def __getitem__(self, i: int) -> MatchResult:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self.row(i)
+
+    def __iter__(self) -> Iterator[MatchResult]:
+        for i in range(len(self)):
+            yield self.row(i)
@@ -0,0 +1,61 @@
+"""
+scoring.py – REVIEW 编号相似度的批量打分
+---------------------------------------------------------------
+把公告旧号一次性展开，公司编号按块与全部旧号做一次矩阵打分
+（rapidfuzz.process.cdist，多核并行，低于阈值的分数直接置 0），
+再按公告行取最高分，只把幸存的 (公司行, 公告行) 交给名称打分。
+"""
+from __future__ import annotations
+
+from typing import Iterator, List, Sequence, Tuple
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from . import instrument
+from .blocking import CODE_CUTOFF
+
+# 每块矩阵的单元格上限（float64，约 32 MB）
+CHUNK_CELLS = 1 << 22
+
+
+def batch_code_scores(
+    codes: Sequence[str],
+    old_codes: Sequence[str],
+    old_rows: np.ndarray,
+    cutoff: float = CODE_CUTOFF,
+    workers: int = -1,
+) -> Iterator[List[Tuple[int, float]]]:
+    """
+    对每个公司编号依次产出 [(公告行号, 该行旧号最高编号相似度), ...]，
+    仅包含最高分 ≥ cutoff 的行，按行号升序。
+
+    old_rows[j] 为旧号 old_codes[j] 所在的公告行号，须单调不减。
+    """
+    if len(old_codes) == 0:
+        for _ in codes:
+            yield []
+        return
+
+    step = max(1, CHUNK_CELLS // len(old_codes))
+    for start in range(0, len(codes), step):
+        chunk = codes[start:start + step]
+        # dtype 必须为 float64，保证与 fuzz.ratio 的逐对结果逐位一致
+        mat = process.cdist(chunk, old_codes, scorer=fuzz.ratio,
+                            score_cutoff=cutoff, dtype=np.float64,
+                            workers=workers)
+        q_idx, o_idx = np.nonzero(mat)          # 行优先：先按公司行、再按旧号排序
+        instrument.count("pairs_scored", mat.size)
+        instrument.count("candidates_pruned", mat.size - len(q_idx))
+        per_code: List[List[Tuple[int, float]]] = [[] for _ in chunk]
+        if len(q_idx):
+            rows = old_rows[o_idx]
+            scores = mat[q_idx, o_idx]
+            # 同一 (公司行, 公告行) 的旧号连续排列，分组取最大
+            bounds = np.flatnonzero(np.r_[True, (q_idx[1:] != q_idx[:-1])
+                                          | (rows[1:] != rows[:-1])])
+            best = np.maximum.reduceat(scores, bounds)
+            for q, row, score in zip(q_idx[bounds].tolist(),
+                                     rows[bounds].tolist(), best.tolist()):
+                per_code[q].append((row, score))
+        yield from per_code
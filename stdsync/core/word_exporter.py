@@ -1,37 +1,143 @@
 # ==================== stdsync/core/word_exporter.py =======
-"""Word 导出：仅导出已失效条目"""
+"""
+Word 导出：已失效条目；结果带 top-K 候选时另附待复核候选表
+
+表格行不经 table.add_row() / cell.text 逐格写入（python-docx 每次都要重新遍历表格 XML，
+耗时随行数超线性增长），而是直接拼出 w:tr 的 XML 文本，按批解析后整体追加到表格，
+耗时与行数成线性。单表超过 MAX_TABLE_ROWS 行时在新的一节（新页）续表，
+每张表首行标记为重复标题行。
+"""
 from __future__ import annotations
+import re
+from itertools import islice
 from pathlib import Path
-from typing import List
+from typing import Iterable, Iterator
+from xml.sax.saxutils import escape
 
 from docx import Document  # 依赖 python-docx
+from docx.enum.section import WD_SECTION
+from docx.oxml import OxmlElement, parse_xml
+from docx.oxml.ns import nsdecls, qn
 
 from .models import MatchResult
+from .results import ResultTable
 
 HEADERS = [
     "旧标准名称", "旧标准编号", "新标准名称", "新标准编号", "入库时间", "持有部门"
 ]
 
+CANDIDATE_HEADERS = [
+    "公司标准编号", "公司标准名称", "排名", "国家新标准号", "国家标准名称", "编号相似度", "名称相似度"
+]
+
+# 单张表的最大数据行数，超过后另起一节续表（Word 打开超大单表很慢）
+MAX_TABLE_ROWS = 10_000
+# 每次解析、追加的行数
+ROW_BATCH = 2_000
+
+# XML 1.0 不允许的控制字符（\t \n \r 除外，另行转换）
+_INVALID_XML = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+_BREAKS = re.compile(r"(\t|\r\n|\r|\n)")
+
+
+def _text(value) -> str:
+    return str(value) if value else ""
+
+
+def _run_xml(text: str) -> str:
+    """单元格文本 → w:r；制表符、换行与 python-docx 的 run.text 一样转为 w:tab / w:br"""
+    text = _INVALID_XML.sub("", text)
+    if not _BREAKS.search(text):
+        return f'<w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r>'
+    parts = []
+    for piece in _BREAKS.split(text):
+        if piece == "\t":
+            parts.append("<w:tab/>")
+        elif piece in ("\r\n", "\r", "\n"):
+            parts.append("<w:br/>")
+        elif piece:
+            parts.append(f'<w:t xml:space="preserve">{escape(piece)}</w:t>')
+    return f"<w:r>{''.join(parts)}</w:r>"
+
+
+def _new_table(doc, headers: list[str]):
+    """带表头的空表；表头行在分页时重复"""
+    table = doc.add_table(rows=1, cols=len(headers))
+    for cell, h in zip(table.rows[0].cells, headers):
+        cell.text = h
+    table.rows[0]._tr.get_or_add_trPr().append(OxmlElement("w:tblHeader"))
+    return table
+
 
-def render_word(results: List[MatchResult], out_path: Path | str) -> Path:
-    """将 OBSOLETE 行输出为 Word 表格"""
+def _append_rows(table, rows: Iterable[tuple[str, ...]]) -> None:
+    """按批拼接 w:tr XML、一次解析后追加到表格末尾"""
+    tc_open = [f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{col.get(qn("w:w"))}"/></w:tcPr><w:p>'
+               for col in table._tbl.tblGrid.gridCol_lst]
+    rows = iter(rows)
+    while batch := list(islice(rows, ROW_BATCH)):
+        xml = "".join(
+            "<w:tr>"
+            + "".join(f"{tc}{_run_xml(text)}</w:p></w:tc>" for tc, text in zip(tc_open, row))
+            + "</w:tr>"
+            for row in batch
+        )
+        table._tbl.extend(parse_xml(f"<w:tbl {nsdecls('w')}>{xml}</w:tbl>"))
+
+
+def _write_table(doc, headers: list[str], rows: Iterable[tuple[str, ...]]) -> None:
+    """写出一张（必要时分节续写为多张）表"""
+    rows = iter(rows)
+    table = _new_table(doc, headers)
+    _append_rows(table, islice(rows, MAX_TABLE_ROWS))
+    while chunk := list(islice(rows, MAX_TABLE_ROWS)):
+        doc.add_section(WD_SECTION.NEW_PAGE)
+        _append_rows(_new_table(doc, headers), chunk)
+
+
+def _split_rows(results: Iterable[MatchResult] | ResultTable
+                ) -> tuple[list[tuple], list[tuple]]:
+    """
+    拆出 (OBSOLETE 行, 带候选的 REVIEW 行 (编号, 名称, 候选列表))；
+    ResultTable 先向量化筛选再按列读取，不构造 MatchResult
+    """
+    if isinstance(results, ResultTable):
+        sub = results.filter("OBSOLETE", "REVIEW")
+        records = sub.iter_rows(("status", "code", "name", "dept", "gb_new_code", "candidates"))
+        statuses = ("OBSOLETE", "REVIEW")
+        records = ((statuses[st], *rest) for st, *rest in records)
+    else:
+        records = ((m.status, m.company.code, m.company.name, m.company.dept,
+                    m.gb_new_code, m.candidates) for m in results)
+
+    obsolete, reviews = [], []
+    for status, code, name, dept, new_code, cands in records:
+        if status == "OBSOLETE":
+            name = _text(name)
+            # 公告无新名称字段时以旧名称占位；入库时间留空
+            obsolete.append((name, _text(code), name, _text(new_code), "", _text(dept)))
+        elif status == "REVIEW" and cands:
+            reviews.append((_text(code), _text(name), cands))
+    return obsolete, reviews
+
+
+def _candidate_rows(reviews: list[tuple]) -> Iterator[tuple[str, ...]]:
+    for code, name, cands in reviews:
+        for rank, cand in enumerate(cands, start=1):
+            yield (code, name, str(rank), _text(cand.gb_new_code), str(cand.gb_name or ""),
+                   f"{cand.code_score:.1f}%", f"{cand.name_score:.1f}%")
+
+
+def render_word(results: Iterable[MatchResult] | ResultTable, out_path: Path | str) -> Path:
+    """将 OBSOLETE 行输出为 Word 表格；REVIEW 行带候选时追加候选表"""
     out_path = Path(out_path)
     doc = Document()
 
-    table = doc.add_table(rows=1, cols=len(HEADERS))
-    for idx, h in enumerate(HEADERS):
-        table.rows[0].cells[idx].text = h
-
-    for m in results:
-        if m.status != "OBSOLETE":
-            continue
-        cells = table.add_row().cells
-        cells[0].text = m.company.name or ""
-        cells[1].text = m.company.code or ""
-        cells[2].text = m.company.name or ""   # 公告无新名称字段时占位
-        cells[3].text = m.gb_new_code or ""
-        cells[4].text = ""  # 入库时间留空
-        cells[5].text = m.company.dept or ""
+    obsolete, reviews = _split_rows(results)
+    _write_table(doc, HEADERS, obsolete)
+
+    if reviews:
+        doc.add_heading("待复核候选", level=2)
+        _write_table(doc, CANDIDATE_HEADERS, _candidate_rows(reviews))
 
     doc.save(out_path)
-    return out_path
\ No newline at end of file
+    return out_path
@@ -3,17 +3,25 @@ Tkinter 版 GUI（不依赖任何外部库）
 """
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import json
-import threading
+import queue
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 
-from stdsync.core import excel_io, comparer, reporter
-from stdsync.core import word_exporter
+from stdsync.core.job import JobEvent, JobResult, PipelineJob
 
 HISTORY_FILE = Path.home() / ".stdsync_history.json"
+FILE_TYPES = [("Excel", "*.xlsx"), ("CSV / Parquet / Arrow", "*.csv *.parquet *.arrow *.feather")]
 MAX_HISTORY = 8
 
+# 事件队列轮询间隔（毫秒）
+POLL_MS = 100
+# 并行任务上限：一个任务比对时，之前的任务可继续写出
+JOB_WORKERS = 2
+# 各阶段在进度条上占的区间
+STAGE_SPAN = {"load": (0, 30), "compare": (30, 90), "write": (90, 100)}
+
 
 def _load_history() -> list[dict]:
     if HISTORY_FILE.exists():
@@ -35,7 +43,13 @@ class StdSyncGUI(tk.Tk):
         self.title("StdSync – 国家/企业标准对照")
 
         self.hist = _load_history()
+        self.events: queue.Queue = queue.Queue()
+        self.executor = ThreadPoolExecutor(max_workers=JOB_WORKERS,
+                                           thread_name_prefix="stdsync-job")
+        self.job: PipelineJob | None = None     # 正在读取 / 比对的任务
         self._build_widgets()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.after(POLL_MS, self._poll)
 
     # --- 布局
     def _build_widgets(self):
@@ -69,9 +83,15 @@ class StdSyncGUI(tk.Tk):
         self.btn_run = ttk.Button(frm, text="运行", command=self._run, state="disabled")
         self.btn_run.grid(row=3, column=0, pady=5)
 
-        # 进度条
+        # 进度条 + 取消
         self.pb = ttk.Progressbar(frm, length=300, maximum=100)
-        self.pb.grid(row=3, column=1, columnspan=2, pady=5, sticky="ew")
+        self.pb.grid(row=3, column=1, pady=5, sticky="ew")
+        self.btn_cancel = ttk.Button(frm, text="取消", command=self._cancel, state="disabled")
+        self.btn_cancel.grid(row=3, column=2, pady=5, sticky="ew")
+
+        # 进度说明（行数 / 速率 / 剩余时间）
+        self.lbl_progress = ttk.Label(frm, text="")
+        self.lbl_progress.grid(row=6, column=0, columnspan=3, sticky="w")
 
         # 日志框
         self.txt_log = tk.Text(frm, height=12, width=80, state="disabled")
@@ -87,21 +107,22 @@ class StdSyncGUI(tk.Tk):
 
     # --- 事件
     def _browse_company(self):
-        path = filedialog.askopenfilename(filetypes=[("Excel", "*.xlsx")])
+        path = filedialog.askopenfilename(filetypes=FILE_TYPES)
         if path:
             self.ent_company.delete(0, tk.END)
             self.ent_company.insert(0, path)
             self._toggle_run()
 
     def _browse_gb(self):
-        path = filedialog.askopenfilename(filetypes=[("Excel", "*.xlsx")])
+        path = filedialog.askopenfilename(filetypes=FILE_TYPES)
         if path:
             self.ent_gb.delete(0, tk.END)
             self.ent_gb.insert(0, path)
             self._toggle_run()
 
     def _toggle_run(self, *_):
-        ready = Path(self.ent_company.get()).is_file() and Path(self.ent_gb.get()).is_file()
+        ready = (self.job is None and Path(self.ent_company.get()).is_file()
+                 and Path(self.ent_gb.get()).is_file())
         self.btn_run["state"] = "normal" if ready else "disabled"
 
     def _log(self, msg: str):
@@ -112,51 +133,107 @@ class StdSyncGUI(tk.Tk):
         self.txt_log["state"] = "disabled"
 
     def _run(self):
-        # 后台线程，避免 GUI 卡死
-        threading.Thread(target=self._run_core, daemon=True).start()
-
-    def _run_core(self):
+        # 任务在执行器线程中运行；进度经队列回到主线程，由 _poll 更新界面
+        job = PipelineJob(self.ent_company.get(), self.ent_gb.get(),
+                          Path(self.ent_company.get()).parent / "输出结果", events=self.events)
+        self.job = job
+        self.btn_run["state"] = "disabled"
+        self.btn_cancel["state"] = "normal"
+        self.pb["value"] = 0
+        job.submit(self.executor)
+
+    def _cancel(self):
+        if self.job is not None:
+            self.job.cancel()
+            self.btn_cancel["state"] = "disabled"
+            self._log("正在取消 …")
+
+    def _on_close(self):
+        if self.job is not None:
+            self.job.cancel()
+        self.executor.shutdown(wait=False)   # 已在写出的任务仍会写完
+        self.destroy()
+
+    def _poll(self):
+        """主循环定时取出任务事件"""
         try:
-            self.pb["value"] = 10
-            self._log("读取文件 …")
-            c_df = excel_io.load_company(self.ent_company.get())
-            g_df = excel_io.load_gb(self.ent_gb.get())
-
-            self.pb["value"] = 40
-            self._log("正在比对 …")
-            res = comparer.compare(c_df, g_df)
-
-            self.pb["value"] = 70
-            out_dir = Path(self.ent_company.get()).parent / "输出结果"
-            out_dir.mkdir(exist_ok=True)
-            out_path = out_dir / f"差异_{datetime.now():%Y%m%d_%H%M%S}.xlsx"
-            reporter.render(res, out_path)
-            doc_path = out_dir / f"差异详情_{datetime.now():%Y%m%d_%H%M%S}.docx"
-            word_exporter.render_word(res, doc_path)
-            self._log(f"已生成差异表 {out_path}\n已生成 Word {doc_path}\n")
+            while True:
+                self._on_event(self.events.get_nowait())
+        except queue.Empty:
+            pass
+        self.after(POLL_MS, self._poll)
+
+    def _on_event(self, ev: JobEvent):
+        current = self.job is not None and ev.job_id == self.job.id
+
+        if ev.kind == "stage":
+            if current:
+                self.pb["value"] = STAGE_SPAN[ev.stage][0]
+                self.lbl_progress["text"] = ev.message
+            self._log(f"#{ev.job_id} {ev.message}")
+        elif ev.kind == "progress":
+            if current:
+                lo, hi = STAGE_SPAN[ev.stage]
+                if ev.total:
+                    self.pb["value"] = lo + (hi - lo) * ev.done / ev.total
+                self.lbl_progress["text"] = _progress_text(ev)
+        elif ev.kind == "computed":
+            self._log(f"#{ev.job_id} {ev.message}")
+            if current:                      # 写出期间即可开始下一次运行
+                self.job = None
+                self.btn_cancel["state"] = "disabled"
+                self._toggle_run()
+        elif ev.kind == "done":
+            self._finish(ev)
+        elif ev.kind == "error":
+            messagebox.showerror("错误", ev.message)
+            self._log(f"#{ev.job_id} ERROR: {ev.message}")
+            self._reset(ev)
+        elif ev.kind == "cancelled":
+            self._log(f"#{ev.job_id} 已取消")
+            self._reset(ev)
+
+    def _reset(self, ev: JobEvent):
+        if self.job is not None and ev.job_id == self.job.id:
+            self.job = None
+            self.btn_cancel["state"] = "disabled"
+            self._toggle_run()
+        if self.job is None:
+            self.pb["value"] = 0
+            self.lbl_progress["text"] = ""
 
+    def _finish(self, ev: JobEvent):
+        res: JobResult = ev.result
+        self._log(f"#{ev.job_id} {ev.message}")
+        self._log("各阶段耗时：\n" + res.profile)
+        if self.job is None:
             self.pb["value"] = 100
-            obsolete = sum(r.status == "OBSOLETE" for r in res)
-            review = sum(r.status == "REVIEW" for r in res)
-            status_text = (
-                f"{datetime.now():%Y-%m-%d %H:%M:%S} 失效 {obsolete} 条，"
-                f"待复核 {review} 条 👉 {out_path.name}"
-            )
-            self.lbl_status["text"] = status_text
-            self.lbl_status["foreground"] = "red" if (obsolete or review) else "green"
-            self._log(f"已生成差异表 {out_path}")
-
-            # 写历史
-            self.hist.insert(0, {"time": datetime.now().isoformat(), "out": str(out_path)})
-            self.hist[:] = self.hist[:MAX_HISTORY]
-            _save_history(self.hist)
-            self.cbo_hist["values"] = [h["out"] for h in self.hist]
-
-        except Exception as e:
-            messagebox.showerror("错误", str(e))
-            self._log(f"ERROR: {e}")
-        finally:
-            self.pb["value"] = 0
+            self.lbl_progress["text"] = ""
+
+        obsolete, review = res.counts["OBSOLETE"], res.counts["REVIEW"]
+        status_text = (
+            f"{datetime.now():%Y-%m-%d %H:%M:%S} 失效 {obsolete} 条，"
+            f"待复核 {review} 条 👉 {res.out_path.name}"
+        )
+        self.lbl_status["text"] = status_text
+        self.lbl_status["foreground"] = "red" if (obsolete or review) else "green"
+
+        # 写历史
+        self.hist.insert(0, {"time": datetime.now().isoformat(), "out": str(res.out_path)})
+        self.hist[:] = self.hist[:MAX_HISTORY]
+        _save_history(self.hist)
+        self.cbo_hist["values"] = [h["out"] for h in self.hist]
+
+
+def _progress_text(ev: JobEvent) -> str:
+    """进度标签：已处理行数 / 速率 / 预计剩余时间"""
+    label = {"load": "读取", "compare": "比对"}.get(ev.stage, ev.stage)
+    text = f"{label} {ev.done:,}" + (f" / {ev.total:,}" if ev.total else "") + " 行"
+    if ev.rate:
+        text += f" · {ev.rate:,.0f} 行/秒"
+    if ev.eta is not None:
+        text += f" · 剩余 {ev.eta:.0f} 秒"
+    return text
 
 
 # ----------------------------- 入口函数 -----------------------------
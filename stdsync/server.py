@@ -0,0 +1,270 @@
+# ==================== stdsync/server.py ====================
+"""
+本地比对服务：常驻进程中保留已解析的国家公告索引，
+多次比对只付一次解释器启动、依赖导入与公告解析的开销。
+
+用法：
+  python main.py --serve [--port 8765] [--preload 国家公告.xlsx]
+
+接口（HTTP，默认只监听 127.0.0.1）：
+  GET  /health                      → {"status": "ok", "indexes": [...]}
+  POST /compare?gb=<公告路径>        请求体为公司清单文件内容
+       &filename=<原文件名>           按扩展名识别格式（默认 .xlsx）
+       &format=json|xlsx             返回 JSON 结果或差异表 xlsx（默认 json）
+       &top_k=K&engine=blocked
+       &workers=N                    比对分片进程数（缺省为 --compare-workers）
+公告路径为服务端本地路径；索引按 (路径, 修改时间, 大小) 做 LRU 缓存，文件变化后自动重建。
+请求由固定大小的线程池处理（收发、读取与写出），每个响应后关闭连接，
+空闲连接在 REQUEST_TIMEOUT 秒后断开，不会长期占住线程；比对本身受 GIL 限制，
+compare_workers > 1 时把公司清单分片到进程池（comparer 的多进程引擎），
+但不足 SHARD_MIN_ROWS 行的清单仍在本线程比对——建进程池的开销高于分片的收益。
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from stdsync.core import comparer, excel_io, reporter
+from stdsync.core.cache import ParseCache
+from stdsync.core.index import AnnouncementIndex
+from stdsync.core.results import ResultTable
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# 常驻内存的公告索引个数
+MAX_INDEXES = 4
+# 公司清单不足该行数时不分片到进程池
+SHARD_MIN_ROWS = 5000
+# 连接读写超时（秒）
+REQUEST_TIMEOUT = 30
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+class CompareService:
+    """公告索引 LRU + 比对入口（与 HTTP 无关，可直接调用）"""
+
+    def __init__(self, max_indexes: int = MAX_INDEXES, cache: ParseCache | None = None,
+                 compare_workers: int = 1):
+        self.max_indexes = max_indexes
+        self.cache = cache
+        self.compare_workers = compare_workers
+        self.hits = 0
+        self.misses = 0
+        self._indexes: OrderedDict[tuple, AnnouncementIndex] = OrderedDict()
+        self._lock = threading.Lock()
+        self._building: dict[tuple, threading.Lock] = {}
+
+    @staticmethod
+    def _key(gb_path: Path) -> tuple:
+        st = gb_path.stat()
+        return str(gb_path.resolve()), st.st_mtime_ns, st.st_size
+
+    def index(self, gb_path: Path | str) -> AnnouncementIndex:
+        """取公告索引；未命中时构建（同一文件并发请求只构建一次）"""
+        gb_path = Path(gb_path)
+        if not gb_path.is_file():
+            raise FileNotFoundError(f"国家公告不存在：{gb_path}")
+        key = self._key(gb_path)
+        with self._lock:
+            if key in self._indexes:
+                self._indexes.move_to_end(key)
+                self.hits += 1
+                return self._indexes[key]
+            build_lock = self._building.setdefault(key, threading.Lock())
+
+        with build_lock:
+            with self._lock:
+                if key in self._indexes:         # 等锁期间已由其他请求构建
+                    self.hits += 1
+                    return self._indexes[key]
+            try:
+                index = excel_io.load_gb_index(gb_path, cache=self.cache)
+                with self._lock:
+                    self.misses += 1
+                    # 同一路径的旧版本（文件已变化）与超出容量的最久未用项一并淘汰
+                    for stale in [k for k in self._indexes if k[0] == key[0]]:
+                        del self._indexes[stale]
+                    self._indexes[key] = index
+                    while len(self._indexes) > self.max_indexes:
+                        self._indexes.popitem(last=False)
+            finally:
+                with self._lock:
+                    self._building.pop(key, None)
+        return index
+
+    def loaded(self) -> list[str]:
+        with self._lock:
+            return [k[0] for k in self._indexes]
+
+    def compare(self, company: bytes, filename: str, gb_path: Path | str,
+                top_k: int = 0, engine: str = "blocked",
+                workers: int | None = None) -> ResultTable:
+        """
+        比对上传的公司清单（文件内容 + 原文件名，按扩展名识别格式）；
+        workers 为分片进程数，缺省取 compare_workers；清单不足 SHARD_MIN_ROWS 行时不分片
+        """
+        index = self.index(gb_path)
+        suffix = Path(filename).suffix.lower() or ".xlsx"
+        fd, tmp = tempfile.mkstemp(suffix=suffix)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(company)
+            company_df = excel_io.load_company(tmp)
+        finally:
+            os.unlink(tmp)
+        workers = self.compare_workers if workers is None else workers
+        if workers < 1:
+            raise ValueError(f"workers 须为正整数：{workers}")
+        if len(company_df) < SHARD_MIN_ROWS:
+            workers = 1
+        return comparer.compare_table(company_df, index, engine=engine, top_k=top_k,
+                                      workers=workers)
+
+
+# ------------------------------------------------------------------
+# HTTP
+# ------------------------------------------------------------------
+class _PooledHTTPServer(HTTPServer):
+    """每个连接交给固定大小的线程池处理"""
+
+    def __init__(self, address, service: CompareService, workers: int,
+                 timeout: float = REQUEST_TIMEOUT):
+        super().__init__(address, _Handler)
+        self.service = service
+        self.request_timeout = timeout
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stdsync-serve")
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: _PooledHTTPServer
+    protocol_version = "HTTP/1.1"
+    timeout = REQUEST_TIMEOUT
+
+    def setup(self):
+        self.timeout = self.server.request_timeout
+        super().setup()
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        # 每个响应后关闭连接：保持连接的客户端不会占住线程池中的线程
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, payload) -> None:
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        self._send(status, body, "application/json; charset=utf-8")
+
+    def do_GET(self):
+        if urlparse(self.path).path == "/health":
+            self._send_json(200, {"status": "ok", "indexes": self.server.service.loaded()})
+        else:
+            self._send_json(404, {"error": f"未知路径：{self.path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        if url.path != "/compare":
+            self._send_json(404, {"error": f"未知路径：{url.path}"})
+            return
+
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        if "gb" not in query:
+            self._send_json(400, {"error": "缺少参数 gb（国家公告路径）"})
+            return
+        fmt = query.get("format", "json")
+        try:
+            table = self.server.service.compare(
+                body, query.get("filename", "company.xlsx"), query["gb"],
+                top_k=int(query.get("top_k", 0)), engine=query.get("engine", "blocked"),
+                workers=int(query["workers"]) if "workers" in query else None)
+        except FileNotFoundError as err:
+            self._send_json(404, {"error": str(err)})
+            return
+        except ValueError as err:
+            self._send_json(400, {"error": str(err)})
+            return
+        except Exception as err:
+            self._send_json(500, {"error": f"{type(err).__name__}: {err}"})
+            return
+
+        if fmt == "xlsx":
+            fd, tmp = tempfile.mkstemp(suffix=".xlsx")
+            os.close(fd)
+            try:
+                reporter.render(table, tmp)
+                self._send(200, Path(tmp).read_bytes(), XLSX_MIME)
+            finally:
+                os.unlink(tmp)
+        else:
+            self._send_json(200, {"counts": table.counts(),
+                                  "results": [asdict(m) for m in table]})
+
+
+def make_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                workers: int | None = None, service: CompareService | None = None,
+                timeout: float = REQUEST_TIMEOUT) -> _PooledHTTPServer:
+    """创建（未启动的）服务；port=0 时由系统分配端口，timeout 为连接读写超时（秒）"""
+    service = service or CompareService()
+    return _PooledHTTPServer((host, port), service, workers or min(8, os.cpu_count() or 1),
+                             timeout)
+
+
+def run_server() -> None:
+    """--serve 入口"""
+    ap = argparse.ArgumentParser("StdSync 服务")
+    ap.add_argument("--host", default=DEFAULT_HOST, help="监听地址（默认仅本机）")
+    ap.add_argument("--port", type=int, default=DEFAULT_PORT, help="监听端口")
+    ap.add_argument("--workers", type=int, metavar="N", help="并发处理请求的线程数")
+    ap.add_argument("--compare-workers", type=int, metavar="N",
+                    help=f"每次比对分片到 N 个进程（默认 1，不分片）；"
+                         f"不足 {SHARD_MIN_ROWS} 行的公司清单不分片")
+    ap.add_argument("--max-indexes", type=int, default=MAX_INDEXES,
+                    help="常驻内存的国家公告索引个数（LRU）")
+    ap.add_argument("--preload", action="append", default=[], metavar="GB",
+                    help="启动时预先加载的国家公告，可重复")
+    ap.add_argument("--no-cache", action="store_true", help="不读写解析缓存")
+    args = ap.parse_args()
+
+    service = CompareService(args.max_indexes, None if args.no_cache else ParseCache(),
+                             compare_workers=args.compare_workers or 1)
+    for gb in args.preload:
+        service.index(gb)
+        print(f"已加载 {gb}")
+
+    server = make_server(args.host, args.port, args.workers, service)
+    print(f"StdSync 服务已启动：http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,137 @@
+"""
+测试共用的数据工厂（以 fixture 提供，各测试模块之间不互相导入）
+"""
+import math
+import random
+
+import pandas as pd
+import pytest
+
+from stdsync.core.models import CompanyStandard, MatchResult
+
+# normalize_code 的边界输入
+EDGE_CASES = [
+    None, "", " ", "GB 1234-2020", " GB/T 1234.1-2008 ", "ＧＢ／Ｔ　１２３４－２００８",
+    "GB–50001—2017", "JGJ 100-2015", "　DB11/T 123-2020　", "GB\t1-2000\n",
+    "Ⅻ-①", "ﬁ-ﬂ", "GB\x1f1\x1c", 12345, 1.5, True, math.nan, "nan",
+]
+
+
+def _random_codes(n, seed=0):
+    rng = random.Random(seed)
+    alphabet = "GBTJ/ .-–—0123456789ＧＢＴ／－０１２３４　 ｶﾞ"
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 16)))
+            for _ in range(n)]
+
+
+def _random_frames(seed: int, n_company: int, n_gb: int):
+    """构造编号彼此相近的随机数据，使 REVIEW 分支被充分触发"""
+    rng = random.Random(seed)
+    prefixes = ["GB/T", "GB", "JB/T", "Q/FCIC"]
+    dashes = ["—", "-", "–"]
+    words = ["水泥", "钢筋", "混凝土", "测试", "方法", "规范", "通用", "技术条件"]
+
+    def code():
+        return (f"{rng.choice(prefixes)} {rng.randint(1340, 1360)}"
+                f"{rng.choice(dashes)}{rng.randint(2000, 2012)}")
+
+    def name():
+        return "".join(rng.sample(words, rng.randint(2, 4)))
+
+    company_df = pd.DataFrame(
+        {"code": [code() for _ in range(n_company)],
+         "name": [name() for _ in range(n_company)]}
+    )
+    gb_df = pd.DataFrame(
+        {"code": [code() for _ in range(n_gb)],
+         "name": [name() for _ in range(n_gb)],
+         "replaced": [None if rng.random() < 0.1 else
+                      "；".join(code() for _ in range(rng.randint(1, 3)))
+                      for _ in range(n_gb)]}
+    )
+    return company_df, gb_df
+
+
+def _write_gb_xlsx(path, codes):
+    """按公告原始表头写出 xlsx（代替标准号、实施日期各行相同）"""
+    pd.DataFrame(
+        {
+            "国家标准编号": codes,
+            "国 家 标 准 名 称": ["水泥测试方法"] * len(codes),
+            "代替标准号": ["GB/T 1346—2011"] * len(codes),
+            "实施日期": ["2025-01-01"] * len(codes),
+        }
+    ).to_excel(path, index=False)
+
+
+def _obsolete_results(n: int) -> list:
+    """n 条 OBSOLETE 结果（部门轮换）"""
+    return [
+        MatchResult(
+            company=CompanyStandard(code=f"GB/T {1000 + i}—2008", name=f"水泥试验方法 第{i}部分",
+                                    impl_date=None, dept=("质量部", "技术部", "生产部")[i % 3]),
+            gb_old_code=f"GB/T {1000 + i}—2008",
+            gb_new_code=f"GB/T {1000 + i}—2024",
+            status="OBSOLETE",
+        )
+        for i in range(n)
+    ]
+
+
+def _add_row_render_word(results, out_path):
+    """Word 失效清单的参照实现：逐行 add_row 并逐格赋值 cell.text（正确性对照）"""
+    from docx import Document
+
+    from stdsync.core import word_exporter
+
+    doc = Document()
+    table = doc.add_table(rows=1, cols=len(word_exporter.HEADERS))
+    for idx, h in enumerate(word_exporter.HEADERS):
+        table.rows[0].cells[idx].text = h
+    for m in results:
+        if m.status != "OBSOLETE":
+            continue
+        cells = table.add_row().cells
+        cells[0].text = m.company.name or ""
+        cells[1].text = m.company.code or ""
+        cells[2].text = m.company.name or ""
+        cells[3].text = m.gb_new_code or ""
+        cells[4].text = ""
+        cells[5].text = m.company.dept or ""
+    doc.save(out_path)
+    return out_path
+
+
+@pytest.fixture
+def edge_cases():
+    return list(EDGE_CASES)
+
+
+@pytest.fixture
+def random_codes():
+    """random_codes(n, seed=0) → n 个随机编号（含全角、半角片假名等）"""
+    return _random_codes
+
+
+@pytest.fixture
+def random_frames():
+    """random_frames(seed, n_company, n_gb) → (company_df, gb_df)"""
+    return _random_frames
+
+
+@pytest.fixture
+def write_gb_xlsx():
+    """write_gb_xlsx(path, codes) 写出一份公告 xlsx"""
+    return _write_gb_xlsx
+
+
+@pytest.fixture
+def obsolete_results():
+    """obsolete_results(n) → n 条 OBSOLETE MatchResult"""
+    return _obsolete_results
+
+
+@pytest.fixture
+def add_row_render_word():
+    """add_row_render_word(results, out_path) 逐行 add_row 写出 Word（参照实现）"""
+    return _add_row_render_word
@@ -0,0 +1,40 @@
+"""
+基准脚本冒烟测试：合成数据覆盖各类变体，小规模运行可产出 JSON
+"""
+import json
+
+from benchmarks import bench_normalize, bench_word, run, synth
+from stdsync.core import comparer
+
+
+def test_synth_covers_variants():
+    gb_df = synth.make_gb(400, seed=1)
+    company_df = synth.make_company(600, gb_df, seed=2)
+
+    replaced = gb_df["replaced"].dropna()
+    assert replaced.str.contains("[;；,，]").any()            # 多旧号单元格
+    assert company_df["code"].str.contains("[－Ｇ-Ｚ０-９]").any()   # 全角字符
+    assert company_df["code"].str.contains("-").any()           # 半角连字符
+
+    counts = comparer.compare_table(company_df, gb_df).counts()
+    assert counts["OBSOLETE"] > 0 and counts["REVIEW"] > 0
+
+
+def test_run_writes_json(tmp_path):
+    out = run.run(sizes=[50], out=tmp_path / "bench.json")
+
+    payload = json.loads(out.read_text("utf-8"))
+    assert {r["stage"] for r in payload["results"]} == {"load", "compare", "lifecycle", "render",
+                                                         "render_word", "outputs"}
+    assert payload["meta"]["python"]
+
+
+def test_bench_normalize_runs():
+    timings = bench_normalize.run(size=50, repeat=1)
+    assert set(timings) >= {"reference", "normalize_code", "normalize_codes", "clean.code_norm"}
+
+
+def test_bench_word_runs():
+    records = bench_word.run(sizes=[20, 40], reference_max=20)
+    assert [r["size"] for r in records] == [20, 40]
+    assert "reference" in records[0] and "reference" not in records[1]
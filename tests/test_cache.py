@@ -0,0 +1,88 @@
+"""
+解析缓存单元测试
+"""
+import pandas as pd
+
+from stdsync.core import excel_io
+from stdsync.core.cache import ParseCache
+from stdsync.core.index import AnnouncementIndex
+
+
+def test_cache_hit_skips_excel(tmp_path, monkeypatch, write_gb_xlsx):
+    """第二次读取同一文件应直接命中缓存，不再调用 read_excel"""
+    gb_path = tmp_path / "gb.xlsx"
+    write_gb_xlsx(gb_path, ["GB/T 1346—2024"])
+    cache = ParseCache(tmp_path / "cache")
+
+    first = excel_io.load_gb(gb_path, cache=cache)
+
+    def boom(*args, **kwargs):
+        raise AssertionError("不应再次解析 Excel")
+
+    monkeypatch.setattr(pd, "read_excel", boom)
+    second = excel_io.load_gb(gb_path, cache=cache)
+
+    pd.testing.assert_frame_equal(first, second, check_dtype=False)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    index = excel_io.load_gb_index(gb_path, cache=cache)     # 首次构建索引
+    again = excel_io.load_gb_index(gb_path, cache=cache)     # 命中索引缓存
+    assert isinstance(again, AnnouncementIndex)
+    assert again.replaced_map == index.replaced_map == {"GB/T 1346—2011": "GB/T 1346—2024"}
+
+
+def test_cache_hit_reports_progress(tmp_path):
+    """命中缓存时 progress 仍回调一次（以缓存行数），未命中时不重复回调"""
+    path = tmp_path / "company.csv"
+    path.write_text("标准编号,标准名称\nGB/T 1346-2011,水泥\nGB 175-2007,通用水泥\n", "utf-8")
+    cache = ParseCache(tmp_path / "cache")
+
+    ticks = []
+    excel_io.load_company(path, cache=cache, progress=ticks.append)
+    assert ticks == [2]
+    ticks.clear()
+    df = excel_io.load_company(path, cache=cache, progress=ticks.append)
+    assert cache.hits == 1 and ticks == [len(df)] == [2]
+
+
+def test_cache_invalidated_on_change(tmp_path, write_gb_xlsx):
+    """文件内容变化后应重新解析"""
+    gb_path = tmp_path / "gb.xlsx"
+    cache = ParseCache(tmp_path / "cache")
+
+    write_gb_xlsx(gb_path, ["GB/T 1346—2024"])
+    excel_io.load_gb(gb_path, cache=cache)
+    write_gb_xlsx(gb_path, ["GB/T 1346—2025"])
+    df = excel_io.load_gb(gb_path, cache=cache)
+
+    assert df["code"].tolist() == ["GB/T 1346—2025"]
+    assert cache.misses == 2
+
+
+def test_cache_lru_eviction_and_clear(tmp_path, write_gb_xlsx):
+    """超过容量上限时淘汰最久未访问的条目；clear() 清空全部"""
+    cache = ParseCache(tmp_path / "cache", max_bytes=0)
+    for i in range(3):
+        gb_path = tmp_path / f"gb{i}.xlsx"
+        write_gb_xlsx(gb_path, [f"GB/T {i}—2024"])
+        excel_io.load_gb(gb_path, cache=cache)
+    assert cache.size() == 0            # 上限为 0 → 写入即淘汰
+
+    cache = ParseCache(tmp_path / "cache")
+    excel_io.load_gb(tmp_path / "gb0.xlsx", cache=cache)
+    assert cache.size() > 0
+    assert cache.clear() == 1
+    assert cache.size() == 0
+
+
+def test_cache_eviction_skips_vanished_entries(tmp_path, monkeypatch, write_gb_xlsx):
+    """列出条目后其他进程已淘汰的文件直接跳过，不影响本次读取"""
+    cache = ParseCache(tmp_path / "cache", max_bytes=0)
+    listed = cache._entries
+    monkeypatch.setattr(cache, "_entries",
+                        lambda: listed() + [cache.root / "gone_by_now.parquet"])
+
+    gb_path = tmp_path / "gb.xlsx"
+    write_gb_xlsx(gb_path, ["GB/T 1—2024"])
+    assert len(excel_io.load_gb(gb_path, cache=cache)) == 1
+    assert cache.size() == 0
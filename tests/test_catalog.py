@@ -0,0 +1,132 @@
+"""
+本地标准目录：增量入库、按编号去重、索引查询，以及对目录比对与直接比对一致
+"""
+import pandas as pd
+
+from stdsync.core import clean, comparer
+from stdsync.core.catalog import StandardCatalog, base_number
+
+
+def _collapse(gb_df, merge_olds):
+    """
+    每个规范化新号一行，名称取最后一行，该新号按最后一行带旧号的行的位置参与比对；
+    merge_olds 时旧号为各行旧号的合并，否则取该行的旧号
+    """
+    norm = pd.Series(clean.to_pylist(clean.code_norm(gb_df["code"])))
+    has = gb_df["replaced"].notna().to_numpy()
+    src = {code: i for i, code in enumerate(norm)}
+    src.update({code: i for i, code in enumerate(norm) if has[i]})
+    raws: dict = {}
+    for code, raw in zip(norm[has], gb_df["replaced"][has]):
+        raws.setdefault(code, {})[raw] = None
+    out = gb_df.iloc[sorted(src.values())].reset_index(drop=True)
+    last_name = dict(zip(norm, gb_df["name"]))
+    out_norm = clean.to_pylist(clean.code_norm(out["code"]))
+    out["name"] = [last_name[c] for c in out_norm]
+    if merge_olds:
+        out["replaced"] = ["；".join(raws[c]) if c in raws else None for c in out_norm]
+    return out
+
+
+def _dedup(*batches):
+    """目录的去重规则：同一批内合并重复新号的旧号，后入库的批次整体替换旧号"""
+    return _collapse(pd.concat([_collapse(df, True) for df in batches], ignore_index=True), False)
+
+
+def test_compare_against_catalog_matches_frame(tmp_path, random_frames):
+    company_df, gb_df = random_frames(seed=11, n_company=300, n_gb=200)
+    with StandardCatalog(tmp_path / "cat.db") as catalog:
+        catalog.ingest(gb_df.iloc[:120])
+        catalog.ingest(gb_df.iloc[120:])
+        deduped = _dedup(gb_df.iloc[:120], gb_df.iloc[120:])
+        assert len(catalog) == len(deduped)
+
+        expected = comparer.compare(company_df, deduped, top_k=3)
+        assert comparer.compare(company_df, catalog, top_k=3) == expected
+        assert catalog.index() is catalog.index()           # 目录未变，复用索引
+
+    # 重新打开：数据已持久化
+    with StandardCatalog(tmp_path / "cat.db") as catalog:
+        assert comparer.compare(company_df, catalog, top_k=3) == expected
+
+
+def test_ingest_file_is_incremental(tmp_path, write_gb_xlsx):
+    gb_path = tmp_path / "gb.xlsx"
+    write_gb_xlsx(gb_path, ["GB/T 1346—2024", "ＧＢ／Ｔ　１３４７－２０２４"])
+    with StandardCatalog(tmp_path / "cat.db") as catalog:
+        assert catalog.ingest_file(gb_path) == 2
+        rev = catalog.revision
+        assert catalog.ingest_file(gb_path) == 0 and catalog.revision == rev
+
+        # 新一期公告修订同一编号：覆盖旧记录，不新增行
+        newer = tmp_path / "gb2.xlsx"
+        pd.DataFrame({"国家标准编号": ["GB/T 1346—2024"],
+                      "国 家 标 准 名 称": ["水泥标准稠度用水量"],
+                      "代替标准号": ["GB/T 1346—2011；GB/T 1346—2001"]}).to_excel(newer, index=False)
+        assert catalog.ingest_file(newer) == 1
+        assert len(catalog) == 2
+        rec = catalog.lookup("GB/T 1346—2024")
+        assert rec["name"] == "水泥标准稠度用水量" and rec["impl_date"] is None
+        assert rec["replaced"] == ["GB/T 1346—2011", "GB/T 1346—2001"]
+        assert catalog.lookup("GB/T 1347—2024")["impl_date"] == "2025-01-01"
+
+
+def test_indexed_queries(tmp_path):
+    gb_df = pd.DataFrame({
+        "code": ["GB/T 1346—2011", "GB/T 1346—2024", "GB 175—2023", "GB/T 1346.1—2024"],
+        "name": ["水泥标准稠度用水量检验方法", "水泥标准稠度用水量、凝结时间检验方法",
+                 "通用硅酸盐水泥", "水泥试验 第1部分"],
+        "replaced": ["GB/T 1346—2001", "GB/T 1346—2011", "GB 175—2007", None],
+        "impl_date": ["2012-03-01", "2025-01-01", "2024-06-01", None],
+    })
+    with StandardCatalog(tmp_path / "cat.db") as catalog:
+        catalog.ingest(gb_df, source="公告")
+        assert base_number("GB/T 1346.1—2024") == "GB/T 1346.1"
+
+        assert [r["code_norm"] for r in catalog.replaced_by("GB/T 1346—2011")] == ["GB/T 1346—2024"]
+        assert [r["code_norm"] for r in catalog.history("GB/T 1346")] == [
+            "GB/T 1346—2011", "GB/T 1346—2024"]
+        assert {r["code_norm"] for r in catalog.search("稠度用水量")} == {
+            "GB/T 1346—2011", "GB/T 1346—2024"}
+        assert [r["code_norm"] for r in catalog.search("硅酸盐")] == ["GB 175—2023"]
+        assert [r["code_norm"] for r in catalog.search("试验")] == ["GB/T 1346.1—2024"]
+
+        # 无代替标准号的行入库但不参与比对；替代链跨行解析
+        index = catalog.index()
+        assert "GB/T 1346.1—2024" not in index.codes
+        assert index.chains.successor["GB/T 1346—2001"] == "GB/T 1346—2024"
+
+
+def test_relisted_code_without_replaced_keeps_olds(tmp_path):
+    """后一期公告重复列出同一新号但未填“代替标准号”：保留已入库的旧号"""
+    first = pd.DataFrame({"code": ["GB 2—2020", "GB 3—2020"], "name": ["钢筋", "砂浆"],
+                          "replaced": ["GB 2—2010", "GB 3—2010"]})
+    second = pd.DataFrame({"code": ["GB 2—2020", "GB 3—2020"], "name": ["钢筋混凝土用钢", "砂浆"],
+                           "replaced": [None, "GB 3—2015"]})
+    company_df = pd.DataFrame({"code": ["GB 2-2010", "GB 3-2015"], "name": ["钢筋", "砂浆"]})
+    expected = comparer.compare(company_df, pd.concat([first, second], ignore_index=True))
+
+    for batches in ([first, second], [pd.concat([first, second], ignore_index=True)]):
+        with StandardCatalog(":memory:") as catalog:
+            for df in batches:
+                catalog.ingest(df)
+            assert [m.status for m in comparer.compare(company_df, catalog)] == ["OBSOLETE"] * 2
+            assert comparer.compare(company_df, catalog) == expected
+            rec = catalog.lookup("GB 2—2020")
+            assert rec["name"] == "钢筋混凝土用钢" and rec["replaced"] == ["GB 2—2010"]
+
+
+def test_duplicate_code_within_batch_merges_olds(tmp_path):
+    """同一期公告两行列出同一新号、代替不同旧号：两个旧号都指向该新号"""
+    gb_df = pd.DataFrame({"code": ["GB 5—2020", "GB 6—2020", "GB 5—2020"],
+                          "name": ["水泥", "石灰", "通用水泥"],
+                          "replaced": ["GB 5—2010", "GB 6—2010", "GB 5.1—2012"]})
+    company_df = pd.DataFrame({"code": ["GB 5-2010", "GB 5.1-2012"], "name": ["水泥", "水泥"]})
+    expected = comparer.compare(company_df, gb_df)
+    assert [m.status for m in expected] == ["OBSOLETE"] * 2
+
+    with StandardCatalog(tmp_path / "gb.db") as catalog:
+        assert catalog.ingest(gb_df) == 2
+        assert comparer.compare(company_df, catalog) == expected
+        rec = catalog.lookup("GB 5—2020")
+        assert rec["name"] == "通用水泥" and rec["replaced"] == ["GB 5—2010", "GB 5.1—2012"]
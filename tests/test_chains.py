@@ -0,0 +1,75 @@
+"""
+替代链：跨公告传递闭包、循环检测、比对与增量比对中的现行新号
+"""
+import pandas as pd
+
+from stdsync.core import comparer
+from stdsync.core.chains import ReplacementGraph
+from stdsync.core.incremental import compare_incremental
+
+
+def test_graph_resolves_transitively():
+    graph = ReplacementGraph({"A": "B", "B": "C", "C": "D", "X": "Y", "E": "C"})
+    assert graph.successor == {"A": "D", "B": "D", "C": "D", "E": "D", "X": "Y"}
+    assert graph.hops == {"A": 3, "B": 2, "C": 1, "E": 2, "X": 1}
+    assert graph.chain("A") == ["A", "B", "C", "D"] and graph.chain("D") == ["D"]
+    assert not graph.cyclic
+    assert graph.reason("X") == "精确命中旧号"
+    assert graph.reason("A") == "精确命中旧号；替代链：A → B → C → D"
+    assert "D" not in graph and len(graph) == 5
+
+
+def test_graph_detects_cycles():
+    graph = ReplacementGraph({"A": "B", "B": "C", "C": "B", "S": "S", "Z": "A", "P": "Q"})
+    assert graph.cyclic == {"A", "B", "C", "S", "Z"}
+    assert graph.successor["A"] == "B" and graph.successor["P"] == "Q"
+    assert graph.chain("Z") == ["Z", "A", "B", "C", "B"]
+    assert graph.reason("S") == "精确命中旧号；替代链存在循环，需人工核对：S → S"
+
+
+def test_graph_long_chain():
+    """长链只解析一次，不递归"""
+    n = 100_000
+    graph = ReplacementGraph({f"C{i}": f"C{i + 1}" for i in range(n)})
+    assert graph.successor["C0"] == f"C{n}" and graph.hops["C0"] == n
+    assert graph.hops[f"C{n - 1}"] == 1
+
+
+def _announcements():
+    """三期公告：A→B（2010）、B→C（2018），另有一对互相代替的录入错误"""
+    return pd.DataFrame({
+        "code": ["GB 1—2010", "GB 1—2018", "GB 7—2020", "GB 7—2021"],
+        "name": ["水泥", "水泥", "钢筋", "钢筋"],
+        "replaced": ["GB 1—2000", "GB 1—2010", "GB 7—2021", "GB 7—2020"],
+        "impl_date": ["2010-01-01", "2018-06-01", None, None],
+    })
+
+
+def test_compare_points_to_current_successor():
+    company_df = pd.DataFrame({"code": ["GB 1-2000", "GB 1-2010", "GB 7-2020"],
+                               "name": ["水泥", "水泥", "钢筋"]})
+    res = comparer.compare_table(company_df, _announcements())
+
+    assert [(m.status, m.gb_old_code, m.gb_new_code) for m in res] == [
+        ("OBSOLETE", "GB 1—2000", "GB 1—2018"),
+        ("OBSOLETE", "GB 1—2010", "GB 1—2018"),
+        ("OBSOLETE", "GB 7—2020", "GB 7—2021"),
+    ]
+    assert res[0].reason == "精确命中旧号；替代链：GB 1—2000 → GB 1—2010 → GB 1—2018"
+    assert res[1].reason == "精确命中旧号"
+    assert "循环" in res[2].reason
+    # 期限按现行新号的实施日期计算
+    assert res[0].days_to_replace == res[1].days_to_replace is not None
+
+
+def test_incremental_follows_new_links(tmp_path):
+    """新增公告代替了上次的现行新号：持有更早旧号的行也要重算"""
+    state = tmp_path / "state.json"
+    company_df = pd.DataFrame({"code": ["GB 1-2000", "GB 5-2000"], "name": ["水泥", "砂浆"]})
+    gb_df = _announcements().iloc[:1]
+    compare_incremental(company_df, gb_df, state)
+
+    gb_df = _announcements()
+    res, stats = compare_incremental(company_df, gb_df, state)
+    assert res == comparer.compare(company_df, gb_df)
+    assert res[0].gb_new_code == "GB 1—2018" and stats.rescanned == 1
@@ -0,0 +1,86 @@
+"""
+向量化清洗：与逐值 normalize_code / split_replaced 一致，日期解析，读取阶段产出派生列
+"""
+import datetime
+
+import pandas as pd
+
+from stdsync.core import clean, comparer, excel_io
+from stdsync.core.codes import normalize_code, split_replaced
+
+
+def test_code_norm_matches_normalize_code(random_codes, edge_cases):
+    values = [v for v in edge_cases if isinstance(v, str)] + random_codes(3000, seed=2)
+    out = clean.code_norm(pd.Series(values, index=range(5, 5 + len(values))))
+    assert clean.to_pylist(out) == [normalize_code(v) for v in values]
+    assert list(out.index) == list(range(5, 5 + len(values)))
+    assert clean.to_pylist(clean.code_norm(pd.Series([None, float("nan")], dtype=object))) == ["", ""]
+
+
+def test_replaced_list_matches_split_replaced(random_codes):
+    rng_codes = random_codes(1000, seed=3)
+    values = ["；".join(rng_codes[i:i + 3]) for i in range(0, 999, 3)]
+    values += ["GB 1-2000；GB 2–2001,", "ＧＢ　3－1999，", "", None, " A ; B "]
+    got = clean.to_pylist(clean.replaced_list(pd.Series(values, dtype=object)))
+    assert got == [None if v is None else split_replaced(v) for v in values]
+
+
+def test_parse_dates():
+    values = ["2024-01-05 00:00:00", "2024/1/5", "2024.01.05", "2024年1月5日", "20240105",
+              "45296", " 2024-1-5 ", "2023-02-30", "无", None, ""]
+    got = clean.to_dates(clean.parse_dates(pd.Series(values, dtype=object)))
+    day = datetime.date(2024, 1, 5)
+    assert got == [day] * 7 + [None] * 4
+
+
+def test_load_company_derived_columns(tmp_path):
+    """全角编号规范化后有效，不再被过滤；比对结果带实施日期"""
+    pd.DataFrame({
+        "标准编号": ["ＧＢ／Ｔ　１３４６－２０１１", "无效", None, " GB 2-2020"],
+        "标准名称": ["水泥", "x", "y", "钢筋"],
+        "实施日期": ["2012年3月1日", None, None, "2020-08-01"],
+    }).to_excel(tmp_path / "c.xlsx", index=False)
+
+    df = excel_io.load_company(tmp_path / "c.xlsx")
+    assert clean.to_pylist(df["code_norm"]) == ["GB/T 1346—2011", "GB 2—2020"]
+    assert df["code"].tolist() == ["ＧＢ／Ｔ　１３４６－２０１１", " GB 2-2020"]
+
+    gb_df = pd.DataFrame({"code": ["GB/T 1346—2024"], "name": ["水泥"],
+                          "replaced": ["GB/T 1346—2011；GB/T 1346—2001"]})
+    res = comparer.compare(df, gb_df)
+    assert [m.status for m in res] == ["OBSOLETE", "OK"]
+    assert [m.company.impl_date for m in res] == [datetime.date(2012, 3, 1),
+                                                  datetime.date(2020, 8, 1)]
+
+
+def test_concatenated_string_columns():
+    """pd.concat 拼接的字符串列转为 Arrow 后是分块数组，同样可以整列清洗"""
+    s = pd.concat([pd.Series(["GB 1-2000；GB 2-2000", None]), pd.Series([None, "GB 3-2000"])],
+                  ignore_index=True)
+    assert clean.to_pylist(clean.replaced_list(s)) == [["GB 1—2000", "GB 2—2000"], None, None,
+                                                       ["GB 3—2000"]]
+    assert clean.to_pylist(clean.code_norm(s))[3] == "GB 3—2000"
+
+
+def test_load_company_keeps_merged_code_rows(tmp_path):
+    """编号单元格合并（一个标准多个部门持有）的行沿用上一行编号；整行空白的行去掉"""
+    import openpyxl
+
+    path = tmp_path / "c.xlsx"
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["标准编号", "标准名称", "持有部门"])
+    ws.append(["GB/T 1346-2011", "水泥", "质量部"])
+    ws.append([None, None, "技术部"])
+    ws.append([None, None, "生产部"])
+    ws.append([None, None, None])
+    ws.append(["GB 2-2020", "钢筋", "质量部"])
+    ws.merge_cells("A2:A4")
+    ws.merge_cells("B2:B4")
+    wb.save(path)
+
+    df = excel_io.load_company(path)
+    assert clean.to_pylist(df["code_norm"]) == ["GB/T 1346—2011"] * 3 + ["GB 2—2020"]
+    assert df["code"].tolist() == ["GB/T 1346-2011"] * 3 + ["GB 2-2020"]
+    assert df["name"].tolist() == ["水泥"] * 3 + ["钢筋"]
+    assert df["dept"].tolist() == ["质量部", "技术部", "生产部", "质量部"]
@@ -0,0 +1,37 @@
+"""
+normalize_code 缓存 / ASCII 快路径与原实现逐字节一致
+"""
+import re
+import unicodedata
+
+import pandas as pd
+
+from stdsync.core.codes import normalize_code, normalize_codes
+
+
+def _reference(code):
+    """改造前的实现"""
+    if code is None:
+        return ""
+    code = unicodedata.normalize("NFKC", str(code))
+    code = re.sub(r"[-–]", "—", code)
+    return code.strip()
+
+
+def test_normalize_code_matches_reference(random_codes, edge_cases):
+    values = edge_cases + random_codes(5000)
+    for v in values + values:                       # 第二轮走缓存
+        assert normalize_code(v).encode("utf-8") == _reference(v).encode("utf-8"), repr(v)
+
+
+def test_normalize_codes_matches_scalar(random_codes, edge_cases):
+    values = edge_cases + random_codes(2000, seed=1)
+    expected = [_reference(v) for v in values]
+
+    out = normalize_codes(pd.Series(values, dtype=object, index=range(10, 10 + len(values))))
+    assert out.tolist() == expected
+    assert list(out.index) == list(range(10, 10 + len(values)))
+
+    strs = [v for v in values if isinstance(v, str)]
+    assert normalize_codes(pd.Series(strs, dtype="str")).tolist() == [_reference(v) for v in strs]
+    assert normalize_codes([]).tolist() == []
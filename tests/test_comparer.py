@@ -3,6 +3,7 @@ comparer 模块单元测试
 """
 from stdsync.core import comparer
 import pandas as pd
+import pytest
 
 
 def test_compare_obsolete():
@@ -30,4 +31,79 @@ def test_compare_all_ok():
     gb_df = pd.DataFrame({"code": ["GB/T 1346—2024"], "name": ["水泥测试方法"], "replaced": [None]})
 
     res = comparer.compare(company_df, gb_df)
-    assert res[0].status == "OK"
\ No newline at end of file
+    assert res[0].status == "OK"
+
+@pytest.mark.parametrize("engine", ["blocked", "cdist"])
+def test_compare_engine_matches_brute(engine, random_frames):
+    """候选索引剪枝 / 矩阵批量打分的结果应与逐行暴力扫描完全一致"""
+    company_df, gb_df = random_frames(seed=7, n_company=300, n_gb=200)
+
+    fast = comparer.compare(company_df, gb_df, engine=engine)
+    brute = comparer.compare(company_df, gb_df, engine="brute")
+
+    assert fast == brute
+    assert any(r.status == "REVIEW" for r in brute)
+
+
+def test_compare_reuses_announcement_index(random_frames):
+    """同一 AnnouncementIndex 可对多份公司清单重复比对，结果与直接传 DataFrame 一致"""
+    from stdsync.core.index import AnnouncementIndex
+
+    _, gb_df = random_frames(seed=11, n_company=0, n_gb=100)
+    index = AnnouncementIndex.from_frame(gb_df)
+
+    for seed in (1, 2, 3):
+        company_df, _ = random_frames(seed=seed, n_company=80, n_gb=0)
+        assert comparer.compare(company_df, index) == comparer.compare(company_df, gb_df)
+
+
+@pytest.mark.parametrize("engine", ["blocked", "cdist"])
+def test_compare_parallel_preserves_order(engine, random_frames):
+    """多进程分片比对的结果与单进程完全一致（含顺序）"""
+    company_df, gb_df = random_frames(seed=13, n_company=200, n_gb=120)
+
+    parallel = comparer.compare(company_df, gb_df, engine=engine, workers=3)
+    assert parallel == comparer.compare(company_df, gb_df, engine=engine)
+
+
+def _reference_top_k(company_df, gb_df, k):
+    """全量打分后排序截取，作为 top-K 堆的对照"""
+    from rapidfuzz import fuzz
+    from stdsync.core.index import AnnouncementIndex
+
+    index = AnnouncementIndex.from_frame(gb_df)
+    out = []
+    for code, name in zip(company_df["code"], company_df["name"]):
+        code = comparer.normalize_code(code)
+        rows = []
+        for i, olds in enumerate(index.olds):
+            code_score = max(fuzz.ratio(code, old) for old in olds)
+            name_score = fuzz.token_set_ratio(str(name), index.names[i])
+            if 85 <= code_score < 100 and name_score >= 85:
+                rows.append(((code_score + name_score) / 2, -i, code_score, name_score))
+        rows.sort(reverse=True)
+        out.append([(index.codes[-i], c, n) for _, i, c, n in rows[:k]])
+    return out
+
+
+@pytest.mark.parametrize("engine", ["blocked", "cdist", "brute"])
+def test_compare_top_k_candidates(engine, random_frames):
+    """top-K 候选与全量排序一致，首位即 REVIEW 命中行；其余字段不受影响"""
+    company_df, gb_df = random_frames(seed=17, n_company=300, n_gb=200)
+
+    plain = comparer.compare(company_df, gb_df, engine=engine)
+    top = comparer.compare(company_df, gb_df, engine=engine, top_k=3)
+    expected = _reference_top_k(company_df, gb_df, 3)
+
+    assert any(r.status == "REVIEW" and len(r.candidates) == 3 for r in top)
+    for p, t, exp in zip(plain, top, expected):
+        assert (p.status, p.gb_new_code, p.similarity, p.reason) == \
+               (t.status, t.gb_new_code, t.similarity, t.reason)
+        if t.status != "REVIEW":
+            assert t.candidates is None
+            continue
+        assert [(c.gb_new_code, c.code_score, c.name_score) for c in t.candidates] == exp
+        assert t.candidates[0].gb_new_code == t.gb_new_code
+        assert int(t.candidates[0].score) == t.similarity
+
+    assert comparer.compare(company_df, gb_df, engine=engine, top_k=3, workers=2) == top
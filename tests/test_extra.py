@@ -4,6 +4,8 @@
 2. 破折号标准化 → OBSOLETE
 3. 自动定位表头（装饰行在最前）
 """
+from pathlib import Path
+
 import pandas as pd
 from stdsync.core import comparer, excel_io
 
@@ -78,4 +80,83 @@ def test_compare_new_standard_ok():
         # 'replaced' 缺省 / None
     })
     res = comparer.compare(company_df, gb_df)
-    assert res[0].status == "OK"
\ No newline at end of file
+    assert res[0].status == "OK"
+
+# ------------------------------------------------------------------
+# 4) 单次流式读取：结果应与 read_excel(header=表头行) 完全一致
+# ------------------------------------------------------------------
+def test_excel_io_single_pass_matches_read_excel(tmp_path):
+    import datetime
+    import openpyxl
+
+    xls_path = tmp_path / "tricky_company.xlsx"
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["部门在用标准清单（9个部门）", None, None, None, None, None, "说明"])
+    ws.append([])
+    ws.append(["标准编号", "标准名称", None, "实施日期", "标准名称", "序号"])
+    ws.append(["GB/T 1346—2011", None, None, datetime.datetime(2025, 1, 1), 3.0, 1])
+    ws.append([])
+    ws.append([12345, "测试", None, None, 2.5])
+    ws.append([None, None])
+    wb.save(xls_path)
+
+    seen = []
+    got = excel_io._read_company_sheet(xls_path, progress=seen.append)
+    expected = pd.read_excel(xls_path, header=2, dtype=str)
+
+    pd.testing.assert_frame_equal(got, expected)
+    assert seen[-1] == 7
+
+
+# ------------------------------------------------------------------
+# 5) 批量读取：目录 + 全部工作表，按来源标注并按顺序拼接
+# ------------------------------------------------------------------
+def test_excel_io_batch_all_sheets(tmp_path):
+    src = tmp_path / "depts"
+    src.mkdir()
+    for i, depts in enumerate([("质量部", "技术部"), ("生产部",)]):
+        with pd.ExcelWriter(src / f"register_{i}.xlsx") as writer:
+            for dept in depts:
+                pd.DataFrame(
+                    {"标准编号": [f"Q/FCIC {dept}—2024"], "标准名称": ["测试标准"]}
+                ).to_excel(writer, sheet_name=dept, index=False)
+
+    df = excel_io.load_company_batch(src, sheet_name=None, workers=2)
+
+    assert df["source_sheet"].tolist() == ["质量部", "技术部", "生产部"]
+    assert df["code"].tolist() == [f"Q/FCIC {d}—2024" for d in ("质量部", "技术部", "生产部")]
+    assert {Path(p).name for p in df["source_file"]} == {"register_0.xlsx", "register_1.xlsx"}
+
+
+# ------------------------------------------------------------------
+# 6) 列式输入：CSV（UTF-8 BOM / GBK）、Parquet 与 Excel 读取结果一致
+# ------------------------------------------------------------------
+def test_excel_io_table_formats_match_excel(tmp_path):
+    gb_src = pd.DataFrame({
+        "国家标准编号": ["GB/T 1—2020", "GB/T 2—2021", "GB 3—2022"],
+        "国 家 标 准 名 称": ["水泥, 通用", "钢筋", "混凝土\"试验\""],
+        "代替标准号": ["GB/T 1—2010；GB/T 1—2000", None, "GB 3—2012"],
+        "实施日期": ["2021-01-01", None, "2023-01-01"],
+    })
+    gb_src.to_excel(tmp_path / "gb.xlsx", index=False)
+    gb_src.to_csv(tmp_path / "gb.csv", index=False, encoding="utf-8-sig")
+    gb_src.to_csv(tmp_path / "gb_gbk.csv", index=False, encoding="gbk")
+    gb_src.to_parquet(tmp_path / "gb.parquet", index=False)
+
+    expected = excel_io.load_gb(tmp_path / "gb.xlsx")
+    for name in ("gb.csv", "gb_gbk.csv", "gb.parquet"):
+        got = excel_io.load_gb(tmp_path / name)
+        pd.testing.assert_frame_equal(got, expected, check_dtype=False)
+
+    company_src = pd.DataFrame({"标准编号": ["GB/T 1—2010", "无效", "Q/FCIC 9—2024"],
+                                "标准名称": ["水泥", "x", None], "持有部门": ["质量部", "", "技术部"]})
+    company_src.to_excel(tmp_path / "c.xlsx", index=False)
+    company_src.to_csv(tmp_path / "c.csv", index=False)
+    got = excel_io.load_company(tmp_path / "c.csv")
+    pd.testing.assert_frame_equal(got, excel_io.load_company(tmp_path / "c.xlsx"),
+                                  check_dtype=False)
+    assert comparer.compare(got, excel_io.load_gb(tmp_path / "gb.csv"))[0].status == "OBSOLETE"
+
+    batch = excel_io.load_gb_batch([tmp_path / "gb.csv", tmp_path / "gb.parquet"], workers=1)
+    assert batch["source_sheet"].tolist() == [""] * 6
@@ -0,0 +1,68 @@
+"""
+增量比对单元测试
+"""
+import pandas as pd
+
+from stdsync.core import comparer
+from stdsync.core.incremental import compare_incremental
+
+
+def test_incremental_matches_full_run(tmp_path, random_frames):
+    """增删改公司行与公告行后，增量结果应与完整运行一致，且只重算少量行"""
+    state = tmp_path / "state.json"
+    company_df, gb_df = random_frames(seed=5, n_company=200, n_gb=150)
+
+    res, stats = compare_incremental(company_df, gb_df, state)
+    assert stats.full_run and stats.rescanned == 200
+    assert res == comparer.compare(company_df, gb_df)
+
+    # 第二次运行：输入不变 → 全部沿用
+    res, stats = compare_incremental(company_df, gb_df, state)
+    assert not stats.full_run and stats.rescanned == 0
+    assert res == comparer.compare(company_df, gb_df)
+
+    # 公司清单改一行、加一行；公告删一行、末尾加一行（替代某家公司在用的标准）
+    company_df.loc[3, "name"] = "全新名称"
+    company_df = pd.concat(
+        [company_df, pd.DataFrame({"code": ["GB/T 9999—2001"], "name": ["水泥"]})],
+        ignore_index=True,
+    )
+    gb_df = pd.concat(
+        [gb_df.drop(index=10),
+         pd.DataFrame({"code": ["GB/T 9999—2024"], "name": ["水泥"],
+                       "replaced": [company_df.loc[0, "code"]]})],
+        ignore_index=True,
+    )
+
+    res, stats = compare_incremental(company_df, gb_df, state)
+    assert res == comparer.compare(company_df, gb_df)
+    assert not stats.full_run and 2 <= stats.rescanned < len(company_df)
+
+
+def test_incremental_reordered_announcement_runs_full(tmp_path, random_frames):
+    """公告行顺序变化时退回完整运行"""
+    state = tmp_path / "state.json"
+    company_df, gb_df = random_frames(seed=6, n_company=50, n_gb=40)
+    compare_incremental(company_df, gb_df, state)
+
+    reordered = gb_df.iloc[::-1].reset_index(drop=True)
+    res, stats = compare_incremental(company_df, reordered, state)
+    assert stats.full_run
+    assert res == comparer.compare(company_df, reordered)
+
+
+def test_incremental_removed_candidate_rescans(tmp_path):
+    """top-K 模式下删除的公告行只是第 2 名候选，也要重算该行"""
+    state = tmp_path / "state.json"
+    company_df = pd.DataFrame({"code": ["GB/T 1346-2010"], "name": ["水泥"]})
+    gb_df = pd.DataFrame({"code": ["GB/T 1346—2011", "GB/T 1346—2012"],
+                          "name": ["水泥", "水泥"],
+                          "replaced": ["GB/T 1346—2009", "GB/T 1346—2008"]})
+    res, _ = compare_incremental(company_df, gb_df, state, top_k=3)
+    assert [c.gb_new_code for c in res[0].candidates] == ["GB/T 1346—2011", "GB/T 1346—2012"]
+
+    gb_df = gb_df.iloc[:1]
+    res, stats = compare_incremental(company_df, gb_df, state, top_k=3)
+    assert stats.rescanned == 1
+    assert res == comparer.compare(company_df, gb_df, top_k=3)
+    assert [c.gb_new_code for c in res[0].candidates] == ["GB/T 1346—2011"]
@@ -0,0 +1,31 @@
+"""
+分阶段计时与计数单元测试
+"""
+from stdsync.core import comparer, instrument
+from stdsync.core.instrument import Profiler, profiling, stage
+
+
+def test_profiler_collects_stages_and_counters(random_frames):
+    company_df, gb_df = random_frames(seed=4, n_company=60, n_gb=40)
+    prof = Profiler()
+    with profiling(prof):
+        with stage("compare"):
+            comparer.compare(company_df, gb_df)
+        with stage("compare"):
+            comparer.compare(company_df, gb_df, engine="cdist")
+
+    assert prof.calls["compare"] == 2 and prof.timings["compare"] > 0
+    assert prof.counters["rows_compared"] == 120
+    assert prof.counters["pairs_scored"] > 0
+    assert "compare" in prof.summary()
+    assert prof.to_dict()["stages"][0]["stage"] == "compare"
+
+
+def test_profiling_disabled_is_noop():
+    """未启用时 stage / count 不记录任何数据"""
+    prof = Profiler()
+    with stage("idle"):
+        instrument.count("rows_loaded", 5)
+    with profiling(prof):
+        pass
+    assert prof.timings == {} and not prof.counters
@@ -0,0 +1,73 @@
+"""
+PipelineJob：事件流、输出文件与协作式取消
+"""
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from benchmarks import synth
+from stdsync.core import job as job_mod
+from stdsync.core.job import PipelineJob
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    gb_df = synth.make_gb(200, seed=1)
+    company_df = synth.make_company(400, gb_df, seed=2)
+    return (synth.write_company_xlsx(company_df, tmp_path / "company.xlsx"),
+            synth.write_gb_xlsx(gb_df, tmp_path / "gb.xlsx"))
+
+
+def _drain(q):
+    events = []
+    while not q.empty():
+        events.append(q.get_nowait())
+    return events
+
+
+def test_job_runs_in_executor(inputs, tmp_path, monkeypatch):
+    monkeypatch.setattr(job_mod, "PROGRESS_INTERVAL", 0)
+    job = PipelineJob(*inputs, tmp_path / "out")
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        result = job.submit(pool).result()
+
+    events = _drain(job.events)
+    kinds = [e.kind for e in events]
+    assert kinds[0] == "stage" and kinds[-1] == "done"
+    assert kinds.index("computed") < kinds.index("done")
+    assert [e.stage for e in events if e.kind == "stage"] == ["load", "compare", "write"]
+
+    last = [e for e in events if e.kind == "progress" and e.stage == "compare"][-1]
+    assert last.done == last.total == sum(result.counts.values())
+    assert last.rate > 0 and last.eta == 0
+    assert result.out_path.exists() and result.doc_path.exists()
+    assert "compare" in result.profile
+
+
+def test_job_cancel_before_start(inputs, tmp_path):
+    job = PipelineJob(*inputs, tmp_path / "out")
+    job.cancel()
+    assert job.run() is None
+    assert [e.kind for e in _drain(job.events)] == ["cancelled"]
+    assert not (tmp_path / "out").exists()
+
+
+def test_job_cancel_during_compare(inputs, tmp_path, monkeypatch):
+    """首个比对进度事件到达时取消，任务在下一检查点结束且不写出文件"""
+    monkeypatch.setattr(job_mod, "PROGRESS_INTERVAL", 0)
+
+    class CancelOnCompare(queue.Queue):
+        def put(self, ev, *args, **kwargs):
+            super().put(ev, *args, **kwargs)
+            if ev.kind == "progress" and ev.stage == "compare":
+                job.cancel()
+
+    job = PipelineJob(*inputs, tmp_path / "out", events=CancelOnCompare())
+    assert job.run() is None
+
+    events = _drain(job.events)
+    assert events[-1].kind == "cancelled"
+    assert "computed" not in [e.kind for e in events]
+    assert sum(e.kind == "progress" and e.stage == "compare" for e in events) == 1
+    assert not (tmp_path / "out").exists()
@@ -0,0 +1,87 @@
+"""
+lifecycle：剩余天数整列计算、到期筛选与排序
+"""
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stdsync.core import comparer, lifecycle, reporter
+from stdsync.core.index import AnnouncementIndex
+from stdsync.core.results import ResultTable
+
+AS_OF = datetime.date(2025, 1, 1)
+
+
+@pytest.fixture
+def frames():
+    gb_df = pd.DataFrame({
+        "code": ["GB 1—2024", "GB 2—2025", "GB 3—2026", "GB 1—2024"],
+        "name": ["水泥", "钢筋", "混凝土", "水泥"],
+        "replaced": ["GB 1—2000", "GB 2—2000", "GB 3—2000", "GB 1—2001"],
+        "impl_date": ["2024-01-01", "2025年6月1日", None, "2024-03-01"],   # 同一新号以后出现者为准
+    })
+    company_df = pd.DataFrame({
+        "code": ["GB 3-2000", "GB 2-2000", "GB 1-2000", "Q/X 1—2020", "GB 2—2001"],
+        "name": ["混凝土", "钢筋", "水泥", "其他", "钢筋"],
+        "impl_date": ["2000-01-01", None, "2001-05-01", None, None],
+    })
+    return company_df, gb_df
+
+
+def test_compare_table_fills_days(frames):
+    company_df, gb_df = frames
+    table = comparer.compare_table(company_df, gb_df, as_of=AS_OF)
+
+    assert [m.status for m in table] == ["OBSOLETE", "OBSOLETE", "OBSOLETE", "OK", "REVIEW"]
+    assert [m.days_to_replace for m in table] == [None, 151, -306, None, 151]
+    assert table[0].company.impl_date == datetime.date(2000, 1, 1)
+
+    row = next(reporter._report_rows(table))[0]
+    assert len(row) == len(reporter.HEADERS) and row[-1] is None
+
+
+def test_due_within_filters_and_sorts(frames):
+    company_df, gb_df = frames
+    table = comparer.compare_table(company_df, gb_df, as_of=AS_OF)
+
+    due = lifecycle.due_within(table, 200)
+    assert [(m.company.code, m.days_to_replace) for m in due] == [
+        ("GB 1—2000", -306), ("GB 2—2000", 151), ("GB 2—2001", 151)]
+    assert len(lifecycle.due_within(table, 0)) == 1
+    assert [m.days_to_replace for m in lifecycle.sort_by_due(table)][-2:] == [None, None]
+    with pytest.raises(ValueError):
+        lifecycle.due_within(table, -1)
+
+
+def test_annotate_large_table():
+    """10 万行结果整列计算，与逐行 date 运算一致"""
+    n = 100_000
+    rng = np.random.default_rng(0)
+    codes = [f"GB {i}—2024" for i in range(1000)]
+    dates = np.datetime64("2024-01-01") + rng.integers(0, 1000, len(codes))
+    index = AnnouncementIndex(codes, ["x"] * len(codes), [[f"GB {i}—2000"] for i in range(1000)],
+                              dates)
+    picks = rng.integers(0, len(codes), n)
+    statuses = rng.choice(np.array(["OBSOLETE", "REVIEW", "OK"]), n)
+    table = ResultTable({
+        **{c: np.full(n, None, dtype=object) for c in ("dept", "code", "name", "impl_date",
+                                                       "gb_old_code", "reason")},
+        "gb_new_code": np.array([codes[p] if s != "OK" else None
+                                 for p, s in zip(picks, statuses)], dtype=object),
+        "similarity": np.full(n, np.nan),
+        "days_to_replace": np.full(n, np.nan),
+        "status": np.array([{"OBSOLETE": 0, "REVIEW": 1, "OK": 2}[s] for s in statuses],
+                           dtype=np.int8),
+        "candidates": np.full(n, None, dtype=object),
+    })
+
+    days = lifecycle.annotate(table, index, AS_OF).columns["days_to_replace"]
+    expected = [(dates[p].astype(datetime.date) - AS_OF).days if s != "OK" else None
+                for p, s in zip(picks, statuses)]
+    assert [None if d != d else int(d) for d in days] == expected
+
+    due = lifecycle.due_within(lifecycle.annotate(table, index, AS_OF), 30)
+    left = due.columns["days_to_replace"]
+    assert len(due) and (np.diff(left) >= 0).all() and (left <= 30).all()
@@ -0,0 +1,61 @@
+"""
+outputs：多种输出并行写出、原子改名
+"""
+import csv
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from stdsync.core import comparer, outputs
+
+
+@pytest.fixture
+def table(random_frames):
+    company_df, gb_df = random_frames(seed=5, n_company=150, n_gb=100)
+    return comparer.compare_table(company_df, gb_df), gb_df
+
+
+def test_write_outputs_parallel(table, tmp_path):
+    results, gb_df = table
+    gb_path = tmp_path / "gb.xlsx"
+    gb_df.to_excel(gb_path, index=False)
+
+    paths = outputs.write_outputs(results, tmp_path / "out", outputs.OUTPUTS,
+                                  gb_path=gb_path, stamp="t", workers=2)
+
+    assert list(paths) == list(outputs.OUTPUTS)
+    assert all(p.exists() for p in paths.values())
+    assert not list(tmp_path.rglob("*.tmp"))
+    assert paths["trace"] == tmp_path / "gb_trace.xlsx"
+
+    ws = openpyxl.load_workbook(paths["xlsx"]).active
+    assert ws.max_row == len(results) + 1
+    with open(paths["csv"], encoding="utf-8-sig", newline="") as f:
+        rows = list(csv.reader(f))
+    assert len(rows) == len(results) + 1
+    assert [r[1] for r in rows[1:]] == list(results.columns["code"])
+    assert pd.read_parquet(paths["parquet"])["status"].tolist() == \
+           [m.status for m in results]
+    assert pd.read_feather(paths["arrow"])["code"].tolist() == list(results.columns["code"])
+
+
+def test_write_outputs_failure_leaves_no_file(table, tmp_path, monkeypatch):
+    results, _ = table
+
+    def boom(res, path, gb_path):
+        path.write_text("partial")
+        raise RuntimeError("disk full")
+
+    monkeypatch.setitem(outputs.WRITERS, "csv", boom)
+    with pytest.raises(RuntimeError):
+        outputs.write_outputs(results, tmp_path, ["csv"], stamp="t", workers=1)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_write_outputs_validates(table, tmp_path):
+    results, _ = table
+    with pytest.raises(ValueError):
+        outputs.write_outputs(results, tmp_path, ["pdf"])
+    with pytest.raises(ValueError):
+        outputs.write_outputs(results, tmp_path, ["trace"])
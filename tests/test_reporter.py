@@ -0,0 +1,103 @@
+"""
+reporter 模块单元测试
+"""
+import openpyxl
+import pytest
+
+from stdsync.core import comparer, excel_io, reporter
+
+
+def test_render_streams_generator(tmp_path, random_frames):
+    """render 可直接消费 iter_compare 生成器，行数与条件格式范围正确"""
+    company_df, gb_df = random_frames(seed=3, n_company=120, n_gb=80)
+    out = reporter.render(comparer.iter_compare(company_df, gb_df), tmp_path / "diff.xlsx")
+
+    ws = openpyxl.load_workbook(out).active
+    assert ws.max_row == 121
+    assert [c.value for c in ws[1]] == reporter.HEADERS
+    assert {str(cf.sqref) for cf in ws.conditional_formatting} == {"G2:G121"}
+
+
+def test_render_candidate_sheet(tmp_path, random_frames):
+    """top-K 结果额外写出“待复核候选”表，每个候选一行"""
+    company_df, gb_df = random_frames(seed=17, n_company=120, n_gb=80)
+    table = comparer.compare_table(company_df, gb_df, top_k=3)
+    out = reporter.render(table, tmp_path / "diff.xlsx")
+
+    wb = openpyxl.load_workbook(out)
+    assert wb.sheetnames == ["差异表", "待复核候选"]
+    ws = wb["待复核候选"]
+    assert [c.value for c in ws[1]] == reporter.CANDIDATE_HEADERS
+    n_cands = sum(len(c) for c in table.columns["candidates"] if c)
+    assert n_cands > 0 and ws.max_row == n_cands + 1
+
+    plain = reporter.render(comparer.compare_table(company_df, gb_df), tmp_path / "plain.xlsx")
+    assert openpyxl.load_workbook(plain).sheetnames == ["差异表"]
+
+
+def test_append_trace_streams_and_detects_code_column(tmp_path):
+    """按表头定位编号列，逐行写出状态；非活动工作表原样复制"""
+    from datetime import datetime
+
+    import pandas as pd
+
+    gb_path = tmp_path / "gb.xlsx"
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "公告"
+    ws.append(["序号", "国家标准编号", "国 家 标 准 名 称", "代替标准号", "实施日期"])
+    ws.append([1, "GB/T 1-2020", "水泥", "GB/T 1-2010", datetime(2021, 1, 1)])
+    ws.append([2, "GB/T 2—2020", "钢筋", None, datetime(2021, 6, 1)])
+    ws.append([3, None, "空编号", None, None])
+    ws.append([4, "=GB 3", "公式样文本", None, None])
+    ws["B5"].data_type = "s"                      # 文本，不是公式
+    wb.create_sheet("说明").append(["备注", "原样保留"])
+    wb.save(gb_path)
+
+    company_df = pd.DataFrame({"code": ["GB/T 1—2020", "GB/T 1—2010"], "name": ["水泥", "水泥"]})
+    gb_df = pd.DataFrame({"code": ["GB/T 1—2020"], "name": ["水泥"], "replaced": ["GB/T 1—2010"]})
+    results = comparer.compare_table(company_df, gb_df)
+
+    out = reporter.append_trace(gb_path, results)
+    assert out == tmp_path / "gb_trace.xlsx"
+
+    wb = openpyxl.load_workbook(out)
+    assert wb.sheetnames == ["公告", "说明"]
+    rows = list(wb["公告"].iter_rows(values_only=True))
+    assert rows[0][-1] == "匹配状态"
+    assert [r[-1] for r in rows[1:]] == ["待复核", "未使用", "未使用", "未使用"]
+    assert rows[1][4] == datetime(2021, 1, 1)
+    assert rows[4][1] == "=GB 3"
+    assert list(wb["说明"].iter_rows(values_only=True)) == [("备注", "原样保留")]
+
+    # MatchResult 列表与 ResultTable 输出一致
+    again = reporter.append_trace(gb_path, list(results), tmp_path / "again.xlsx")
+    assert list(openpyxl.load_workbook(again)["公告"].iter_rows(values_only=True)) == rows
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet", ".arrow"])
+def test_append_trace_table_files(tmp_path, suffix):
+    """列式公告写回同一格式，末尾追加状态列"""
+    import pandas as pd
+
+    gb_df = pd.DataFrame({"序号": ["1", "2", "3"],
+                          "国家标准编号": ["GB/T 1-2020", "GB/T 2—2020", None],
+                          "代替标准号": ["GB/T 1-2010", None, None]})
+    gb_path = tmp_path / f"gb{suffix}"
+    if suffix == ".csv":
+        gb_df.to_csv(gb_path, index=False)
+    elif suffix == ".parquet":
+        gb_df.to_parquet(gb_path)
+    else:
+        gb_df.to_feather(gb_path)
+
+    company_df = pd.DataFrame({"code": ["GB/T 1—2020"], "name": ["水泥"]})
+    results = comparer.compare_table(company_df, pd.DataFrame({
+        "code": ["GB/T 9—2020"], "name": ["x"], "replaced": ["GB/T 9—2010"]}))
+
+    # 写出阶段先写临时文件再改名：格式按公告扩展名确定
+    out = reporter.append_trace(gb_path, results, tmp_path / "trace.tmp")
+    back = excel_io.read_table(out.replace(tmp_path / f"trace{suffix}"))
+    assert list(back.columns) == ["序号", "国家标准编号", "代替标准号", "匹配状态"]
+    assert back["匹配状态"].tolist() == ["OK", "未使用", "未使用"]
+    assert back["序号"].tolist() == ["1", "2", "3"]
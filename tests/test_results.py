@@ -0,0 +1,31 @@
+"""
+列式结果容器单元测试
+"""
+from stdsync.core import comparer
+from stdsync.core.results import ResultTable
+
+
+def test_result_table_roundtrip_and_counts(random_frames):
+    """ResultTable 按行访问与 compare 结果一致，计数 / 筛选为向量化结果"""
+    company_df, gb_df = random_frames(seed=9, n_company=150, n_gb=100)
+    rows = comparer.compare(company_df, gb_df)
+    table = comparer.compare_table(company_df, gb_df)
+
+    assert len(table) == len(rows)
+    assert list(table) == rows
+    assert table[-1] == rows[-1]
+
+    counts = table.counts()
+    for status in ("OBSOLETE", "REVIEW", "OK"):
+        assert counts[status] == sum(r.status == status for r in rows)
+    assert list(table.filter("OBSOLETE")) == [r for r in rows if r.status == "OBSOLETE"]
+
+    arrow = table.to_arrow()
+    assert arrow.num_rows == len(rows)
+    assert arrow.column("status").to_pylist() == [r.status for r in rows]
+
+
+def test_result_table_empty():
+    table = ResultTable.from_results([])
+    assert len(table) == 0 and list(table) == []
+    assert table.counts() == {"OBSOLETE": 0, "REVIEW": 0, "OK": 0, "UNUSED": 0}
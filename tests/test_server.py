@@ -0,0 +1,162 @@
+"""
+本地比对服务：索引 LRU、HTTP 接口与并发请求
+"""
+import http.client
+import json
+import socket
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+import pytest
+
+from stdsync import server as server_mod
+from stdsync.core import comparer, excel_io
+from stdsync.server import CompareService, make_server
+
+
+def _write_gb(gb_df, path):
+    gb_df.rename(columns={"code": "国家标准编号", "name": "国 家 标 准 名 称",
+                          "replaced": "代替标准号"}).to_csv(path, index=False)
+    return path
+
+
+def _company_csv(company_df) -> bytes:
+    return company_df.rename(columns={"code": "标准编号", "name": "标准名称"}) \
+        .to_csv(index=False).encode("utf-8")
+
+
+def _write_company(company_df, tmp_path):
+    path = tmp_path / "company.csv"
+    path.write_bytes(_company_csv(company_df))
+    return path
+
+
+def test_service_index_lru(tmp_path, random_frames):
+    service = CompareService(max_indexes=2)
+    paths = []
+    for i in range(3):
+        _, gb_df = random_frames(seed=i, n_company=0, n_gb=20)
+        paths.append(_write_gb(gb_df, tmp_path / f"gb{i}.csv"))
+
+    first = service.index(paths[0])
+    assert service.index(paths[0]) is first
+    service.index(paths[1])
+    service.index(paths[2])                       # 淘汰最久未用的 gb0
+    assert [p.rsplit("/", 1)[-1] for p in service.loaded()] == ["gb1.csv", "gb2.csv"]
+    assert (service.hits, service.misses) == (1, 3)
+
+    before = len(service.index(paths[1]))
+    paths[1].write_text(paths[1].read_text("utf-8") + "GB 9—2024,新增,GB 9—2014\n", "utf-8")
+    assert len(service.index(paths[1])) == before + 1   # 文件变化后重建，旧版本被替换
+    assert len(service.loaded()) == 2
+
+
+def test_service_compare_sharded(tmp_path, random_frames, monkeypatch):
+    """compare_workers > 1 时比对分片到进程池，结果与单进程一致"""
+    monkeypatch.setattr(server_mod, "SHARD_MIN_ROWS", 0)
+    company_df, gb_df = random_frames(seed=22, n_company=200, n_gb=80)
+    gb_path = _write_gb(gb_df, tmp_path / "gb.csv")
+    service = CompareService(compare_workers=2)
+
+    single = service.compare(_company_csv(company_df), "c.csv", gb_path, top_k=3, workers=1)
+    sharded = service.compare(_company_csv(company_df), "c.csv", gb_path, top_k=3)
+    assert list(sharded) == list(single)
+    with pytest.raises(ValueError):
+        service.compare(_company_csv(company_df), "c.csv", gb_path, workers=0)
+
+
+def test_service_small_upload_not_sharded(tmp_path, random_frames, monkeypatch):
+    """默认不分片；小清单即使 compare_workers > 1 也不建进程池"""
+    assert CompareService().compare_workers == 1
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("小清单不应建进程池")
+    monkeypatch.setattr(comparer, "ProcessPoolExecutor", no_pool)
+    company_df, gb_df = random_frames(seed=24, n_company=200, n_gb=80)
+    gb_path = _write_gb(gb_df, tmp_path / "gb.csv")
+    table = CompareService(compare_workers=4).compare(_company_csv(company_df), "c.csv", gb_path)
+    assert len(table) == len(company_df)
+
+
+@pytest.fixture
+def server():
+    srv = make_server(port=0, workers=4)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _post(srv, query, body):
+    url = f"http://127.0.0.1:{srv.server_address[1]}/compare?{query}"
+    with urllib.request.urlopen(urllib.request.Request(url, data=body, method="POST")) as resp:
+        return resp.headers["Content-Type"], resp.read()
+
+
+def test_server_compare(server, tmp_path, random_frames):
+    company_df, gb_df = random_frames(seed=21, n_company=120, n_gb=80)
+    gb_path = _write_gb(gb_df, tmp_path / "gb.csv")
+    body = _company_csv(company_df)
+    query = f"gb={quote(str(gb_path))}&filename=company.csv"
+
+    expected = comparer.compare(excel_io.load_company(_write_company(company_df, tmp_path)),
+                                excel_io.load_gb(gb_path))
+    with ThreadPoolExecutor(max_workers=4) as pool:         # 并发请求共享同一索引
+        replies = list(pool.map(lambda _: _post(server, query, body), range(4)))
+
+    for ctype, data in replies:
+        assert ctype.startswith("application/json")
+        payload = json.loads(data)
+        assert [r["status"] for r in payload["results"]] == [m.status for m in expected]
+        assert [r["gb_new_code"] for r in payload["results"]] == [m.gb_new_code for m in expected]
+    assert server.service.misses == 1 and server.service.hits == 3
+
+    ctype, data = _post(server, query + "&format=xlsx", body)
+    assert ctype.startswith("application/vnd.openxmlformats") and data[:2] == b"PK"
+
+
+def test_server_errors(server, tmp_path, random_frames):
+    with pytest.raises(urllib.error.HTTPError) as err:
+        _post(server, "filename=c.csv", b"")
+    assert err.value.code == 400
+    with pytest.raises(urllib.error.HTTPError) as err:
+        _post(server, f"gb={quote(str(tmp_path / 'missing.xlsx'))}", b"")
+    assert err.value.code == 404
+
+    company_df, gb_df = random_frames(seed=23, n_company=5, n_gb=5)
+    gb_path = _write_gb(gb_df, tmp_path / "gb.csv")
+    with pytest.raises(urllib.error.HTTPError) as err:
+        _post(server, f"gb={quote(str(gb_path))}&filename=c.csv&workers=0",
+              _company_csv(company_df))
+    assert err.value.code == 400
+
+    url = f"http://127.0.0.1:{server.server_address[1]}/health"
+    with urllib.request.urlopen(url) as resp:
+        assert json.loads(resp.read())["status"] == "ok"
+
+
+def test_server_idle_connection():
+    """空闲或保持中的连接不会占住唯一的处理线程：超时后断开，后续请求照常处理"""
+    srv = make_server(port=0, workers=1, timeout=0.5)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    port = srv.server_address[1]
+    try:
+        kept = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        kept.request("GET", "/health")
+        resp = kept.getresponse()
+        assert resp.status == 200 and resp.getheader("Connection") == "close"
+        resp.read()                                  # 客户端不关闭连接
+
+        with socket.create_connection(("127.0.0.1", port)) as idle:     # 连上后不发请求
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=5) as resp:
+                assert json.loads(resp.read())["status"] == "ok"
+            assert idle.recv(1) == b""               # 空闲连接已被服务端超时断开
+        kept.close()
+    finally:
+        srv.shutdown()
+        srv.server_close()
@@ -0,0 +1,48 @@
+"""
+冷启动：CLI 导入与 --help 不加载重型依赖；--no-word 的运行不导入 python-docx
+"""
+import os
+import subprocess
+import sys
+
+from benchmarks import bench_startup
+
+
+def test_parse_importtime():
+    stderr = ("import time: self [us] | cumulative | imported package\n"
+              "import time:       100 |        100 |   re._parser\n"
+              "import time:       200 |        300 | re\n"
+              "import time:        50 |         50 |     pandas.core\n"
+              "import time:        10 |         60 |   pandas\n"
+              "import time:        40 |        100 | stdsync.cli\n")
+    profile = bench_startup.parse_importtime(stderr)
+    assert profile.total_us == 400
+    assert profile.modules["pandas"] == 60
+    assert profile.heavy == ["pandas"]
+
+
+def test_cli_startup_is_light():
+    for name, profile in bench_startup.run(repeat=1).items():
+        assert profile.returncode == 0, name
+        assert profile.modules, name
+        assert profile.heavy == [], f"{name} 导入了 {profile.heavy}"
+
+
+def test_cli_no_word_skips_docx(tmp_path, random_frames):
+    company_df, gb_df = random_frames(seed=3, n_company=40, n_gb=30)
+    company_df.rename(columns={"code": "标准编号", "name": "标准名称"}).to_excel(
+        tmp_path / "company.xlsx", index=False)
+    gb_df.rename(columns={"code": "国家标准编号", "name": "国 家 标 准 名 称",
+                          "replaced": "代替标准号"}).to_excel(tmp_path / "gb.xlsx", index=False)
+
+    env = {**os.environ, "HOME": str(tmp_path), "USERPROFILE": str(tmp_path)}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", str(bench_startup.ROOT / "main.py"), "--cli",
+         "company.xlsx", "gb.xlsx", "--no-word", "--no-cache"],
+        cwd=tmp_path, env=env, capture_output=True, text=True, encoding="utf-8")
+
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    produced = sorted(p.suffix for p in (tmp_path / "输出结果").iterdir())
+    assert produced == [".xlsx"]
+    heavy = bench_startup.parse_importtime(proc.stderr).heavy
+    assert "docx" not in heavy and "pandas" in heavy
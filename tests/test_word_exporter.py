@@ -12,4 +12,60 @@ def test_word_exporter(tmp_path):
     )
     doc_path = tmp_path / "demo.docx"
     word_exporter.render_word([dummy], doc_path)
-    assert doc_path.exists() and doc_path.stat().st_size > 0
\ No newline at end of file
+    assert doc_path.exists() and doc_path.stat().st_size > 0
+
+def test_word_exporter_candidates(tmp_path):
+    """REVIEW 行带候选时追加候选表"""
+    from docx import Document
+
+    review = models.MatchResult(
+        company=models.CompanyStandard(code="GB/T 1—2000", name="水泥", impl_date=None),
+        gb_old_code=None,
+        gb_new_code="GB/T 1—2020",
+        status="REVIEW",
+        candidates=[models.ReviewCandidate("GB/T 1—2020", "水泥", 90.0, 100.0, 95.0),
+                    models.ReviewCandidate("GB/T 2—2020", "水泥方法", 88.0, 90.0, 89.0)],
+    )
+    doc_path = word_exporter.render_word([review], tmp_path / "demo.docx")
+
+    doc = Document(doc_path)
+    assert len(doc.tables) == 2
+    rows = [[c.text for c in r.cells] for r in doc.tables[1].rows]
+    assert rows[0] == word_exporter.CANDIDATE_HEADERS
+    assert rows[2][2:5] == ["2", "GB/T 2—2020", "水泥方法"]
+
+
+def test_word_exporter_matches_add_row(tmp_path, obsolete_results, add_row_render_word):
+    """整批拼接 w:tr 与逐行 add_row 的单元格文本一致（含转义、换行与控制字符）"""
+    from docx import Document
+    from stdsync.core.results import ResultTable
+
+    rows = obsolete_results(5) + [models.MatchResult(
+        company=models.CompanyStandard(code="Q/A <1> & 2", name="名称\t甲\n乙\x07",
+                                       impl_date=None, dept=None),
+        gb_old_code=None, gb_new_code="GB 3—2024", status="OBSOLETE")]
+    fast = word_exporter.render_word(ResultTable.from_results(rows), tmp_path / "fast.docx")
+    rows[-1].company.name = "名称\t甲\n乙"            # python-docx 不接受控制字符
+    ref = add_row_render_word(rows, tmp_path / "ref.docx")
+
+    def cells(path):
+        return [[c.text for c in r.cells] for t in Document(path).tables for r in t.rows]
+
+    assert cells(fast) == cells(ref)
+
+
+def test_word_exporter_splits_large_tables(tmp_path, monkeypatch, obsolete_results):
+    """超过 MAX_TABLE_ROWS 时分节续表，每张表都带表头"""
+    from docx import Document
+    from stdsync.core.results import ResultTable
+
+    monkeypatch.setattr(word_exporter, "MAX_TABLE_ROWS", 4)
+    monkeypatch.setattr(word_exporter, "ROW_BATCH", 3)
+    results = ResultTable.from_results(obsolete_results(10))
+    doc = Document(word_exporter.render_word(results, tmp_path / "big.docx"))
+
+    assert [len(t.rows) for t in doc.tables] == [5, 5, 3]
+    assert all([c.text for c in t.rows[0].cells] == word_exporter.HEADERS for t in doc.tables)
+    assert len(doc.sections) == 3
+    codes = [t.rows[i].cells[1].text for t in doc.tables for i in range(1, len(t.rows))]
+    assert codes == [f"GB/T {1000 + i}—2008" for i in range(10)]